@@ -1,27 +1,123 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import BinaryIO, List, Literal, Optional
 from uuid import uuid4
 
-from fastapi import FastAPI, File, Form, Header, Request, Response, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, Header, Query, Request, Response, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from prometheus_client import Counter, Histogram, generate_latest
+from prometheus_client import Counter, Histogram
 from prometheus_client.exposition import CONTENT_TYPE_LATEST
-
-from app.audit.logger import append_audit_record, ensure_audit_log_ready, read_audit_logs
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.audit.export import EXPORT_MEDIA_TYPES, iter_csv, iter_ndjson
+from app.audit.index import AuditQuery
+from app.audit.logger import (
+    append_audit_record_async,
+    close_audit_index,
+    ensure_audit_log_ready,
+    export_audit_records,
+    open_audit_index,
+    query_audit_logs,
+    seed_recent_audit_records,
+    start_audit_writer,
+    start_recent_audit_records,
+    stop_audit_writer,
+    stop_recent_audit_records,
+    tail_audit_logs,
+)
+from app.core.config import AUDIT_UI_LIMIT, BATCH_MAX_ITEMS
 from app.core.exceptions import ApiError, AuditUnavailableError, InternalError, MalformedInputError
-from app.core.logging import log_request_summary, set_request_context, update_request_context
-from app.core.models import Artifacts, AuditRecord, Reason, ValidationOutcome, ValidationResult
+from app.core.executor import (
+    run_in_validation_pool,
+    shutdown_artifact_pool,
+    shutdown_validation_pool,
+    start_artifact_pool,
+    start_validation_pool,
+)
+from app.core.logging import (
+    log_request_summary,
+    log_stdout,
+    set_request_context,
+    start_log_writer,
+    stop_log_writer,
+    update_request_context,
+)
+from app.core.metrics import mark_dead_workers, render_metrics
+from app.core.models import (
+    Artifacts,
+    AuditRecord,
+    BatchItem,
+    BatchRequest,
+    BatchValidationResult,
+    Reason,
+    ReplicationReferenceManifest,
+    ValidationOutcome,
+    ValidationResult,
+)
 from app.core.security import verify_bearer_token
+from app.core.stages import begin_stages, record_ingest
 from app.core.utils import utc_timestamp
+from app.integrity.artifacts import SharedArtifactDigests
+from app.integrity.cache import close_verification_cache
+from app.integrity.client import close_minio_client, init_minio_client, publish_pool_stats
 from app.validators.migration import validate_migration
 from app.validators.replication import validate_replication
-from app.validators.replication_ref import validate_replication_reference
+from app.validators.replication_ref import (
+    parse_reference_manifest,
+    reference_artifact_refs,
+    validate_replication_reference,
+)
 
 
-app = FastAPI(title="Migration Security Gate", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_log_writer()
+    mark_dead_workers()
+    init_minio_client()
+    start_validation_pool()
+    start_artifact_pool()
+    start_audit_writer()
+    index = open_audit_index()
+    if index is not None:
+        index.start()
+    if start_recent_audit_records() is not None:
+        seeding = asyncio.get_running_loop().run_in_executor(None, seed_recent_audit_records)
+        seeding.add_done_callback(_log_seed_failure)
+    try:
+        yield
+    finally:
+        shutdown_validation_pool()
+        shutdown_artifact_pool()
+        stop_audit_writer()
+        stop_recent_audit_records()
+        close_audit_index()
+        close_verification_cache()
+        close_minio_client()
+        stop_log_writer()
+
+
+def _log_seed_failure(future: asyncio.Future) -> None:
+    if future.cancelled() or future.exception() is None:
+        return
+    log_stdout(
+        {
+            "timestamp": utc_timestamp(),
+            "level": "ERROR",
+            "service": "security-gate",
+            "log_type": "audit",
+            "event": "recent_seed_failed",
+            "error": repr(future.exception()),
+        }
+    )
+
+
+app = FastAPI(title="Migration Security Gate", version="1.0.0", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="app/ui/static"), name="static")
 templates = Jinja2Templates(directory="app/ui/templates")
 
@@ -53,6 +149,7 @@ async def request_summary_logger(request: Request, call_next):
         endpoint=str(request.url.path),
         client=request.headers.get("user-agent"),
     )
+    stages = begin_stages(str(request.url.path))
     start = time.time()
     response = await call_next(request)
     try:
@@ -74,6 +171,7 @@ async def request_summary_logger(request: Request, call_next):
                 reason_codes=getattr(request.state, "reason_codes", []),
                 artifact_refs=getattr(request.state, "artifact_refs", []),
                 duration_ms=duration_ms,
+                stage_ms=stages.as_ms(),
                 log_type="audit",
                 level="WARN" if decision == "BLOCK" else "INFO",
             )
@@ -94,7 +192,8 @@ async def readyz() -> dict:
 
 @app.get("/metrics")
 async def metrics():
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    publish_pool_stats()
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.exception_handler(ApiError)
@@ -108,7 +207,7 @@ async def handle_api_error(request: Request, exc: ApiError) -> JSONResponse:
         request_id=getattr(request.state, "request_id", None),
     )
     _attach_request_state(request, result, endpoint=request.url.path, artifact_refs=[])
-    _log_result(result, request=request)
+    await _log_result(result, request=request)
     return JSONResponse(status_code=exc.http_status, content=_serialize_result(result))
 
 
@@ -123,7 +222,7 @@ async def handle_unexpected_error(request: Request, exc: Exception) -> JSONRespo
         request_id=getattr(request.state, "request_id", None),
     )
     _attach_request_state(request, result, endpoint=request.url.path, artifact_refs=[])
-    _log_result(result, request=request)
+    await _log_result(result, request=request)
     return JSONResponse(status_code=500, content=_serialize_result(result))
 
 
@@ -140,11 +239,12 @@ async def validate_migration_endpoint(
     verify_bearer_token(authorization)
     manifest_bytes = await migration_manifest.read()
     config_bytes = await app_config.read()
+    record_ingest()
     update_request_context(
         scenario="T1",
         artifact_refs=[migration_manifest.filename or "migration_manifest", app_config.filename or "app_config"],
     )
-    outcome = validate_migration(manifest_bytes, config_bytes)
+    outcome = await run_in_validation_pool(validate_migration, manifest_bytes, config_bytes)
     result = _result_from_outcome(outcome, scenario="T1", request_id=request.state.request_id)
     _attach_request_state(
         request,
@@ -152,7 +252,7 @@ async def validate_migration_endpoint(
         endpoint=str(request.url.path),
         artifact_refs=[migration_manifest.filename or "migration_manifest", app_config.filename or "app_config"],
     )
-    _log_result(result, request=request)
+    await _log_result(result, request=request)
     return result
 
 
@@ -169,20 +269,23 @@ async def validate_replication_endpoint(
     _require_audit_ready()
     verify_bearer_token(authorization)
     manifest_bytes = await replication_manifest.read()
-    snapshot_bytes = await snapshot.read()
-    update_request_context(
-        scenario="T2",
-        artifact_refs=[replication_manifest.filename or "replication_manifest", snapshot.filename or "snapshot"],
-    )
-    outcome = validate_replication(manifest_bytes, snapshot_bytes)
+    wal_segments = _wal_segments(wal_files)
+    record_ingest()
+    artifact_refs = [
+        replication_manifest.filename or "replication_manifest",
+        snapshot.filename or "snapshot",
+        *wal_segments,
+    ]
+    update_request_context(scenario="T2", artifact_refs=artifact_refs)
+    outcome = await run_in_validation_pool(validate_replication, manifest_bytes, snapshot.file, wal_segments)
     result = _result_from_outcome(outcome, scenario="T2", request_id=request.state.request_id)
     _attach_request_state(
         request,
         result,
         endpoint=str(request.url.path),
-        artifact_refs=[replication_manifest.filename or "replication_manifest", snapshot.filename or "snapshot"],
+        artifact_refs=artifact_refs,
     )
-    _log_result(result, request=request)
+    await _log_result(result, request=request)
     return result
 
 
@@ -195,27 +298,104 @@ async def validate_replication_reference_endpoint(
     update_request_context(scenario="T2")
     _require_audit_ready()
     verify_bearer_token(authorization)
-    manifest_bytes = await request.body()
-    update_request_context(scenario="T2", artifact_refs=_extract_ref_artifacts(manifest_bytes))
-    outcome = validate_replication_reference(manifest_bytes)
+    body = await request.body()
+    record_ingest()
+    manifest = await run_in_validation_pool(parse_reference_manifest, body)
+    artifact_refs = reference_artifact_refs(manifest)
+    update_request_context(scenario="T2", artifact_refs=artifact_refs)
+    outcome = await run_in_validation_pool(validate_replication_reference, manifest)
     result = _result_from_outcome(outcome, scenario="T2", request_id=request.state.request_id)
     _attach_request_state(
         request,
         result,
         endpoint=str(request.url.path),
-        artifact_refs=_extract_ref_artifacts(manifest_bytes),
+        artifact_refs=artifact_refs,
+        policy_version=manifest.policy_version,
     )
-    _log_result(result, request=request)
+    await _log_result(result, request=request)
     return result
 
 
+@app.post("/api/v1/validate/batch")
+async def validate_batch_endpoint(
+    request: Request,
+    authorization: str | None = Header(default=None),
+) -> BatchValidationResult:
+    request.state.scenario = "BATCH"
+    update_request_context(scenario="BATCH")
+    _require_audit_ready()
+    verify_bearer_token(authorization)
+    body = await request.body()
+    record_ingest()
+    batch = _parse_batch(body)
+    digests = SharedArtifactDigests()
+    items = await asyncio.gather(
+        *(run_in_validation_pool(_validate_batch_item, item, digests) for item in batch.items)
+    )
+    endpoint = str(request.url.path)
+    await asyncio.gather(
+        *(
+            _record_result(result, endpoint=endpoint, artifact_refs=artifact_refs, policy_version=policy_version)
+            for result, artifact_refs, policy_version in items
+        )
+    )
+    results = [result for result, _, _ in items]
+    decision = "BLOCK" if any(result.decision == "BLOCK" for result in results) else "ALLOW"
+    request.state.decision = decision
+    request.state.reason_codes = sorted({reason.code for result in results for reason in result.reasons})
+    request.state.artifact_refs = sorted({ref for _, refs, _ in items for ref in refs})
+    return BatchValidationResult(request_id=request.state.request_id, decision=decision, results=results)
+
+
 @app.get("/api/v1/audit/logs")
 async def get_audit_logs(
-    limit: Optional[int] = None,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
     decision: Optional[str] = None,
     scenario: Optional[str] = None,
+    reason_code: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    policy_version: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    cursor: Optional[int] = None,
+    order: Literal["asc", "desc"] = "asc",
 ) -> List[AuditRecord]:
-    return read_audit_logs(limit=limit, decision=decision, scenario=scenario)
+    query = AuditQuery(
+        decision=decision,
+        scenario=scenario,
+        reason_code=reason_code,
+        endpoint=endpoint,
+        policy_version=policy_version,
+        since=since,
+        until=until,
+    )
+    page = await run_in_threadpool(
+        query_audit_logs,
+        query,
+        limit=limit,
+        cursor=cursor,
+        newest_first=order == "desc",
+    )
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(page.next_cursor)
+    return page.records
+
+
+@app.get("/api/v1/audit/export")
+async def export_audit_logs(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    decision: Optional[str] = None,
+    scenario: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> StreamingResponse:
+    rows = export_audit_records(AuditQuery(decision=decision, scenario=scenario, since=since, until=until))
+    return StreamingResponse(
+        iter_csv(rows) if fmt == "csv" else iter_ndjson(rows),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="audit-export.{fmt}"'},
+    )
 
 
 @app.get("/")
@@ -238,11 +418,12 @@ async def ui_migration_submit(
         _require_audit_ready()
         manifest_bytes = await migration_manifest.read()
         config_bytes = await app_config.read()
+        record_ingest()
         update_request_context(
             scenario="T1",
             artifact_refs=[migration_manifest.filename or "migration_manifest", app_config.filename or "app_config"],
         )
-        outcome = validate_migration(manifest_bytes, config_bytes)
+        outcome = await run_in_validation_pool(validate_migration, manifest_bytes, config_bytes)
         result = _result_from_outcome(outcome, scenario="T1", request_id=request.state.request_id)
         _attach_request_state(
             request,
@@ -250,7 +431,7 @@ async def ui_migration_submit(
             endpoint=str(request.url.path),
             artifact_refs=[migration_manifest.filename or "migration_manifest", app_config.filename or "app_config"],
         )
-        _log_result(result, request=request)
+        await _log_result(result, request=request)
     except ApiError as exc:
         result = _build_result(
             decision="BLOCK",
@@ -260,7 +441,7 @@ async def ui_migration_submit(
             request_id=getattr(request.state, "request_id", None),
         )
         _attach_request_state(request, result, endpoint=str(request.url.path), artifact_refs=[])
-        _log_result(result, request=request)
+        await _log_result(result, request=request)
     return templates.TemplateResponse("validate_migration.html", {"request": request, "result": result})
 
 
@@ -286,32 +467,40 @@ async def ui_replication_submit(
                 mode = "reference"
             elif reference_manifest and reference_manifest.strip():
                 mode = "reference"
+        reference = None
         if mode == "reference":
             if reference_manifest_file is not None:
                 manifest_bytes = await reference_manifest_file.read()
             else:
                 manifest_bytes = (reference_manifest or "").encode("utf-8")
-            update_request_context(scenario="T2", artifact_refs=_extract_ref_artifacts(manifest_bytes))
-            outcome = validate_replication_reference(manifest_bytes)
+            record_ingest()
+            reference = await run_in_validation_pool(parse_reference_manifest, manifest_bytes)
+            update_request_context(scenario="T2", artifact_refs=reference_artifact_refs(reference))
+            outcome = await run_in_validation_pool(validate_replication_reference, reference)
         else:
             if replication_manifest is None or snapshot is None:
                 raise MalformedInputError("replication manifest and snapshot are required", "INVALID_MANIFEST")
             manifest_bytes = await replication_manifest.read()
-            snapshot_bytes = await snapshot.read()
+            wal_segments = _wal_segments(wal_files)
+            record_ingest()
             update_request_context(
                 scenario="T2",
-                artifact_refs=[replication_manifest.filename or "replication_manifest", snapshot.filename or "snapshot"],
+                artifact_refs=[
+                    replication_manifest.filename or "replication_manifest",
+                    snapshot.filename or "snapshot",
+                    *wal_segments,
+                ],
             )
-            outcome = validate_replication(manifest_bytes, snapshot_bytes)
+            outcome = await run_in_validation_pool(validate_replication, manifest_bytes, snapshot.file, wal_segments)
         result = _result_from_outcome(outcome, scenario="T2", request_id=request.state.request_id)
         _attach_request_state(
             request,
             result,
             endpoint=str(request.url.path),
-            artifact_refs=_ui_artifact_refs(mode, replication_manifest, snapshot, reference_manifest_file, manifest_bytes),
-            policy_version=_extract_ref_policy_version(manifest_bytes) if mode == "reference" else None,
+            artifact_refs=_ui_artifact_refs(replication_manifest, snapshot, wal_files, reference_manifest_file, reference),
+            policy_version=reference.policy_version if reference is not None else None,
         )
-        _log_result(result, request=request)
+        await _log_result(result, request=request)
     except ApiError as exc:
         result = _build_result(
             decision="BLOCK",
@@ -321,20 +510,31 @@ async def ui_replication_submit(
             request_id=getattr(request.state, "request_id", None),
         )
         _attach_request_state(request, result, endpoint=str(request.url.path), artifact_refs=[])
-        _log_result(result, request=request)
+        await _log_result(result, request=request)
     return templates.TemplateResponse("validate_replication.html", {"request": request, "result": result})
 
 
 @app.get("/ui/audit")
-async def ui_audit_logs(request: Request):
-    logs = list(reversed(read_audit_logs()))
-    return templates.TemplateResponse("audit_logs.html", {"request": request, "logs": logs})
+async def ui_audit_logs(request: Request, before: Optional[int] = None):
+    page = await run_in_threadpool(tail_audit_logs, AuditQuery(), limit=AUDIT_UI_LIMIT, before=before)
+    return templates.TemplateResponse(
+        "audit_logs.html",
+        {"request": request, "logs": page.records, "next_cursor": page.next_cursor},
+    )
 
 
 @app.get("/ui/alerts")
-async def ui_alerts(request: Request):
-    logs = list(reversed(read_audit_logs(decision="BLOCK")))
-    return templates.TemplateResponse("alerts.html", {"request": request, "logs": logs})
+async def ui_alerts(request: Request, before: Optional[int] = None):
+    page = await run_in_threadpool(
+        tail_audit_logs,
+        AuditQuery(decision="BLOCK"),
+        limit=AUDIT_UI_LIMIT,
+        before=before,
+    )
+    return templates.TemplateResponse(
+        "alerts.html",
+        {"request": request, "logs": page.records, "next_cursor": page.next_cursor},
+    )
 
 
 def _result_from_outcome(outcome: ValidationOutcome, scenario: str, request_id: str | None) -> ValidationResult:
@@ -370,20 +570,35 @@ def _serialize_result(result: ValidationResult) -> dict:
     return result.dict()
 
 
-def _log_result(result: ValidationResult, request: Request | None = None) -> None:
+async def _log_result(result: ValidationResult, request: Request | None = None) -> None:
+    await _record_result(
+        result,
+        endpoint=getattr(request.state, "endpoint", None) if request else None,
+        artifact_refs=getattr(request.state, "artifact_refs", []) if request else [],
+        policy_version=getattr(request.state, "policy_version", None) if request else None,
+    )
+
+
+async def _record_result(
+    result: ValidationResult,
+    *,
+    endpoint: str | None,
+    artifact_refs: list[str],
+    policy_version: str | None,
+) -> None:
     record = AuditRecord(
         request_id=result.request_id,
         scenario=result.scenario,
         decision=result.decision,
         reasons=[reason.code for reason in result.reasons],
         timestamp=result.timestamp,
-        endpoint=getattr(request.state, "endpoint", None) if request else None,
-        artifact_refs=getattr(request.state, "artifact_refs", []) if request else [],
-        policy_version=getattr(request.state, "policy_version", None) if request else None,
+        endpoint=endpoint,
+        artifact_refs=artifact_refs,
+        policy_version=policy_version,
     )
-    append_audit_record(record)
+    await append_audit_record_async(record)
     if result.decision == "BLOCK":
-        endpoint = getattr(request.state, "endpoint", "") if request else ""
+        endpoint = endpoint or ""
         for reason in result.reasons:
             BLOCK_COUNT.labels(
                 reason_code=reason.code,
@@ -392,6 +607,73 @@ def _log_result(result: ValidationResult, request: Request | None = None) -> Non
             ).inc()
 
 
+def _parse_batch(raw: bytes) -> BatchRequest:
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise MalformedInputError("Failed to parse batch JSON", "PARSE_ERROR") from exc
+    if not isinstance(data, dict):
+        raise MalformedInputError("batch must be a JSON object", "SCHEMA_INVALID")
+    try:
+        batch = BatchRequest(**data)
+    except ValidationError as exc:
+        raise MalformedInputError("batch schema invalid", "SCHEMA_INVALID") from exc
+    if not batch.items:
+        raise MalformedInputError("batch must contain at least one item", "SCHEMA_INVALID")
+    if len(batch.items) > BATCH_MAX_ITEMS:
+        raise MalformedInputError(f"batch may contain at most {BATCH_MAX_ITEMS} items", "BATCH_TOO_LARGE")
+    return batch
+
+
+def _validate_batch_item(
+    item: BatchItem,
+    digests: SharedArtifactDigests,
+) -> tuple[ValidationResult, list[str], str | None]:
+    request_id = str(uuid4())
+    scenario = {"T1": "T1", "T2-ref": "T2"}.get(item.scenario, "BATCH")
+    set_request_context(request_id=request_id, scenario=scenario)
+    artifact_refs: list[str] = []
+    policy_version = None
+    try:
+        if item.scenario == "T1":
+            if item.migration_manifest is None or item.app_config is None:
+                raise MalformedInputError("migration_manifest and app_config are required", "SCHEMA_INVALID")
+            artifact_refs = ["migration_manifest", "app_config"]
+            update_request_context(artifact_refs=artifact_refs)
+            outcome = validate_migration(
+                item.migration_manifest.encode("utf-8"),
+                item.app_config.encode("utf-8"),
+            )
+        elif item.scenario == "T2-ref":
+            if item.reference_manifest is None:
+                raise MalformedInputError("reference_manifest is required", "INVALID_MANIFEST")
+            manifest = parse_reference_manifest(item.reference_manifest.encode("utf-8"))
+            artifact_refs = reference_artifact_refs(manifest)
+            policy_version = manifest.policy_version
+            update_request_context(artifact_refs=artifact_refs)
+            outcome = validate_replication_reference(manifest, hash_artifact=digests.hash)
+        else:
+            raise MalformedInputError("scenario must be T1 or T2-ref", "SCHEMA_INVALID")
+        result = _result_from_outcome(outcome, scenario=scenario, request_id=request_id)
+    except ApiError as exc:
+        result = _build_result(
+            decision="BLOCK",
+            scenario=scenario,
+            reasons=[Reason(code=exc.code, message=exc.message)],
+            artifacts=None,
+            request_id=request_id,
+        )
+    except Exception:
+        result = _build_result(
+            decision="BLOCK",
+            scenario=scenario,
+            reasons=[Reason(code="INTERNAL_ERROR", message="Internal server error")],
+            artifacts=None,
+            request_id=request_id,
+        )
+    return result, artifact_refs, policy_version
+
+
 def _require_audit_ready() -> None:
     try:
         ensure_audit_log_ready()
@@ -422,54 +704,35 @@ def _attach_request_state(
     )
 
 
-def _extract_ref_artifacts(manifest_bytes: bytes) -> list[str]:
-    try:
-        import yaml
-
-        parsed = yaml.safe_load(manifest_bytes.decode("utf-8"))
-        if isinstance(parsed, dict):
-            snapshot = parsed.get("snapshot", {}) or {}
-            wal = parsed.get("wal", {}) or {}
-            refs = []
-            if isinstance(snapshot, dict) and isinstance(snapshot.get("uri"), str):
-                refs.append(snapshot.get("uri"))
-            if isinstance(wal, dict) and isinstance(wal.get("uri"), str):
-                refs.append(wal.get("uri"))
-            return refs
-    except Exception:
-        pass
-    return []
-
-
-def _extract_ref_policy_version(manifest_bytes: bytes) -> str | None:
-    try:
-        import yaml
-
-        parsed = yaml.safe_load(manifest_bytes.decode("utf-8"))
-        if isinstance(parsed, dict):
-            value = parsed.get("policy_version")
-            return value if isinstance(value, str) else None
-    except Exception:
-        return None
-    return None
-
-
 def _ui_artifact_refs(
-    mode: str,
     replication_manifest: UploadFile | None,
     snapshot: UploadFile | None,
+    wal_files: List[UploadFile] | None,
     reference_manifest_file: UploadFile | None,
-    manifest_bytes: bytes | None,
+    reference: ReplicationReferenceManifest | None,
 ) -> list[str]:
-    if mode == "reference":
+    if reference is not None:
         refs = []
         if reference_manifest_file and reference_manifest_file.filename:
             refs.append(reference_manifest_file.filename)
-        refs.extend(_extract_ref_artifacts(manifest_bytes or b""))
-        return refs if refs else ["reference_manifest"]
+        refs.extend(reference_artifact_refs(reference))
+        return refs
     refs = []
     if replication_manifest:
         refs.append(replication_manifest.filename or "replication_manifest")
     if snapshot:
         refs.append(snapshot.filename or "snapshot")
+    refs.extend(_wal_segments(wal_files))
     return refs
+
+
+def _wal_segments(wal_files: List[UploadFile] | None) -> dict[str, BinaryIO]:
+    segments: dict[str, BinaryIO] = {}
+    for index, wal_file in enumerate(wal_files or []):
+        if not wal_file.filename and not wal_file.size:
+            continue
+        name = wal_file.filename or f"wal_{index}"
+        if name in segments:
+            name = f"{name}#{index}"
+        segments[name] = wal_file.file
+    return segments
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import csv
+import io
+from typing import Iterable, Iterator
+
+from app.core.models import AuditRecord
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = [
+    "request_id",
+    "timestamp",
+    "scenario",
+    "decision",
+    "reasons",
+    "endpoint",
+    "policy_version",
+    "artifact_refs",
+]
+
+
+def iter_ndjson(rows: Iterable[tuple[bytes, AuditRecord]]) -> Iterator[bytes]:
+    return _chunked(line + b"\n" for line, _ in rows)
+
+
+def iter_csv(rows: Iterable[tuple[bytes, AuditRecord]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def encoded() -> Iterator[bytes]:
+        writer.writerow(CSV_COLUMNS)
+        yield _drain(buffer)
+        for _, record in rows:
+            writer.writerow(
+                [
+                    record.request_id,
+                    record.timestamp,
+                    record.scenario,
+                    record.decision,
+                    ";".join(record.reasons),
+                    record.endpoint or "",
+                    record.policy_version or "",
+                    ";".join(record.artifact_refs),
+                ]
+            )
+            yield _drain(buffer)
+
+    return _chunked(encoded())
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _chunked(parts: Iterable[bytes]) -> Iterator[bytes]:
+    chunk = bytearray()
+    for part in parts:
+        chunk += part
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
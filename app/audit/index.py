@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from app.audit.reader import parse_line
+from app.audit.segments import SegmentStore
+from app.core.config import AUDIT_INDEX_SYNC_INTERVAL
+from app.core.models import AuditRecord
+
+TAIL_SCAN_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class AuditQuery:
+    decision: Optional[str] = None
+    scenario: Optional[str] = None
+    reason_code: Optional[str] = None
+    endpoint: Optional[str] = None
+    policy_version: Optional[str] = None
+    since: Optional[str] = None
+    until: Optional[str] = None
+
+    def matches(self, record: AuditRecord) -> bool:
+        if self.decision and record.decision != self.decision:
+            return False
+        if self.scenario and record.scenario != self.scenario:
+            return False
+        if self.reason_code and self.reason_code not in record.reasons:
+            return False
+        if self.endpoint and record.endpoint != self.endpoint:
+            return False
+        if self.policy_version and record.policy_version != self.policy_version:
+            return False
+        if self.since and record.timestamp < self.since:
+            return False
+        if self.until and record.timestamp >= self.until:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class AuditPage:
+    records: List[AuditRecord]
+    next_cursor: Optional[int]
+
+
+class AuditIndex:
+    def __init__(self, index_path: str, log_path: str) -> None:
+        self._store = SegmentStore(log_path)
+        path = Path(index_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._syncer: threading.Thread | None = None
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self._db.executescript(_RESET)
+        self._db.executescript(_SCHEMA)
+        self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def start(self, interval: float = AUDIT_INDEX_SYNC_INTERVAL) -> None:
+        if self._syncer is None and interval > 0:
+            self._syncer = threading.Thread(
+                target=self._sync_forever, args=(interval,), name="audit-index", daemon=True
+            )
+            self._syncer.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        with self._lock:
+            self._db.close()
+
+    def sync(self) -> int:
+        with self._lock:
+            end = self._store.end_offset()
+            if end == self._position():
+                return 0
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                offset = self._position()
+                if end < offset:
+                    self._db.execute("DELETE FROM reasons")
+                    self._db.execute("DELETE FROM records")
+                    offset = 0
+                first = self._store.first_offset()
+                if self._db.execute("SELECT 1 FROM records WHERE id < ? LIMIT 1", (first,)).fetchone():
+                    self._db.execute("DELETE FROM reasons WHERE record_id < ?", (first,))
+                    self._db.execute("DELETE FROM records WHERE id < ?", (first,))
+                added, offset = self._ingest(max(offset, first))
+                self._db.execute("UPDATE meta SET log_offset = ?", (offset,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            return added
+
+    def query(
+        self,
+        query: AuditQuery,
+        *,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> AuditPage:
+        clauses: list[str] = []
+        params: list[object] = []
+        for column, value in (
+            ("decision", query.decision),
+            ("scenario", query.scenario),
+            ("endpoint", query.endpoint),
+            ("policy_version", query.policy_version),
+        ):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if query.reason_code:
+            clauses.append("id IN (SELECT record_id FROM reasons WHERE code = ?)")
+            params.append(query.reason_code)
+        if query.since:
+            clauses.append("timestamp >= ?")
+            params.append(query.since)
+        if query.until:
+            clauses.append("timestamp < ?")
+            params.append(query.until)
+        if cursor is not None:
+            clauses.append("id < ?" if newest_first else "id > ?")
+            params.append(cursor)
+        sql = "SELECT id, line FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC" if newest_first else " ORDER BY id ASC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        self._catch_up()
+        with self._lock:
+            position = self._position()
+            rows = self._db.execute(sql, params).fetchall()
+        entries = [(offset, AuditRecord(**json.loads(line))) for offset, line in rows]
+        tail = self._tail(query, position, cursor, newest_first)
+        entries = tail[::-1] + entries if newest_first else entries + tail
+        next_cursor = None
+        if limit is not None and len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = entries[-1][0] if entries else cursor
+        return AuditPage(records=[record for _, record in entries], next_cursor=next_cursor)
+
+    def _catch_up(self) -> None:
+        end = self._store.end_offset()
+        with self._lock:
+            position = self._position()
+        if not position <= end <= position + TAIL_SCAN_BYTES:
+            self.sync()
+
+    def _tail(
+        self,
+        query: AuditQuery,
+        position: int,
+        cursor: Optional[int],
+        newest_first: bool,
+    ) -> list[tuple[int, AuditRecord]]:
+        entries = []
+        for offset, line in self._store.iter_forward(position):
+            if cursor is not None and (offset >= cursor if newest_first else offset <= cursor):
+                continue
+            record = parse_line(line)
+            if record is not None and query.matches(record):
+                entries.append((offset, record))
+        return entries
+
+    def _sync_forever(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+            except (sqlite3.Error, OSError):
+                continue
+
+    def _position(self) -> int:
+        return self._db.execute("SELECT log_offset FROM meta").fetchone()[0]
+
+    def _ingest(self, offset: int) -> tuple[int, int]:
+        added = 0
+        for line_offset, line in self._store.iter_forward(offset):
+            offset = line_offset + len(line) + 1
+            record = parse_line(line)
+            if record is None:
+                continue
+            self._insert(line_offset, record, line.decode("utf-8"))
+            added += 1
+        return added, offset
+
+    def _insert(self, offset: int, record: AuditRecord, line: str) -> None:
+        self._db.execute(
+            "INSERT OR IGNORE INTO records "
+            "(id, request_id, timestamp, decision, scenario, endpoint, policy_version, line) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                offset,
+                record.request_id,
+                record.timestamp,
+                record.decision,
+                record.scenario,
+                record.endpoint,
+                record.policy_version,
+                line,
+            ),
+        )
+        self._db.executemany(
+            "INSERT INTO reasons (record_id, code) VALUES (?, ?)",
+            [(offset, code) for code in set(record.reasons)],
+        )
+
+
+_SCHEMA_VERSION = 2
+
+_RESET = """
+DROP TABLE IF EXISTS meta;
+DROP TABLE IF EXISTS records;
+DROP TABLE IF EXISTS reasons;
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (id INTEGER PRIMARY KEY CHECK (id = 1), log_offset INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (id, log_offset) VALUES (1, 0);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    request_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    endpoint TEXT,
+    policy_version TEXT,
+    line TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reasons (record_id INTEGER NOT NULL, code TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS records_decision ON records (decision, id);
+CREATE INDEX IF NOT EXISTS records_scenario ON records (scenario, id);
+CREATE INDEX IF NOT EXISTS records_endpoint ON records (endpoint, id);
+CREATE INDEX IF NOT EXISTS records_policy_version ON records (policy_version, id);
+CREATE INDEX IF NOT EXISTS records_timestamp ON records (timestamp, id);
+CREATE INDEX IF NOT EXISTS reasons_code ON reasons (code, record_id);
+CREATE INDEX IF NOT EXISTS reasons_record ON reasons (record_id);
+"""
@@ -1,22 +1,95 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import os
+import sqlite3
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional
 
-from app.core.config import AUDIT_LOG_PATH
+from app.audit.index import AuditIndex, AuditPage, AuditQuery
+from app.audit.reader import parse_line
+from app.audit.recent import RecentRecords
+from app.audit.segments import SegmentStore
+from app.audit.writer import AuditWriter
+from app.core.config import (
+    AUDIT_ENQUEUE_TIMEOUT,
+    AUDIT_INDEX_ENABLED,
+    AUDIT_INDEX_PATH,
+    AUDIT_LOG_PATH,
+    AUDIT_QUEUE_POLICY,
+    AUDIT_RECENT_SIZE,
+)
 from app.core.exceptions import AuditUnavailableError
+from app.core.metrics import AUDIT_REJECTED
 from app.core.models import AuditRecord
+from app.core.stages import stage
 
+_writer: AuditWriter | None = None
+_index: AuditIndex | None = None
+_recent: RecentRecords | None = None
 
-def append_audit_record(record: AuditRecord) -> None:
+
+def start_audit_writer() -> AuditWriter:
+    global _writer
+    if _writer is None:
+        _writer = AuditWriter(AUDIT_LOG_PATH, store=SegmentStore(AUDIT_LOG_PATH))
+        _writer.start()
+    return _writer
+
+
+def stop_audit_writer() -> None:
+    global _writer
+    writer = _writer
+    _writer = None
+    if writer is not None:
+        writer.close()
+
+
+def append_audit_record(record: AuditRecord) -> int:
+    with stage("audit"):
+        return _append_audit_record(record)
+
+
+def _append_audit_record(record: AuditRecord) -> int:
+    line = _serialize_record(record)
+    writer = _writer
+    if writer is not None:
+        offset = writer.submit(line, timeout=_enqueue_timeout()).result()
+        _remember(offset, line, record)
+        return offset
     path = Path(AUDIT_LOG_PATH)
     path.parent.mkdir(parents=True, exist_ok=True)
+    store = SegmentStore(AUDIT_LOG_PATH)
     try:
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(_serialize_record(record) + "\n")
+        with store.locked(exclusive=True), path.open("ab") as handle:
+            offset = store.load().active_base_offset + os.fstat(handle.fileno()).st_size
+            handle.write(line.encode("utf-8") + b"\n")
     except OSError as exc:
         raise AuditUnavailableError() from exc
+    _remember(offset, line, record)
+    return offset
+
+
+async def append_audit_record_async(record: AuditRecord) -> int:
+    writer = _writer
+    if writer is None:
+        return append_audit_record(record)
+    with stage("audit"):
+        return await _append_audit_record_async(writer, record)
+
+
+async def _append_audit_record_async(writer: AuditWriter, record: AuditRecord) -> int:
+    line = _serialize_record(record)
+    future = writer.try_submit(line)
+    if future is None:
+        timeout = _enqueue_timeout()
+        if timeout <= 0:
+            AUDIT_REJECTED.inc()
+            raise AuditUnavailableError()
+        future = await asyncio.get_running_loop().run_in_executor(None, writer.submit, line, timeout)
+    offset = await asyncio.wrap_future(future)
+    _remember(offset, line, record)
+    return offset
 
 
 def read_audit_logs(
@@ -24,31 +97,175 @@ def read_audit_logs(
     decision: Optional[str] = None,
     scenario: Optional[str] = None,
 ) -> List[AuditRecord]:
-    path = Path(AUDIT_LOG_PATH)
-    if not path.exists():
-        return []
+    return query_audit_logs(AuditQuery(decision=decision, scenario=scenario), limit=limit).records
+
+
+def query_audit_logs(
+    query: AuditQuery,
+    *,
+    limit: Optional[int] = None,
+    cursor: Optional[int] = None,
+    newest_first: bool = False,
+) -> AuditPage:
+    if newest_first and limit is not None:
+        page = _recent_page(query, limit, cursor)
+        if page is not None:
+            return page
+    index = open_audit_index()
+    if index is not None:
+        try:
+            return index.query(query, limit=limit, cursor=cursor, newest_first=newest_first)
+        except (sqlite3.Error, OSError):
+            pass
+    if newest_first:
+        return tail_audit_logs(query, limit=limit, before=cursor)
+    return _scan_audit_logs(query, limit=limit, after=cursor)
+
+
+def tail_audit_logs(
+    query: AuditQuery,
+    *,
+    limit: Optional[int] = None,
+    before: Optional[int] = None,
+) -> AuditPage:
+    if limit is not None:
+        page = _recent_page(query, limit, before)
+        if page is not None:
+            return page
+    store = SegmentStore(AUDIT_LOG_PATH)
     records: List[AuditRecord] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                payload = json.loads(line)
-                record = AuditRecord(**payload)
-            except json.JSONDecodeError:
-                continue
-            if decision and record.decision != decision:
-                continue
-            if scenario and record.scenario != scenario:
-                continue
-            records.append(record)
-            if limit is not None and len(records) >= limit:
+    last_offset = before
+    for offset, line in store.iter_backward(before, since=query.since, until=query.until):
+        record = parse_line(line)
+        if record is None or not query.matches(record):
+            continue
+        if limit is not None and len(records) >= limit:
+            return AuditPage(records=records, next_cursor=last_offset)
+        records.append(record)
+        last_offset = offset
+    return AuditPage(records=records, next_cursor=None)
+
+
+def export_audit_records(query: AuditQuery) -> Iterator[tuple[bytes, AuditRecord]]:
+    store = SegmentStore(AUDIT_LOG_PATH)
+    for _, line in store.iter_forward(since=query.since, until=query.until):
+        record = parse_line(line)
+        if record is not None and query.matches(record):
+            yield line, record
+
+
+def start_recent_audit_records() -> RecentRecords | None:
+    global _recent
+    if _recent is None and AUDIT_RECENT_SIZE > 0:
+        _recent = RecentRecords(AUDIT_RECENT_SIZE)
+    return _recent
+
+
+def stop_recent_audit_records() -> None:
+    global _recent
+    _recent = None
+
+
+def seed_recent_audit_records() -> None:
+    recent = _recent
+    if recent is None:
+        return
+    store = SegmentStore(AUDIT_LOG_PATH)
+    entries: list[tuple[int, int, AuditRecord]] = []
+    end = None
+    complete = True
+    for offset, line in store.iter_backward():
+        if end is None:
+            end = offset + len(line) + 1
+        if len(entries) >= recent.capacity:
+            complete = False
+            break
+        record = parse_line(line)
+        if record is not None:
+            entries.append((offset, len(line) + 1, record))
+    entries.reverse()
+    recent.reset(entries, store.first_offset() if end is None else end, complete)
+
+
+def open_audit_index() -> AuditIndex | None:
+    global _index
+    if not AUDIT_INDEX_ENABLED:
+        return None
+    if _index is None:
+        try:
+            _index = AuditIndex(AUDIT_INDEX_PATH, AUDIT_LOG_PATH)
+        except (sqlite3.Error, OSError):
+            return None
+    return _index
+
+
+def close_audit_index() -> None:
+    global _index
+    index = _index
+    _index = None
+    if index is not None:
+        index.close()
+
+
+def _scan_audit_logs(
+    query: AuditQuery,
+    *,
+    limit: Optional[int],
+    after: Optional[int],
+) -> AuditPage:
+    store = SegmentStore(AUDIT_LOG_PATH)
+    records: List[AuditRecord] = []
+    last_offset = after
+    for offset, line in store.iter_forward(after or 0, since=query.since, until=query.until):
+        if after is not None and offset <= after:
+            continue
+        record = parse_line(line)
+        if record is None or not query.matches(record):
+            continue
+        if limit is not None and len(records) >= limit:
+            return AuditPage(records=records, next_cursor=last_offset)
+        records.append(record)
+        last_offset = offset
+    return AuditPage(records=records, next_cursor=None)
+
+
+def _recent_page(query: AuditQuery, limit: int, before: Optional[int]) -> AuditPage | None:
+    recent = _recent
+    if recent is None or not recent.ready:
+        return None
+    store = SegmentStore(AUDIT_LOG_PATH)
+    start = recent.end
+    end = store.end_offset()
+    if end < start:
+        seed_recent_audit_records()
+    elif end > start:
+        entries: list[tuple[int, int, AuditRecord]] = []
+        position = start
+        for offset, line in store.iter_forward(start):
+            if len(entries) >= recent.capacity:
+                seed_recent_audit_records()
                 break
-    return records
+            position = offset + len(line) + 1
+            record = parse_line(line)
+            if record is not None:
+                entries.append((offset, len(line) + 1, record))
+        else:
+            recent.extend(start, entries, position)
+    return recent.page(query, limit, before)
+
+
+def _remember(offset: int, line: str, record: AuditRecord) -> None:
+    recent = _recent
+    if recent is not None:
+        recent.append(offset, len(line.encode("utf-8")) + 1, record)
 
 
 def ensure_audit_log_ready() -> None:
+    writer = _writer
+    if writer is not None:
+        if not writer.ready():
+            raise AuditUnavailableError()
+        return
     path = Path(AUDIT_LOG_PATH)
     path.parent.mkdir(parents=True, exist_ok=True)
     try:
@@ -58,6 +275,10 @@ def ensure_audit_log_ready() -> None:
         raise AuditUnavailableError() from exc
 
 
+def _enqueue_timeout() -> float:
+    return AUDIT_ENQUEUE_TIMEOUT if AUDIT_QUEUE_POLICY == "block" else 0.0
+
+
 def _serialize_record(record: AuditRecord) -> str:
     if hasattr(record, "model_dump_json"):
         return record.model_dump_json()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import gzip
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+from pydantic import ValidationError
+
+from app.core.models import AuditRecord
+
+BLOCK_SIZE = 64 * 1024
+
+LogSource = Union[Path, BinaryIO]
+
+
+def open_log(path: Path) -> BinaryIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+def iter_lines(source: LogSource, start: int = 0) -> Iterator[tuple[int, bytes]]:
+    with _opened(source) as handle:
+        handle.seek(start)
+        offset = start
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                return
+            line = raw.strip()
+            if line:
+                yield offset, line
+            offset += len(raw)
+
+
+def iter_lines_backwards(
+    source: LogSource,
+    end: Optional[int] = None,
+    block_size: int = BLOCK_SIZE,
+) -> Iterator[tuple[int, bytes]]:
+    with _opened(source) as handle:
+        handle.seek(0, 2)
+        size = handle.tell()
+        position = size if end is None else min(end, size)
+        buffer = b""
+        trailing = position == size
+        while position > 0:
+            read = min(block_size, position)
+            position -= read
+            handle.seek(position)
+            buffer = handle.read(read) + buffer
+            if trailing:
+                cut = buffer.rfind(b"\n")
+                if cut < 0:
+                    continue
+                buffer = buffer[: cut + 1]
+                trailing = False
+            lines = buffer.split(b"\n")
+            offset = position + len(buffer)
+            for line in reversed(lines[1:]):
+                offset -= len(line) + 1
+                if line.strip():
+                    yield offset + 1, line.strip()
+            buffer = lines[0]
+        if buffer.strip() and not trailing:
+            yield 0, buffer.strip()
+
+
+def parse_line(line: bytes) -> Optional[AuditRecord]:
+    try:
+        return AuditRecord(**json.loads(line))
+    except (json.JSONDecodeError, UnicodeDecodeError, TypeError, ValidationError):
+        return None
+
+
+@contextmanager
+def _opened(source: LogSource) -> Iterator[BinaryIO]:
+    if isinstance(source, Path):
+        with open_log(source) as handle:
+            yield handle
+    else:
+        yield source
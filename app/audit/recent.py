@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+from app.audit.index import AuditPage, AuditQuery
+from app.core.models import AuditRecord
+
+Entry = tuple[int, AuditRecord]
+
+
+class RecentRecords:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._entries: Deque[Entry] = deque()
+        self._by_decision: Dict[str, Deque[Entry]] = {}
+        self._end = 0
+        self._ready = False
+        self._complete = False
+
+    @property
+    def end(self) -> int:
+        return self._end
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def reset(self, entries: Iterable[tuple[int, int, AuditRecord]], end: int, complete: bool) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_decision.clear()
+            self._complete = complete
+            for offset, _, record in entries:
+                self._add(offset, record)
+            self._end = end
+            self._ready = True
+
+    def append(self, offset: int, size: int, record: AuditRecord) -> bool:
+        with self._lock:
+            if not self._ready or offset != self._end:
+                return False
+            self._add(offset, record)
+            self._end = offset + size
+            return True
+
+    def extend(self, start: int, entries: Iterable[tuple[int, int, AuditRecord]], end: int) -> bool:
+        with self._lock:
+            if not self._ready or start != self._end:
+                return False
+            for offset, _, record in entries:
+                self._add(offset, record)
+            self._end = end
+            return True
+
+    def page(self, query: AuditQuery, limit: int, before: Optional[int] = None) -> Optional[AuditPage]:
+        with self._lock:
+            if not self._ready:
+                return None
+            source = self._by_decision.get(query.decision, ()) if query.decision else self._entries
+            records: list[AuditRecord] = []
+            last_offset = None
+            for offset, record in reversed(source):
+                if before is not None and offset >= before:
+                    continue
+                if not query.matches(record):
+                    continue
+                if len(records) >= limit:
+                    return AuditPage(records=records, next_cursor=last_offset)
+                records.append(record)
+                last_offset = offset
+            if self._complete:
+                return AuditPage(records=records, next_cursor=None)
+            if records and len(records) == limit:
+                return AuditPage(records=records, next_cursor=last_offset)
+            return None
+
+    def _add(self, offset: int, record: AuditRecord) -> None:
+        entry = (offset, record)
+        self._entries.append(entry)
+        self._by_decision.setdefault(record.decision, deque()).append(entry)
+        while len(self._entries) > self.capacity:
+            evicted_offset, evicted = self._entries.popleft()
+            bucket = self._by_decision[evicted.decision]
+            if bucket and bucket[0][0] == evicted_offset:
+                bucket.popleft()
+            self._complete = False
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import fcntl
+import gzip
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+from app.audit.reader import iter_lines, iter_lines_backwards, open_log, parse_line
+from app.core.config import (
+    AUDIT_RETENTION_DAYS,
+    AUDIT_RETENTION_SEGMENTS,
+    AUDIT_SEGMENT_MAX_AGE,
+    AUDIT_SEGMENT_MAX_BYTES,
+)
+
+SEAL_BLOCK_BYTES = 1024 * 1024
+LEGACY_WINDOW_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Segment:
+    name: str
+    base_offset: int
+    size: int
+    records: Optional[int] = None
+    first_ts: Optional[str] = None
+    last_ts: Optional[str] = None
+    compressed: bool = False
+    blocks: Optional[List[List[int]]] = None
+
+    def overlaps(self, since: Optional[str], until: Optional[str]) -> bool:
+        if self.first_ts is None or self.last_ts is None:
+            return True
+        if since and self.last_ts < since:
+            return False
+        if until and self.first_ts >= until:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class SegmentManifest:
+    segments: List[Segment]
+    active_base_offset: int
+    active_started: float
+    next_segment: int
+
+
+class SegmentStore:
+    def __init__(
+        self,
+        log_path: str,
+        *,
+        max_bytes: int = AUDIT_SEGMENT_MAX_BYTES,
+        max_age: float = AUDIT_SEGMENT_MAX_AGE,
+        retention_segments: int = AUDIT_RETENTION_SEGMENTS,
+        retention_days: float = AUDIT_RETENTION_DAYS,
+    ) -> None:
+        self.log_path = Path(log_path)
+        self.manifest_path = Path(f"{log_path}.segments.json")
+        self.lock_path = Path(f"{log_path}.lock")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention_segments = retention_segments
+        self.retention_days = retention_days
+
+    def load(self) -> SegmentManifest:
+        try:
+            payload = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return SegmentManifest(segments=[], active_base_offset=0, active_started=0.0, next_segment=1)
+        return SegmentManifest(
+            segments=[Segment(**segment) for segment in payload.get("segments", [])],
+            active_base_offset=payload.get("active_base_offset", 0),
+            active_started=payload.get("active_started", 0.0),
+            next_segment=payload.get("next_segment", 1),
+        )
+
+    def segment_path(self, segment: Segment) -> Path:
+        path = self.log_path.with_name(segment.name)
+        return path.with_name(path.name + ".gz") if segment.compressed else path
+
+    @contextmanager
+    def locked(self, exclusive: bool = False) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def first_offset(self) -> int:
+        manifest = self.load()
+        return manifest.segments[0].base_offset if manifest.segments else manifest.active_base_offset
+
+    def end_offset(self) -> int:
+        manifest = self.load()
+        try:
+            return manifest.active_base_offset + self.log_path.stat().st_size
+        except FileNotFoundError:
+            return manifest.active_base_offset
+
+    def pending(self) -> List[Segment]:
+        return [segment for segment in self.load().segments if not segment.compressed]
+
+    def iter_forward(
+        self,
+        start: int = 0,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Iterator[tuple[int, bytes]]:
+        manifest, active = self._snapshot()
+        try:
+            for segment in manifest.segments:
+                if segment.base_offset + segment.size <= start or not segment.overlaps(since, until):
+                    continue
+                local = max(start - segment.base_offset, 0)
+                for offset, line in self._iter_segment(segment, local):
+                    yield segment.base_offset + offset, line
+            if active is not None:
+                local = max(start - manifest.active_base_offset, 0)
+                for offset, line in iter_lines(active, local):
+                    yield manifest.active_base_offset + offset, line
+        finally:
+            if active is not None:
+                active.close()
+
+    def iter_backward(
+        self,
+        end: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Iterator[tuple[int, bytes]]:
+        manifest, active = self._snapshot()
+        try:
+            if active is not None and (end is None or end > manifest.active_base_offset):
+                local = None if end is None else end - manifest.active_base_offset
+                for offset, line in iter_lines_backwards(active, local):
+                    yield manifest.active_base_offset + offset, line
+        finally:
+            if active is not None:
+                active.close()
+        for segment in reversed(manifest.segments):
+            if end is not None and segment.base_offset >= end:
+                continue
+            if not segment.overlaps(since, until):
+                continue
+            local = None if end is None else end - segment.base_offset
+            for offset, line in self._iter_segment_backward(segment, local):
+                yield segment.base_offset + offset, line
+
+    def active_started(self) -> float:
+        manifest = self.load()
+        if manifest.active_started:
+            return manifest.active_started
+        with self.locked(exclusive=True):
+            manifest = self.load()
+            if not manifest.active_started:
+                manifest = replace(manifest, active_started=time.time())
+                self._save(manifest)
+            return manifest.active_started
+
+    def should_rotate(self, size: int, started: float) -> bool:
+        if size <= 0:
+            return False
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        return bool(self.max_age) and time.time() - started >= self.max_age
+
+    def rotate(self) -> Optional[Segment]:
+        with self.locked(exclusive=True):
+            manifest = self.load()
+            try:
+                size = self.log_path.stat().st_size
+            except FileNotFoundError:
+                return None
+            if not self.should_rotate(size, manifest.active_started or time.time()):
+                return None
+            segment = Segment(
+                name=f"{self.log_path.name}.{manifest.next_segment:06d}",
+                base_offset=manifest.active_base_offset,
+                size=size,
+            )
+            os.replace(self.log_path, self.log_path.with_name(segment.name))
+            self._save(
+                SegmentManifest(
+                    segments=[*manifest.segments, segment],
+                    active_base_offset=manifest.active_base_offset + size,
+                    active_started=time.time(),
+                    next_segment=manifest.next_segment + 1,
+                )
+            )
+            return segment
+
+    def seal(self, segment: Segment) -> Optional[Segment]:
+        source = self.log_path.with_name(segment.name)
+        if not source.exists():
+            return None
+        records = 0
+        first_ts: Optional[str] = None
+        last_ts: Optional[str] = None
+        for _, line in iter_lines(source):
+            record = parse_line(line)
+            if record is None:
+                continue
+            records += 1
+            first_ts = record.timestamp if first_ts is None else min(first_ts, record.timestamp)
+            last_ts = record.timestamp if last_ts is None else max(last_ts, record.timestamp)
+        target = self.segment_path(replace(segment, compressed=True))
+        staging = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        blocks: List[List[int]] = []
+        with source.open("rb") as raw, staging.open("wb") as compressed:
+            offset = 0
+            while True:
+                data = raw.read(SEAL_BLOCK_BYTES)
+                if not data:
+                    break
+                if not data.endswith(b"\n"):
+                    data += raw.readline()
+                blocks.append([offset, compressed.tell()])
+                compressed.write(gzip.compress(data, mtime=0))
+                offset += len(data)
+        os.replace(staging, target)
+        sealed = replace(
+            segment,
+            records=records,
+            first_ts=first_ts,
+            last_ts=last_ts,
+            compressed=True,
+            blocks=blocks,
+        )
+        with self.locked(exclusive=True):
+            manifest = self.load()
+            self._save(
+                replace(
+                    manifest,
+                    segments=[sealed if item.name == segment.name else item for item in manifest.segments],
+                )
+            )
+        source.unlink(missing_ok=True)
+        return sealed
+
+    def apply_retention(self) -> List[Segment]:
+        with self.locked(exclusive=True):
+            manifest = self.load()
+            keep = list(manifest.segments)
+            if self.retention_days:
+                cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).isoformat()
+                keep = [segment for segment in keep if segment.last_ts is None or segment.last_ts >= cutoff]
+            if self.retention_segments and len(keep) > self.retention_segments:
+                keep = keep[-self.retention_segments :]
+            dropped = [segment for segment in manifest.segments if segment not in keep]
+            if dropped:
+                self._save(replace(manifest, segments=keep))
+        for segment in dropped:
+            self.segment_path(segment).unlink(missing_ok=True)
+            self.log_path.with_name(segment.name).unlink(missing_ok=True)
+        return dropped
+
+    def _snapshot(self) -> tuple[SegmentManifest, Optional[BinaryIO]]:
+        with self.locked():
+            manifest = self.load()
+            try:
+                active = self.log_path.open("rb")
+            except FileNotFoundError:
+                active = None
+        return manifest, active
+
+    def _iter_segment(self, segment: Segment, start: int) -> Iterator[tuple[int, bytes]]:
+        compressed = self.segment_path(replace(segment, compressed=True))
+        plain = self.log_path.with_name(segment.name)
+        for path in (compressed, plain) if segment.compressed else (plain, compressed):
+            try:
+                handle = open_log(path)
+            except FileNotFoundError:
+                continue
+            with handle:
+                yield from iter_lines(handle, start)
+            return
+
+    def _iter_segment_backward(self, segment: Segment, end: Optional[int]) -> Iterator[tuple[int, bytes]]:
+        compressed = self.segment_path(replace(segment, compressed=True))
+        plain = self.log_path.with_name(segment.name)
+        for path in (compressed, plain) if segment.compressed else (plain, compressed):
+            try:
+                handle = path.open("rb")
+            except FileNotFoundError:
+                continue
+            with handle:
+                if path == plain:
+                    yield from iter_lines_backwards(handle, end)
+                elif segment.blocks:
+                    yield from _iter_blocks_backward(handle, segment.blocks, end)
+                else:
+                    with gzip.GzipFile(fileobj=handle) as unpacked:
+                        yield from iter_lines_backwards(unpacked, end, block_size=LEGACY_WINDOW_BYTES)
+            return
+
+    def _save(self, manifest: SegmentManifest) -> None:
+        payload = {
+            "segments": [asdict(segment) for segment in manifest.segments],
+            "active_base_offset": manifest.active_base_offset,
+            "active_started": manifest.active_started,
+            "next_segment": manifest.next_segment,
+        }
+        staging = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        staging.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(staging, self.manifest_path)
+
+
+def _iter_blocks_backward(handle: BinaryIO, blocks: List[List[int]], end: Optional[int]) -> Iterator[tuple[int, bytes]]:
+    stop = handle.seek(0, 2)
+    for start, position in reversed(blocks):
+        if end is None or start < end:
+            handle.seek(position)
+            data = gzip.decompress(handle.read(stop - position))
+            local = None if end is None else end - start
+            for offset, line in iter_lines_backwards(io.BytesIO(data), local):
+                yield start + offset, line
+        stop = position
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+from pathlib import Path
+from typing import IO
+
+from app.audit.segments import SegmentStore
+from app.core.config import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL,
+    AUDIT_FSYNC_INTERVAL,
+    AUDIT_FSYNC_POLICY,
+    AUDIT_QUEUE_SIZE,
+)
+from app.core.exceptions import AuditUnavailableError
+from app.core.metrics import AUDIT_BATCH_RECORDS, AUDIT_FLUSH_LATENCY, AUDIT_QUEUE_DEPTH, AUDIT_REJECTED
+
+_STOP = object()
+REOPEN_INTERVAL = 0.5
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        path: str,
+        *,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        fsync_policy: str = AUDIT_FSYNC_POLICY,
+        fsync_interval: float = AUDIT_FSYNC_INTERVAL,
+        store: SegmentStore | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self._store = store
+        self._started = 0.0
+        self._base = 0
+        self._seal_lock = threading.Lock()
+        self._sealer: threading.Thread | None = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._flush_interval = flush_interval
+        self._batch_size = max(batch_size, 1)
+        self._fsync_policy = fsync_policy
+        self._fsync_interval = fsync_interval
+        self._last_fsync = 0.0
+        self._handle: IO[bytes] | None = None
+        self._lock = threading.Lock()
+        self._healthy = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+
+    def start(self) -> None:
+        if self._store is not None:
+            try:
+                self._store.active_started()
+            except OSError:
+                pass
+        self._reopen()
+        self._thread.start()
+        if self._store is not None and self._store.pending():
+            self._start_sealer()
+
+    def ready(self) -> bool:
+        return not self._closed and self._healthy.is_set()
+
+    def try_submit(self, line: str) -> Future[int] | None:
+        if self._closed:
+            raise AuditUnavailableError()
+        future: Future[int] = Future()
+        try:
+            self._queue.put_nowait((line, future))
+        except queue.Full:
+            return None
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return future
+
+    def submit(self, line: str, timeout: float | None = None) -> Future[int]:
+        if self._closed:
+            raise AuditUnavailableError()
+        future: Future[int] = Future()
+        try:
+            self._queue.put((line, future), timeout=timeout)
+        except queue.Full:
+            AUDIT_REJECTED.inc()
+            raise AuditUnavailableError() from None
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return future
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._healthy.clear()
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        with self._lock:
+            if self._handle is not None:
+                self._sync(force=True)
+                self._handle.close()
+                self._handle = None
+        sealer = self._sealer
+        if sealer is not None:
+            sealer.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=None if self._healthy.is_set() else REOPEN_INTERVAL)
+            except queue.Empty:
+                self._reopen()
+                continue
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self._flush_interval
+            stop = False
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: list[tuple[str, Future[int]]]) -> None:
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                encoded = [line.encode("utf-8") + b"\n" for line, _ in batch]
+                with self._store.locked(exclusive=True) if self._store is not None else nullcontext():
+                    if self._handle is None or self._replaced():
+                        self._discard_handle()
+                        self._open()
+                    offset = self._base + os.fstat(self._handle.fileno()).st_size
+                    self._handle.write(b"".join(encoded))
+                    self._handle.flush()
+                self._sync()
+        except OSError:
+            with self._lock:
+                self._discard_handle()
+            self._healthy.clear()
+            for _, future in batch:
+                future.set_exception(AuditUnavailableError())
+            AUDIT_REJECTED.inc(len(batch))
+            return
+        self._healthy.set()
+        AUDIT_FLUSH_LATENCY.observe(time.perf_counter() - start)
+        AUDIT_BATCH_RECORDS.observe(len(batch))
+        for (_, future), data in zip(batch, encoded):
+            future.set_result(offset)
+            offset += len(data)
+        if self._store is not None:
+            with self._lock:
+                try:
+                    self._maybe_rotate()
+                except OSError:
+                    self._discard_handle()
+                    self._healthy.clear()
+
+    def _reopen(self) -> None:
+        with self._lock:
+            if self._handle is None:
+                try:
+                    self._open()
+                except OSError:
+                    self._healthy.clear()
+                    return
+        self._healthy.set()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.path.open("ab")
+        if self._store is not None:
+            manifest = self._store.load()
+            self._started = manifest.active_started or time.time()
+            self._base = manifest.active_base_offset
+
+    def _replaced(self) -> bool:
+        if self._store is None:
+            return False
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._handle.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _maybe_rotate(self) -> None:
+        if self._handle is None:
+            return
+        if not self._store.should_rotate(os.fstat(self._handle.fileno()).st_size, self._started):
+            return
+        self._sync(force=True)
+        self._discard_handle()
+        if self._store.rotate() is not None:
+            self._start_sealer()
+        self._open()
+
+    def _start_sealer(self) -> None:
+        self._sealer = threading.Thread(target=self._seal_pending, name="audit-sealer", daemon=True)
+        self._sealer.start()
+
+    def _seal_pending(self) -> None:
+        with self._seal_lock:
+            try:
+                for segment in self._store.pending():
+                    self._store.seal(segment)
+                self._store.apply_retention()
+            except OSError:
+                return
+
+    def _discard_handle(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+        self._handle = None
+
+    def _sync(self, force: bool = False) -> None:
+        if self._fsync_policy == "never" and not force:
+            return
+        now = time.monotonic()
+        if self._fsync_policy == "interval" and not force and now - self._last_fsync < self._fsync_interval:
+            return
+        os.fsync(self._handle.fileno())
+        self._last_fsync = now
@@ -9,3 +9,64 @@ MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "minioadmin")
 MINIO_BUCKET = os.getenv("MINIO_BUCKET", "mig-artifacts")
 MINIO_SECURE = os.getenv("MINIO_SECURE", "false").lower() == "true"
+
+ARTIFACT_CHUNK_SIZE = int(os.getenv("ARTIFACT_CHUNK_SIZE", str(1024 * 1024)))
+
+MINIO_POOL_SIZE = int(os.getenv("MINIO_POOL_SIZE", "10"))
+MINIO_POOL_BLOCK = os.getenv("MINIO_POOL_BLOCK", "true").lower() == "true"
+MINIO_TCP_KEEPALIVE = os.getenv("MINIO_TCP_KEEPALIVE", "true").lower() == "true"
+MINIO_CONNECT_TIMEOUT = float(os.getenv("MINIO_CONNECT_TIMEOUT", "5"))
+MINIO_READ_TIMEOUT = float(os.getenv("MINIO_READ_TIMEOUT", "60"))
+MINIO_MAX_RETRIES = int(os.getenv("MINIO_MAX_RETRIES", "3"))
+MINIO_RETRY_BACKOFF = float(os.getenv("MINIO_RETRY_BACKOFF", "0.2"))
+
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", "8"))
+ARTIFACT_FETCH_WORKERS = int(os.getenv("ARTIFACT_FETCH_WORKERS", str(VALIDATION_WORKERS)))
+
+VERIFY_CACHE_ENABLED = os.getenv("VERIFY_CACHE_ENABLED", "true").lower() == "true"
+VERIFY_CACHE_MAX_BYTES = int(os.getenv("VERIFY_CACHE_MAX_BYTES", str(1024 * 1024)))
+VERIFY_CACHE_DB_PATH = os.getenv("VERIFY_CACHE_DB_PATH", "")
+VERIFY_CACHE_DB_MAX_BYTES = int(os.getenv("VERIFY_CACHE_DB_MAX_BYTES", str(64 * 1024 * 1024)))
+
+WAL_HASH_WORKERS = int(os.getenv("WAL_HASH_WORKERS", str(os.cpu_count() or 4)))
+WAL_FAIL_FAST = os.getenv("WAL_FAIL_FAST", "false").lower() == "true"
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "200"))
+
+DECISION_CACHE_ENABLED = os.getenv("DECISION_CACHE_ENABLED", "true").lower() == "true"
+DECISION_CACHE_MAX_ENTRIES = int(os.getenv("DECISION_CACHE_MAX_ENTRIES", "4096"))
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_QUEUE_POLICY = os.getenv("AUDIT_QUEUE_POLICY", "block").lower()
+AUDIT_ENQUEUE_TIMEOUT = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT", "1.0"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "512"))
+AUDIT_FSYNC_POLICY = os.getenv("AUDIT_FSYNC_POLICY", "batch").lower()
+AUDIT_FSYNC_INTERVAL = float(os.getenv("AUDIT_FSYNC_INTERVAL", "1.0"))
+AUDIT_SEGMENT_MAX_BYTES = int(os.getenv("AUDIT_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024)))
+AUDIT_SEGMENT_MAX_AGE = float(os.getenv("AUDIT_SEGMENT_MAX_AGE", "86400"))
+AUDIT_RETENTION_SEGMENTS = int(os.getenv("AUDIT_RETENTION_SEGMENTS", "0"))
+AUDIT_RETENTION_DAYS = float(os.getenv("AUDIT_RETENTION_DAYS", "0"))
+
+AUDIT_INDEX_ENABLED = os.getenv("AUDIT_INDEX_ENABLED", "true").lower() == "true"
+AUDIT_INDEX_PATH = os.getenv("AUDIT_INDEX_PATH", "") or f"{AUDIT_LOG_PATH}.index.sqlite"
+AUDIT_INDEX_SYNC_INTERVAL = float(os.getenv("AUDIT_INDEX_SYNC_INTERVAL", "1.0"))
+AUDIT_UI_LIMIT = int(os.getenv("AUDIT_UI_LIMIT", "100"))
+AUDIT_RECENT_SIZE = int(os.getenv("AUDIT_RECENT_SIZE", "1000"))
+
+YAML_BACKEND = os.getenv("YAML_BACKEND", "auto").lower()
+
+POLICY_PATH = os.getenv("POLICY_PATH", "app/policies/sets")
+POLICY_RELOAD_INTERVAL = float(os.getenv("POLICY_RELOAD_INTERVAL", "5"))
+POLICY_SCAN_MAX_DEPTH = int(os.getenv("POLICY_SCAN_MAX_DEPTH", "64"))
+POLICY_SCAN_MAX_NODES = int(os.getenv("POLICY_SCAN_MAX_NODES", "200000"))
+
+STAGE_TRACING = os.getenv("STAGE_TRACING", "false").lower() == "true"
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop").lower()
+LOG_ENQUEUE_TIMEOUT = float(os.getenv("LOG_ENQUEUE_TIMEOUT", "0.1"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+LOG_ALLOW_SAMPLE_RATE = float(os.getenv("LOG_ALLOW_SAMPLE_RATE", "1.0"))
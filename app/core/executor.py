@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import ARTIFACT_FETCH_WORKERS, VALIDATION_WORKERS
+from app.core.metrics import VALIDATION_POOL_ACTIVE, VALIDATION_POOL_QUEUED, VALIDATION_POOL_WORKERS
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_artifact_executor: ThreadPoolExecutor | None = None
+
+
+def start_validation_pool(workers: int = VALIDATION_WORKERS) -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validation")
+            VALIDATION_POOL_WORKERS.set(workers)
+        return _executor
+
+
+def shutdown_validation_pool() -> None:
+    global _executor
+    with _lock:
+        executor = _executor
+        _executor = None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+        VALIDATION_POOL_WORKERS.set(0)
+
+
+def start_artifact_pool(workers: int = ARTIFACT_FETCH_WORKERS) -> ThreadPoolExecutor:
+    global _artifact_executor
+    with _lock:
+        if _artifact_executor is None:
+            _artifact_executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="artifact")
+        return _artifact_executor
+
+
+def shutdown_artifact_pool() -> None:
+    global _artifact_executor
+    with _lock:
+        executor = _artifact_executor
+        _artifact_executor = None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def submit_artifact_task(func: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+    executor = _artifact_executor or start_artifact_pool()
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+async def run_in_validation_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    executor = _executor or start_validation_pool()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    started = False
+
+    def _run() -> T:
+        nonlocal started
+        started = True
+        VALIDATION_POOL_QUEUED.dec()
+        VALIDATION_POOL_ACTIVE.inc()
+        try:
+            return call()
+        finally:
+            VALIDATION_POOL_ACTIVE.dec()
+
+    VALIDATION_POOL_QUEUED.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, _run)
+    finally:
+        if not started:
+            VALIDATION_POOL_QUEUED.dec()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import queue
+import sys
+import threading
+from typing import Any, TextIO
+
+from app.core.config import LOG_BATCH_SIZE, LOG_ENQUEUE_TIMEOUT, LOG_QUEUE_POLICY, LOG_QUEUE_SIZE
+from app.core.metrics import LOG_DROPPED, LOG_QUEUE_DEPTH
+
+_STOP = object()
+
+
+def dumps(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=True, default=str)
+
+
+class LogWriter:
+    def __init__(
+        self,
+        *,
+        queue_size: int = LOG_QUEUE_SIZE,
+        policy: str = LOG_QUEUE_POLICY,
+        enqueue_timeout: float = LOG_ENQUEUE_TIMEOUT,
+        batch_size: int = LOG_BATCH_SIZE,
+        stream: TextIO | None = None,
+    ) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._policy = policy
+        self._enqueue_timeout = enqueue_timeout
+        self._batch_size = max(batch_size, 1)
+        self._stream = stream
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, payload: dict[str, Any]) -> bool:
+        if self._closed:
+            return False
+        try:
+            if self._policy == "block":
+                self._queue.put(payload, timeout=self._enqueue_timeout)
+            else:
+                self._queue.put_nowait(payload)
+        except queue.Full:
+            LOG_DROPPED.labels(reason="queue_full").inc()
+            return False
+        return True
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            LOG_QUEUE_DEPTH.set(self._queue.qsize())
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        stream = self._stream or sys.stdout
+        try:
+            stream.write("".join(dumps(payload) + "\n" for payload in batch))
+            stream.flush()
+        except (OSError, ValueError):
+            LOG_DROPPED.labels(reason="write_error").inc(len(batch))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import json
+import random
 from contextvars import ContextVar
-from typing import Any, Iterable
+from typing import Any, Iterable, Mapping
 
+from app.core.config import LOG_ALLOW_SAMPLE_RATE, LOG_ASYNC
+from app.core.log_writer import LogWriter, dumps
+from app.core.metrics import LOG_DROPPED
 from app.core.utils import utc_timestamp
 
 _request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
@@ -13,6 +16,24 @@ _client_var: ContextVar[str | None] = ContextVar("client", default=None)
 _artifact_refs_var: ContextVar[list[str]] = ContextVar("artifact_refs", default=[])
 _policy_version_var: ContextVar[str | None] = ContextVar("policy_version", default=None)
 
+_writer: LogWriter | None = None
+
+
+def start_log_writer() -> LogWriter | None:
+    global _writer
+    if _writer is None and LOG_ASYNC:
+        _writer = LogWriter()
+        _writer.start()
+    return _writer
+
+
+def stop_log_writer() -> None:
+    global _writer
+    writer = _writer
+    _writer = None
+    if writer is not None:
+        writer.close()
+
 
 def set_request_context(
     *,
@@ -51,7 +72,11 @@ def update_request_context(
 
 
 def log_stdout(payload: dict[str, Any]) -> None:
-    print(json.dumps(payload, ensure_ascii=True))
+    writer = _writer
+    if writer is None:
+        print(dumps(payload), flush=True)
+    else:
+        writer.submit(payload)
 
 
 def log_request_summary(
@@ -64,25 +89,33 @@ def log_request_summary(
     reason_codes: Iterable[str],
     artifact_refs: Iterable[str],
     duration_ms: int,
+    stage_ms: Mapping[str, float] | None = None,
     log_type: str = "audit",
     level: str = "INFO",
+    sample_rate: float = LOG_ALLOW_SAMPLE_RATE,
 ) -> None:
-    log_stdout(
-        {
-            "timestamp": utc_timestamp(),
-            "level": level,
-            "service": "security-gate",
-            "log_type": log_type,
-            "request_id": request_id,
-            "scenario": scenario,
-            "endpoint": endpoint,
-            "client": client,
-            "decision": decision,
-            "reason_codes": list(reason_codes),
-            "artifact_refs": list(artifact_refs),
-            "duration_ms": duration_ms,
-        }
-    )
+    sampled = decision == "ALLOW" and sample_rate < 1
+    if sampled and random.random() >= sample_rate:
+        LOG_DROPPED.labels(reason="sampled").inc()
+        return
+    payload = {
+        "timestamp": utc_timestamp(),
+        "level": level,
+        "service": "security-gate",
+        "log_type": log_type,
+        "request_id": request_id,
+        "scenario": scenario,
+        "endpoint": endpoint,
+        "client": client,
+        "decision": decision,
+        "reason_codes": list(reason_codes),
+        "artifact_refs": list(artifact_refs),
+        "duration_ms": duration_ms,
+        "stage_ms": dict(stage_ms or {}),
+    }
+    if sampled:
+        payload["sample_rate"] = sample_rate
+    log_stdout(payload)
 
 
 def log_event(
@@ -113,5 +146,9 @@ def log_event(
     )
 
 
+def get_scenario() -> str | None:
+    return _scenario_var.get()
+
+
 def get_policy_version() -> str | None:
     return _policy_version_var.get()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+import re
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+from app.core.config import PROMETHEUS_MULTIPROC_DIR
+
+_WORKER_FILE = re.compile(r"_(\d+)\.db$")
+
+VALIDATION_POOL_WORKERS = Gauge(
+    "security_gate_validation_pool_workers",
+    "Configured validation worker pool size",
+    multiprocess_mode="livesum",
+)
+VALIDATION_POOL_ACTIVE = Gauge(
+    "security_gate_validation_pool_active",
+    "Validation tasks currently running in the worker pool",
+    multiprocess_mode="livesum",
+)
+VALIDATION_POOL_QUEUED = Gauge(
+    "security_gate_validation_pool_queued",
+    "Validation tasks waiting for a free worker",
+    multiprocess_mode="livesum",
+)
+STAGE_LATENCY = Histogram(
+    "security_gate_stage_duration_seconds",
+    "Time spent in each validation stage",
+    ["stage", "endpoint"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+MINIO_POOL_CONNECTIONS = Gauge(
+    "security_gate_minio_pool_connections",
+    "MinIO HTTP connection pool usage",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+ARTIFACT_FETCHED_BYTES = Counter(
+    "security_gate_artifact_fetched_bytes_total",
+    "Artifact bytes downloaded from MinIO",
+    ["kind", "scenario"],
+)
+ARTIFACT_HASHED_BYTES = Counter(
+    "security_gate_artifact_hashed_bytes_total",
+    "Artifact bytes hashed",
+    ["kind", "scenario"],
+)
+ARTIFACT_SIZE = Histogram(
+    "security_gate_artifact_size_bytes",
+    "Size of each verified artifact",
+    ["kind", "scenario"],
+    buckets=(
+        1024,
+        16 * 1024,
+        256 * 1024,
+        1024**2,
+        16 * 1024**2,
+        64 * 1024**2,
+        256 * 1024**2,
+        1024**3,
+        4 * 1024**3,
+        16 * 1024**3,
+    ),
+)
+ARTIFACT_FETCH_TTFB = Histogram(
+    "security_gate_artifact_fetch_ttfb_seconds",
+    "Time from the MinIO GET request to the first artifact byte",
+    ["kind", "scenario"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+ARTIFACT_THROUGHPUT = Histogram(
+    "security_gate_artifact_throughput_megabytes_per_second",
+    "Effective artifact fetch or hash throughput in MB/s",
+    ["kind", "scenario", "operation"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+VERIFY_CACHE_LOOKUPS = Counter(
+    "security_gate_verify_cache_lookups_total",
+    "Artifact verification cache lookups by tier and result",
+    ["tier", "result"],
+)
+VERIFY_CACHE_EVICTIONS = Counter(
+    "security_gate_verify_cache_evictions_total",
+    "Artifact verification cache evictions by tier",
+    ["tier"],
+)
+DECISION_CACHE_LOOKUPS = Counter(
+    "security_gate_decision_cache_lookups_total",
+    "T1 decision cache lookups by result",
+    ["result"],
+)
+DECISION_CACHE_EVICTIONS = Counter(
+    "security_gate_decision_cache_evictions_total",
+    "T1 decision cache entries evicted by size limit or policy change",
+)
+DECISION_CACHE_ENTRIES = Gauge(
+    "security_gate_decision_cache_entries",
+    "T1 decisions currently cached",
+    multiprocess_mode="livesum",
+)
+AUDIT_QUEUE_DEPTH = Gauge(
+    "security_gate_audit_queue_depth",
+    "Audit records waiting for the background writer",
+    multiprocess_mode="livesum",
+)
+AUDIT_FLUSH_LATENCY = Histogram(
+    "security_gate_audit_flush_duration_seconds",
+    "Time to write, flush and fsync one audit batch",
+)
+AUDIT_BATCH_RECORDS = Histogram(
+    "security_gate_audit_batch_records",
+    "Audit records committed per group commit",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+AUDIT_REJECTED = Counter(
+    "security_gate_audit_rejected_total",
+    "Audit records rejected because the writer queue was full or unavailable",
+)
+LOG_QUEUE_DEPTH = Gauge(
+    "security_gate_log_queue_depth",
+    "Log lines waiting for the background stdout writer",
+    multiprocess_mode="livesum",
+)
+LOG_DROPPED = Counter(
+    "security_gate_log_dropped_total",
+    "Log lines not written, by reason (queue_full, write_error, sampled)",
+    ["reason"],
+)
+YAML_BACKEND_INFO = Gauge(
+    "security_gate_yaml_backend_info",
+    "Active YAML loader backend (libyaml or python)",
+    ["backend"],
+    multiprocess_mode="livemax",
+)
+POLICY_RELOADS = Counter(
+    "security_gate_policy_reloads_total",
+    "Policy set reloads by result",
+    ["result"],
+)
+
+
+def render_metrics() -> bytes:
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest()
+    mark_dead_workers()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=PROMETHEUS_MULTIPROC_DIR)
+    return generate_latest(registry)
+
+
+def mark_dead_workers() -> list[int]:
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return []
+    pids = set()
+    for name in os.listdir(PROMETHEUS_MULTIPROC_DIR):
+        match = _WORKER_FILE.search(name)
+        if match is not None and name.startswith("gauge_live"):
+            pids.add(int(match.group(1)))
+    dead = sorted(pid for pid in pids if not _alive(pid))
+    for pid in dead:
+        multiprocess.mark_process_dead(pid, PROMETHEUS_MULTIPROC_DIR)
+    return dead
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
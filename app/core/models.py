@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,11 +13,17 @@ class MigrationManifest(BaseModel):
     config_sha256: str
 
 
+class WalSegment(BaseModel):
+    name: str
+    sha256: str
+
+
 class ReplicationManifest(BaseModel):
     source_db: str
     target_db: str
     expected_snapshot_hash: str
     sync_mode: str
+    wal_segments: List[WalSegment] = Field(default_factory=list)
 
 
 class ReferenceArtifact(BaseModel):
@@ -39,11 +45,13 @@ class ReplicationReferenceManifest(BaseModel):
 class Reason(BaseModel):
     code: str
     message: str
+    paths: List[str] = Field(default_factory=list)
 
 
 class ComputedHashes(BaseModel):
     config: Optional[str] = None
     snapshot: Optional[str] = None
+    wal_segments: Optional[Dict[str, str]] = None
 
 
 class Artifacts(BaseModel):
@@ -59,6 +67,23 @@ class ValidationResult(BaseModel):
     timestamp: str
 
 
+class BatchItem(BaseModel):
+    scenario: str
+    migration_manifest: Optional[str] = None
+    app_config: Optional[str] = None
+    reference_manifest: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+
+
+class BatchValidationResult(BaseModel):
+    request_id: str
+    decision: str
+    results: List[ValidationResult] = Field(default_factory=list)
+
+
 class AuditRecord(BaseModel):
     request_id: str
     scenario: str
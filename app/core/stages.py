@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Iterator
+
+from app.core.config import STAGE_TRACING
+from app.core.metrics import STAGE_LATENCY
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+_tracer = trace.get_tracer("security-gate") if trace is not None and STAGE_TRACING else None
+
+
+class StageTimings:
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._durations: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._durations[name] = self._durations.get(name, 0.0) + seconds
+
+    def as_ms(self) -> dict[str, float]:
+        with self._lock:
+            return {name: round(seconds * 1000, 3) for name, seconds in self._durations.items()}
+
+
+_timings_var: ContextVar[StageTimings | None] = ContextVar("stage_timings", default=None)
+
+
+def begin_stages(endpoint: str) -> StageTimings:
+    timings = StageTimings(endpoint)
+    _timings_var.set(timings)
+    return timings
+
+
+def record_stage(name: str, seconds: float) -> None:
+    timings = _timings_var.get()
+    STAGE_LATENCY.labels(stage=name, endpoint=timings.endpoint if timings is not None else "").observe(seconds)
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def record_ingest() -> None:
+    timings = _timings_var.get()
+    if timings is not None:
+        record_stage("ingest", time.perf_counter() - timings.started)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    span = _tracer.start_as_current_span(f"stage.{name}") if _tracer is not None else nullcontext()
+    start = time.perf_counter()
+    try:
+        with span:
+            yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
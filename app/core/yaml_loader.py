@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+import yaml
+from yaml import YAMLError
+
+from app.core.config import YAML_BACKEND
+from app.core.metrics import YAML_BACKEND_INFO
+
+LOADERS: dict[str, type] = {"python": yaml.SafeLoader}
+if getattr(yaml, "__with_libyaml__", False) and hasattr(yaml, "CSafeLoader"):
+    LOADERS["libyaml"] = yaml.CSafeLoader
+
+
+def select_backend(preferred: str = "auto") -> str:
+    if preferred in LOADERS:
+        return preferred
+    return "libyaml" if "libyaml" in LOADERS else "python"
+
+
+BACKEND = select_backend(YAML_BACKEND)
+_LOADER = LOADERS[BACKEND]
+YAML_BACKEND_INFO.labels(backend=BACKEND).set(1)
+
+
+def load_yaml(text: str, backend: str | None = None) -> Any:
+    loader = LOADERS[backend] if backend is not None else _LOADER
+    return yaml.load(text, Loader=loader)
+
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import Future, wait
 from dataclasses import dataclass
+from typing import Iterator
 
 from minio import Minio
 from minio.error import S3Error
 
-from app.core.config import (
-    MINIO_ACCESS_KEY,
-    MINIO_ENDPOINT,
-    MINIO_SECRET_KEY,
-    MINIO_SECURE,
-)
+from app.core.config import ARTIFACT_CHUNK_SIZE
+from app.core.logging import get_scenario
+from app.core.metrics import ARTIFACT_FETCH_TTFB, ARTIFACT_FETCHED_BYTES, ARTIFACT_SIZE
+from app.core.stages import record_stage, stage
+from app.integrity.cache import CacheKey, get_verification_cache
+from app.integrity.client import get_minio_client
+from app.integrity.hashing import StreamDigest, hash_stream, observe_hashed, observe_throughput
 
 
 @dataclass(frozen=True)
@@ -19,18 +24,174 @@ class S3Location:
     key: str
 
 
-def fetch_s3_object(uri: str) -> bytes:
+CANCEL_POLL_INTERVAL = 0.05
+
+
+class TransferCancelledError(RuntimeError):
+    pass
+
+
+class SharedTransfer:
+    def __init__(self) -> None:
+        self.digest: Future[StreamDigest] = Future()
+        self._lock = threading.Lock()
+        self._waiters: list[threading.Event | None] = []
+
+    def join(self, cancel: threading.Event | None) -> None:
+        with self._lock:
+            self._waiters.append(cancel)
+
+    def is_set(self) -> bool:
+        with self._lock:
+            return all(waiter is not None and waiter.is_set() for waiter in self._waiters)
+
+    def aborted(self) -> bool:
+        return self.digest.done() and isinstance(self.digest.exception(), TransferCancelledError)
+
+
+class SharedArtifactDigests:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._transfers: dict[str, SharedTransfer] = {}
+
+    def hash(
+        self,
+        uri: str,
+        chunk_size: int = ARTIFACT_CHUNK_SIZE,
+        cancel: threading.Event | None = None,
+        kind: str = "artifact",
+    ) -> StreamDigest:
+        while True:
+            with self._lock:
+                transfer = self._transfers.get(uri)
+                owner = transfer is None or transfer.aborted()
+                if owner:
+                    transfer = SharedTransfer()
+                    self._transfers[uri] = transfer
+                transfer.join(cancel)
+            if owner:
+                try:
+                    transfer.digest.set_result(hash_s3_object(uri, chunk_size, transfer, kind=kind))
+                except Exception as exc:
+                    transfer.digest.set_exception(exc)
+            elif cancel is not None:
+                while not transfer.digest.done():
+                    if cancel.is_set():
+                        raise TransferCancelledError("Artifact transfer cancelled")
+                    wait([transfer.digest], timeout=CANCEL_POLL_INTERVAL)
+            try:
+                return transfer.digest.result()
+            except TransferCancelledError:
+                if cancel is not None and cancel.is_set():
+                    raise
+
+    def __len__(self) -> int:
+        return len(self._transfers)
+
+
+def fetch_s3_object(uri: str, kind: str = "artifact") -> bytes:
+    start = time.perf_counter()
+    data = b"".join(iter_s3_object(uri, kind=kind))
+    scenario = get_scenario() or ""
+    ARTIFACT_FETCHED_BYTES.labels(kind=kind, scenario=scenario).inc(len(data))
+    ARTIFACT_SIZE.labels(kind=kind, scenario=scenario).observe(len(data))
+    observe_throughput(kind, "fetch", len(data), time.perf_counter() - start)
+    return data
+
+
+def hash_s3_object(
+    uri: str,
+    chunk_size: int = ARTIFACT_CHUNK_SIZE,
+    cancel: threading.Event | SharedTransfer | None = None,
+    kind: str = "artifact",
+) -> StreamDigest:
+    try:
+        cache = get_verification_cache()
+        if cache is None:
+            return _hash_fetched(iter_s3_object(uri, chunk_size, cancel, kind=kind), kind)
+        location = parse_s3_uri(uri)
+        with stage("fetch"):
+            stat = _minio_client().stat_object(location.bucket, location.key)
+        cache_key = CacheKey(
+            bucket=location.bucket,
+            key=location.key,
+            etag=stat.etag or "",
+            version_id=stat.version_id or "",
+            size=stat.size or 0,
+        )
+        cached = cache.get(cache_key) if cache_key.etag else None
+        if cached is not None:
+            return StreamDigest(sha256=cached, size=cache_key.size)
+        digest = _hash_fetched(
+            iter_s3_object(uri, chunk_size, cancel, etag=stat.etag, version_id=stat.version_id, kind=kind),
+            kind,
+        )
+        if cache_key.etag and digest.size == cache_key.size:
+            cache.put(cache_key, digest.sha256)
+        return digest
+    except RuntimeError:
+        raise
+    except Exception as exc:
+        raise RuntimeError("Failed to fetch artifact from MinIO") from exc
+
+
+def iter_s3_object(
+    uri: str,
+    chunk_size: int = ARTIFACT_CHUNK_SIZE,
+    cancel: threading.Event | SharedTransfer | None = None,
+    etag: str | None = None,
+    version_id: str | None = None,
+    kind: str = "artifact",
+) -> Iterator[bytes]:
     location = parse_s3_uri(uri)
     client = _minio_client()
+    start = time.perf_counter()
     try:
-        response = client.get_object(location.bucket, location.key)
-        try:
-            return response.read()
-        finally:
-            response.close()
-            response.release_conn()
+        response = client.get_object(
+            location.bucket,
+            location.key,
+            request_headers={"If-Match": f'"{etag}"'} if etag else None,
+            version_id=version_id,
+        )
     except S3Error as exc:
         raise RuntimeError("Failed to fetch artifact from MinIO") from exc
+    first = True
+    try:
+        for chunk in response.stream(chunk_size):
+            if first:
+                ttfb = time.perf_counter() - start
+                ARTIFACT_FETCH_TTFB.labels(kind=kind, scenario=get_scenario() or "").observe(ttfb)
+                first = False
+            if cancel is not None and cancel.is_set():
+                raise TransferCancelledError("Artifact transfer cancelled")
+            yield chunk
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def _hash_fetched(chunks: Iterator[bytes], kind: str) -> StreamDigest:
+    fetching = 0.0
+
+    def timed() -> Iterator[bytes]:
+        nonlocal fetching
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            fetching += time.perf_counter() - start
+            if chunk is None:
+                return
+            yield chunk
+
+    start = time.perf_counter()
+    digest = hash_stream(timed())
+    hashing = time.perf_counter() - start - fetching
+    record_stage("fetch", fetching)
+    record_stage("hash", hashing)
+    ARTIFACT_FETCHED_BYTES.labels(kind=kind, scenario=get_scenario() or "").inc(digest.size)
+    observe_throughput(kind, "fetch", digest.size, fetching)
+    observe_hashed(kind, digest.size, hashing)
+    return digest
 
 
 def parse_s3_uri(uri: str) -> S3Location:
@@ -46,5 +207,4 @@ def parse_s3_uri(uri: str) -> S3Location:
 
 
 def _minio_client() -> Minio:
-    endpoint = MINIO_ENDPOINT.replace("http://", "").replace("https://", "")
-    return Minio(endpoint, access_key=MINIO_ACCESS_KEY, secret_key=MINIO_SECRET_KEY, secure=MINIO_SECURE)
+    return get_minio_client()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import (
+    VERIFY_CACHE_DB_MAX_BYTES,
+    VERIFY_CACHE_DB_PATH,
+    VERIFY_CACHE_ENABLED,
+    VERIFY_CACHE_MAX_BYTES,
+)
+from app.core.metrics import VERIFY_CACHE_EVICTIONS, VERIFY_CACHE_LOOKUPS
+
+ENTRY_OVERHEAD = 200
+_ROW_BYTES = f"length(bucket) + length(key) + length(etag) + length(version_id) + length(sha256) + {ENTRY_OVERHEAD}"
+_MATCH = "bucket = ? AND key = ? AND etag = ? AND version_id = ? AND size = ?"
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    bucket: str
+    key: str
+    etag: str
+    version_id: str
+    size: int
+
+
+def entry_bytes(key: CacheKey, sha256: str) -> int:
+    return len(key.bucket) + len(key.key) + len(key.etag) + len(key.version_id) + len(sha256) + ENTRY_OVERHEAD
+
+
+class VerificationCache:
+    def __init__(self, max_bytes: int, db_path: str = "", db_max_bytes: int = 0) -> None:
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._entries: OrderedDict[CacheKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_path = db_path
+        self._db_max_bytes = db_max_bytes
+        self._db_bytes = 0
+        self._db_lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        if db_path:
+            self._db_bytes = _db_size(self._connection())
+
+    def get(self, key: CacheKey) -> str | None:
+        with self._lock:
+            sha256 = self._entries.get(key)
+            if sha256 is not None:
+                self._entries.move_to_end(key)
+                VERIFY_CACHE_LOOKUPS.labels(tier="memory", result="hit").inc()
+                return sha256
+            VERIFY_CACHE_LOOKUPS.labels(tier="memory", result="miss").inc()
+        if not self._db_path:
+            return None
+        db = self._connection()
+        params = (key.bucket, key.key, key.etag, key.version_id, key.size)
+        row = db.execute(f"SELECT sha256 FROM verified WHERE {_MATCH}", params).fetchone()
+        if row is None:
+            VERIFY_CACHE_LOOKUPS.labels(tier="disk", result="miss").inc()
+            return None
+        VERIFY_CACHE_LOOKUPS.labels(tier="disk", result="hit").inc()
+        with db:
+            db.execute(f"UPDATE verified SET last_used = ? WHERE {_MATCH}", (time.time(), *params))
+        with self._lock:
+            self._remember(key, row[0])
+        return row[0]
+
+    def put(self, key: CacheKey, sha256: str) -> None:
+        with self._lock:
+            self._remember(key, sha256)
+        if not self._db_path:
+            return
+        db = self._connection()
+        params = (key.bucket, key.key, key.etag, key.version_id, key.size)
+        with db:
+            exists = db.execute(f"SELECT 1 FROM verified WHERE {_MATCH}", params).fetchone() is not None
+            db.execute(
+                "INSERT OR REPLACE INTO verified (bucket, key, etag, version_id, size, sha256, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*params, sha256, time.time()),
+            )
+        with self._db_lock:
+            if not exists:
+                self._db_bytes += entry_bytes(key, sha256)
+            if self._db_bytes <= self._db_max_bytes:
+                return
+        self._evict_disk(db)
+
+    def close(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        with self._db_lock:
+            connections = self._connections
+            self._connections = []
+            self._db_path = ""
+        for connection in connections:
+            connection.close()
+
+    def _remember(self, key: CacheKey, sha256: str) -> None:
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._bytes -= entry_bytes(key, previous)
+        self._entries[key] = sha256
+        self._entries.move_to_end(key)
+        self._bytes += entry_bytes(key, sha256)
+        while self._bytes > self._max_bytes and self._entries:
+            evicted, value = self._entries.popitem(last=False)
+            self._bytes -= entry_bytes(evicted, value)
+            VERIFY_CACHE_EVICTIONS.labels(tier="memory").inc()
+
+    def _evict_disk(self, db: sqlite3.Connection) -> None:
+        with db:
+            total = _db_size(db)
+            overflow = total - self._db_max_bytes
+            evicted = []
+            if overflow > 0:
+                for rowid, size in db.execute(f"SELECT rowid, {_ROW_BYTES} FROM verified ORDER BY last_used"):
+                    evicted.append((rowid,))
+                    overflow -= size
+                    total -= size
+                    if overflow <= 0:
+                        break
+                db.executemany("DELETE FROM verified WHERE rowid = ?", evicted)
+        if evicted:
+            VERIFY_CACHE_EVICTIONS.labels(tier="disk").inc(len(evicted))
+        with self._db_lock:
+            self._db_bytes = total
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = _open_db(self._db_path)
+            self._local.connection = connection
+            with self._db_lock:
+                self._connections.append(connection)
+        return connection
+
+
+_lock = threading.Lock()
+_cache: VerificationCache | None = None
+
+
+def get_verification_cache() -> VerificationCache | None:
+    global _cache
+    if not VERIFY_CACHE_ENABLED:
+        return None
+    if _cache is not None:
+        return _cache
+    with _lock:
+        if _cache is None:
+            _cache = VerificationCache(
+                max_bytes=VERIFY_CACHE_MAX_BYTES,
+                db_path=VERIFY_CACHE_DB_PATH,
+                db_max_bytes=VERIFY_CACHE_DB_MAX_BYTES,
+            )
+        return _cache
+
+
+def close_verification_cache() -> None:
+    global _cache
+    with _lock:
+        cache = _cache
+        _cache = None
+    if cache is not None:
+        cache.close()
+
+
+def _db_size(db: sqlite3.Connection) -> int:
+    return db.execute(f"SELECT COALESCE(SUM({_ROW_BYTES}), 0) FROM verified").fetchone()[0]
+
+
+def _open_db(db_path: str) -> sqlite3.Connection:
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS verified ("
+        "bucket TEXT NOT NULL, key TEXT NOT NULL, etag TEXT NOT NULL, version_id TEXT NOT NULL, "
+        "size INTEGER NOT NULL, sha256 TEXT NOT NULL, last_used REAL NOT NULL, "
+        "PRIMARY KEY (bucket, key, etag, version_id, size))"
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS verified_last_used ON verified (last_used)")
+    connection.commit()
+    return connection
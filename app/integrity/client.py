@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from dataclasses import dataclass
+
+import certifi
+import urllib3
+from minio import Minio
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry, Timeout
+
+from app.core.config import (
+    MINIO_ACCESS_KEY,
+    MINIO_CONNECT_TIMEOUT,
+    MINIO_ENDPOINT,
+    MINIO_MAX_RETRIES,
+    MINIO_POOL_BLOCK,
+    MINIO_POOL_SIZE,
+    MINIO_READ_TIMEOUT,
+    MINIO_RETRY_BACKOFF,
+    MINIO_SECRET_KEY,
+    MINIO_SECURE,
+    MINIO_TCP_KEEPALIVE,
+)
+from app.core.metrics import MINIO_POOL_CONNECTIONS
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    in_use: int
+    idle: int
+    waiting: int
+
+
+_lock = threading.Lock()
+_client: Minio | None = None
+_http: urllib3.PoolManager | None = None
+_waiting = 0
+
+
+class _TrackedPoolMixin:
+    def _get_conn(self, timeout: float | None = None):
+        global _waiting
+        with _lock:
+            _waiting += 1
+        publish_pool_stats()
+        try:
+            return super()._get_conn(timeout=timeout)
+        finally:
+            with _lock:
+                _waiting -= 1
+            publish_pool_stats()
+
+    def _put_conn(self, conn) -> None:
+        try:
+            super()._put_conn(conn)
+        finally:
+            publish_pool_stats()
+
+
+class _TrackedHTTPConnectionPool(_TrackedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackedHTTPSConnectionPool(_TrackedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+def init_minio_client() -> Minio:
+    global _client, _http
+    with _lock:
+        if _client is None:
+            _http = _build_pool_manager()
+            endpoint = MINIO_ENDPOINT.replace("http://", "").replace("https://", "")
+            _client = Minio(
+                endpoint,
+                access_key=MINIO_ACCESS_KEY,
+                secret_key=MINIO_SECRET_KEY,
+                secure=MINIO_SECURE,
+                http_client=_http,
+            )
+        return _client
+
+
+def get_minio_client() -> Minio:
+    client = _client
+    if client is not None:
+        return client
+    return init_minio_client()
+
+
+def close_minio_client() -> None:
+    global _client, _http
+    with _lock:
+        http = _http
+        _client = None
+        _http = None
+    if http is not None:
+        http.clear()
+
+
+def minio_pool_stats() -> PoolStats:
+    http = _http
+    if http is None:
+        return PoolStats(in_use=0, idle=0, waiting=0)
+    in_use = 0
+    idle = 0
+    for key in http.pools.keys():
+        pool = http.pools.get(key)
+        queue = getattr(pool, "pool", None)
+        if queue is None:
+            continue
+        available = list(queue.queue)
+        idle += sum(1 for conn in available if conn is not None)
+        in_use += max(queue.maxsize - len(available), 0)
+    return PoolStats(in_use=in_use, idle=idle, waiting=_waiting)
+
+
+def publish_pool_stats() -> None:
+    pool = minio_pool_stats()
+    MINIO_POOL_CONNECTIONS.labels(state="in_use").set(pool.in_use)
+    MINIO_POOL_CONNECTIONS.labels(state="idle").set(pool.idle)
+    MINIO_POOL_CONNECTIONS.labels(state="waiting").set(pool.waiting)
+
+
+def _build_pool_manager() -> urllib3.PoolManager:
+    socket_options = list(HTTPConnection.default_socket_options)
+    if MINIO_TCP_KEEPALIVE:
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    http = urllib3.PoolManager(
+        num_pools=4,
+        maxsize=MINIO_POOL_SIZE,
+        block=MINIO_POOL_BLOCK,
+        timeout=Timeout(connect=MINIO_CONNECT_TIMEOUT, read=MINIO_READ_TIMEOUT),
+        retries=Retry(
+            total=MINIO_MAX_RETRIES,
+            backoff_factor=MINIO_RETRY_BACKOFF,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+        socket_options=socket_options,
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    )
+    http.pool_classes_by_scheme = {
+        "http": _TrackedHTTPConnectionPool,
+        "https": _TrackedHTTPSConnectionPool,
+    }
+    return http
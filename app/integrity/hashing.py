@@ -1,9 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable
+
+from app.core.config import ARTIFACT_CHUNK_SIZE
+from app.core.logging import get_scenario
+from app.core.metrics import ARTIFACT_HASHED_BYTES, ARTIFACT_SIZE, ARTIFACT_THROUGHPUT
 from app.core.utils import compute_sha256, normalize_hex
 
+MEGABYTE = 1_000_000
+
+
+@dataclass(frozen=True)
+class StreamDigest:
+    sha256: str
+    size: int
+
+
+def hash_bytes(data: bytes, kind: str | None = None) -> str:
+    start = time.perf_counter()
+    digest = compute_sha256(data)
+    if kind is not None:
+        observe_hashed(kind, len(data), time.perf_counter() - start)
+    return digest
+
 
-def hash_bytes(data: bytes) -> str:
-    return compute_sha256(data)
+def hash_stream(chunks: Iterable[bytes], kind: str | None = None) -> StreamDigest:
+    start = time.perf_counter()
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        hasher.update(chunk)
+        size += len(chunk)
+    if kind is not None:
+        observe_hashed(kind, size, time.perf_counter() - start)
+    return StreamDigest(sha256=hasher.hexdigest(), size=size)
+
+
+def hash_file(handle: BinaryIO, chunk_size: int = ARTIFACT_CHUNK_SIZE, kind: str | None = None) -> StreamDigest:
+    return hash_stream(iter(lambda: handle.read(chunk_size), b""), kind=kind)
 
 
 def hashes_match(expected: str, actual: str) -> bool:
     return normalize_hex(expected) == normalize_hex(actual)
+
+
+def observe_hashed(kind: str, size: int, seconds: float) -> None:
+    scenario = get_scenario() or ""
+    ARTIFACT_HASHED_BYTES.labels(kind=kind, scenario=scenario).inc(size)
+    ARTIFACT_SIZE.labels(kind=kind, scenario=scenario).observe(size)
+    observe_throughput(kind, "hash", size, seconds)
+
+
+def observe_throughput(kind: str, operation: str, size: int, seconds: float) -> None:
+    if size > 0 and seconds > 0:
+        ARTIFACT_THROUGHPUT.labels(kind=kind, scenario=get_scenario() or "", operation=operation).observe(
+            size / MEGABYTE / seconds
+        )
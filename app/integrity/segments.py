@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import BinaryIO, Iterator, Mapping
+
+from app.core.config import ARTIFACT_CHUNK_SIZE, WAL_FAIL_FAST, WAL_HASH_WORKERS
+from app.core.executor import submit_artifact_task
+from app.integrity.hashing import hash_stream, hashes_match
+
+
+@dataclass(frozen=True)
+class SegmentReport:
+    computed: dict[str, str] = field(default_factory=dict)
+    mismatched: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    unexpected: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.mismatched or self.missing or self.unexpected)
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def verify_segments(
+    segments: Mapping[str, BinaryIO],
+    expected: Mapping[str, str],
+    *,
+    workers: int = WAL_HASH_WORKERS,
+    fail_fast: bool = WAL_FAIL_FAST,
+) -> SegmentReport:
+    report = SegmentReport(
+        missing=sorted(name for name in expected if name not in segments),
+        unexpected=sorted(name for name in segments if name not in expected),
+    )
+    if fail_fast and not report.ok:
+        return report
+
+    cancel = threading.Event()
+    queued = iter([(name, handle) for name, handle in segments.items() if name in expected])
+    pending: dict[Future[str], str] = {}
+    try:
+        while True:
+            for name, handle in islice(queued, max(workers, 1) - len(pending)):
+                pending[submit_artifact_task(_hash_segment, handle, cancel)] = name
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    digest = future.result()
+                except _Cancelled:
+                    continue
+                report.computed[name] = digest
+                if not hashes_match(expected[name], digest):
+                    report.mismatched.append(name)
+            if fail_fast and report.mismatched:
+                break
+    finally:
+        cancel.set()
+        for future in pending:
+            future.cancel()
+        wait(pending)
+    report.mismatched.sort()
+    return report
+
+
+def _hash_segment(handle: BinaryIO, cancel: threading.Event) -> str:
+    return hash_stream(_read_chunks(handle, cancel), kind="wal").sha256
+
+
+def _read_chunks(handle: BinaryIO, cancel: threading.Event) -> Iterator[bytes]:
+    handle.seek(0)
+    while True:
+        if cancel.is_set():
+            raise _Cancelled()
+        chunk = handle.read(ARTIFACT_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, List, Mapping
+
+from app.core.config import POLICY_SCAN_MAX_DEPTH, POLICY_SCAN_MAX_NODES
+from app.core.models import Reason
+from app.core.yaml_loader import YAMLError, load_yaml
+
+POLICY_SUFFIXES = {".yaml", ".yml", ".json"}
+SECTIONS = ("migration", "replication")
+
+_MISSING = object()
+
+Inspector = Callable[[Any, str], List[str]]
+
+
+class PolicyError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    name: str
+    code: str
+    message: str
+    path: tuple[str, ...] | None = None
+    inspect: Inspector | None = None
+    keys: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class Scanner:
+    rules: tuple[CompiledRule, ...]
+    targets: Mapping[tuple[str, ...], tuple[CompiledRule, ...]]
+    key_rules: tuple[CompiledRule, ...]
+    keys: frozenset[str]
+
+    @classmethod
+    def build(cls, rules: tuple[CompiledRule, ...]) -> "Scanner":
+        targets: dict[tuple[str, ...], list[CompiledRule]] = {}
+        for rule in rules:
+            if rule.path is not None:
+                targets.setdefault(rule.path, []).append(rule)
+        key_rules = tuple(rule for rule in rules if rule.keys)
+        return cls(
+            rules=rules,
+            targets={path: tuple(items) for path, items in targets.items()},
+            key_rules=key_rules,
+            keys=frozenset().union(*(rule.keys for rule in key_rules)),
+        )
+
+    def scan(self, document: Any, *, max_depth: int, max_nodes: int) -> List[Reason]:
+        if not self.rules:
+            return []
+        found: dict[str, list[str]] = {rule.name: [] for rule in self.rules}
+        captured, complete = self._walk(document, found, max_depth, max_nodes)
+        for path, rules in self.targets.items():
+            value = captured[path] if path in captured else _resolve(document, path)
+            for rule in rules:
+                found[rule.name].extend(rule.inspect(value, format_path(path)))
+        reasons = [
+            Reason(code=rule.code, message=rule.message, paths=found[rule.name])
+            for rule in self.rules
+            if found[rule.name]
+        ]
+        if not complete:
+            reasons.append(
+                Reason(
+                    code="CONFIG_LIMIT_EXCEEDED",
+                    message=f"Document exceeds scan limits (depth {max_depth}, nodes {max_nodes})",
+                )
+            )
+        return reasons
+
+    def _walk(
+        self,
+        document: Any,
+        found: dict[str, list[str]],
+        max_depth: int,
+        max_nodes: int,
+    ) -> tuple[dict[tuple, Any], bool]:
+        captured: dict[tuple, Any] = {}
+        stack: list[tuple[Any, tuple, int]] = [(document, (), 0)]
+        nodes = 0
+        while stack:
+            value, path, depth = stack.pop()
+            nodes += 1
+            if nodes > max_nodes or depth > max_depth:
+                return captured, False
+            if path in self.targets:
+                captured[path] = value
+            if isinstance(value, dict):
+                children = []
+                for key, child in value.items():
+                    child_path = path + (key,)
+                    if isinstance(key, str) and key.lower() in self.keys and isinstance(child, str) and child.strip():
+                        for rule in self.key_rules:
+                            if key.lower() in rule.keys:
+                                found[rule.name].append(format_path(child_path))
+                    children.append((child, child_path, depth + 1))
+                stack.extend(reversed(children))
+            elif isinstance(value, list):
+                stack.extend((value[index], path + (index,), depth + 1) for index in range(len(value) - 1, -1, -1))
+        return captured, True
+
+
+@dataclass(frozen=True)
+class PolicySet:
+    version: str
+    sections: Mapping[str, Mapping[str, Scanner]]
+
+    def evaluate(
+        self,
+        section: str,
+        env: str,
+        document: Any,
+        *,
+        max_depth: int = POLICY_SCAN_MAX_DEPTH,
+        max_nodes: int = POLICY_SCAN_MAX_NODES,
+    ) -> List[Reason]:
+        scanner = self.sections.get(section, {}).get(env)
+        if scanner is None:
+            return []
+        return scanner.scan(document, max_depth=max_depth, max_nodes=max_nodes)
+
+
+@dataclass(frozen=True)
+class PolicyRegistry:
+    sets: Mapping[str, PolicySet]
+    default_version: str
+    fingerprint: str
+
+    def get(self, version: str | None = None) -> PolicySet | None:
+        return self.sets.get(self.default_version if version is None else version)
+
+    @property
+    def version(self) -> str:
+        return f"{self.default_version}@{self.fingerprint}"
+
+
+def format_path(path: tuple) -> str:
+    text = ""
+    for part in path:
+        if isinstance(part, int):
+            text += f"[{part}]"
+        else:
+            text += f".{part}" if text else str(part)
+    return text
+
+
+def policy_files(path: Path) -> list[Path]:
+    if path.is_dir():
+        return sorted(item for item in path.iterdir() if item.suffix in POLICY_SUFFIXES)
+    return [path]
+
+
+def load_policy_registry(path: Path) -> PolicyRegistry:
+    sets: dict[str, PolicySet] = {}
+    defaults: list[str] = []
+    digest = hashlib.sha256()
+    for file in policy_files(path):
+        raw = file.read_bytes()
+        digest.update(file.name.encode("utf-8") + b"\0" + raw)
+        try:
+            document = load_yaml(raw.decode("utf-8"))
+        except (UnicodeDecodeError, YAMLError) as exc:
+            raise PolicyError(f"{file.name}: failed to parse policy file") from exc
+        policy_set = compile_policy_set(document, source=file.name)
+        if policy_set.version in sets:
+            raise PolicyError(f"{file.name}: duplicate policy version {policy_set.version}")
+        sets[policy_set.version] = policy_set
+        if document.get("default") is True:
+            defaults.append(policy_set.version)
+    if not sets:
+        raise PolicyError(f"no policy sets found at {path}")
+    if len(sets) == 1 and not defaults:
+        defaults = list(sets)
+    if len(defaults) != 1:
+        raise PolicyError("exactly one policy set must be marked default: true")
+    return PolicyRegistry(sets=sets, default_version=defaults[0], fingerprint=digest.hexdigest()[:12])
+
+
+def compile_policy_set(document: Any, *, source: str = "<policy>") -> PolicySet:
+    if not isinstance(document, dict):
+        raise PolicyError(f"{source}: policy set must be an object")
+    version = document.get("version")
+    if not isinstance(version, str) or not version:
+        raise PolicyError(f"{source}: version must be a non-empty string")
+    definitions = document.get("rules") or {}
+    if not isinstance(definitions, dict):
+        raise PolicyError(f"{source}: rules must be an object")
+    rules = {name: _compile_rule(name, spec, source) for name, spec in definitions.items()}
+    sections: dict[str, dict[str, Scanner]] = {}
+    for section in SECTIONS:
+        environments = document.get(section) or {}
+        if not isinstance(environments, dict):
+            raise PolicyError(f"{source}: {section} must map environments to rule lists")
+        compiled: dict[str, Scanner] = {}
+        for env, names in environments.items():
+            if not isinstance(names, list):
+                raise PolicyError(f"{source}: {section}.{env} must be a list of rule names")
+            unknown = [name for name in names if name not in rules]
+            if unknown:
+                raise PolicyError(f"{source}: {section}.{env} references unknown rules: {', '.join(unknown)}")
+            compiled[str(env)] = Scanner.build(tuple(rules[name] for name in names))
+        sections[section] = compiled
+    return PolicySet(version=version, sections=sections)
+
+
+def _compile_rule(name: str, spec: Any, source: str) -> CompiledRule:
+    if not isinstance(spec, dict):
+        raise PolicyError(f"{source}: rule {name} must be an object")
+    code = spec.get("code")
+    message = spec.get("message")
+    if not isinstance(code, str) or not isinstance(message, str):
+        raise PolicyError(f"{source}: rule {name} needs string code and message")
+    factory = _CHECKS.get(spec.get("check"))
+    if factory is None:
+        raise PolicyError(f"{source}: rule {name} has unknown check {spec.get('check')!r}")
+    try:
+        detector = factory(spec)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise PolicyError(f"{source}: rule {name} is invalid: {exc}") from exc
+    return CompiledRule(name=name, code=code, message=message, **detector)
+
+
+def _parse_path(path: str) -> tuple[str, ...]:
+    keys = tuple(part for part in path.split(".") if part)
+    if not keys:
+        raise ValueError("path must not be empty")
+    return keys
+
+
+def _resolve(document: Any, path: tuple[str, ...]) -> Any:
+    value = document
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def _equals(spec: dict) -> dict:
+    expected = spec["value"]
+    expected_type = type(expected)
+
+    def inspect(value: Any, path: str) -> list[str]:
+        return [path] if type(value) is not expected_type or value != expected else []
+
+    return {"path": _parse_path(spec["path"]), "inspect": inspect}
+
+
+def _one_of(spec: dict) -> dict:
+    allowed = tuple(spec["values"])
+
+    def inspect(value: Any, path: str) -> list[str]:
+        return [path] if value not in allowed else []
+
+    return {"path": _parse_path(spec["path"]), "inspect": inspect}
+
+
+def _non_empty_string(spec: dict) -> dict:
+    def inspect(value: Any, path: str) -> list[str]:
+        return [path] if not isinstance(value, str) or not value.strip() else []
+
+    return {"path": _parse_path(spec["path"]), "inspect": inspect}
+
+
+def _no_bind_address(spec: dict) -> dict:
+    address = str(spec["address"])
+    keys = tuple(spec.get("keys", ("bind", "host", "address")))
+
+    def inspect(entries: Any, path: str) -> list[str]:
+        if not isinstance(entries, list):
+            return []
+        exposed = []
+        for index, entry in enumerate(entries):
+            if isinstance(entry, dict):
+                bind = next((entry.get(key) for key in keys if entry.get(key)), None)
+                if isinstance(bind, str) and bind.strip() == address:
+                    exposed.append(f"{path}[{index}]")
+            if isinstance(entry, str) and address in entry:
+                exposed.append(f"{path}[{index}]")
+        return exposed
+
+    return {"path": _parse_path(spec["path"]), "inspect": inspect}
+
+
+def _forbidden_keys(spec: dict) -> dict:
+    keys = frozenset(str(key).lower() for key in spec["keys"])
+    if not keys:
+        raise ValueError("keys must not be empty")
+    return {"keys": keys}
+
+
+_CHECKS: dict[Any, Callable[[dict], dict]] = {
+    "equals": _equals,
+    "one_of": _one_of,
+    "non_empty_string": _non_empty_string,
+    "no_bind_address": _no_bind_address,
+    "forbidden_keys": _forbidden_keys,
+}
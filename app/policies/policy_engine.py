@@ -1,79 +1,67 @@
 from __future__ import annotations
 
+import threading
+import time
+from pathlib import Path
 from typing import Any, List
 
+from app.core.config import POLICY_PATH, POLICY_RELOAD_INTERVAL
+from app.core.metrics import POLICY_RELOADS
 from app.core.models import Reason
+from app.policies.compiler import PolicyError, PolicyRegistry, PolicySet, load_policy_registry, policy_files
+
+
+class PolicyStore:
+    def __init__(self, path: str, reload_interval: float) -> None:
+        self.path = Path(path)
+        self._reload_interval = reload_interval
+        self._registry: PolicyRegistry | None = None
+        self._signature: tuple | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def registry(self) -> PolicyRegistry:
+        registry = self._registry
+        if registry is not None and time.monotonic() - self._checked < self._reload_interval:
+            return registry
+        with self._lock:
+            if self._registry is not None and time.monotonic() - self._checked < self._reload_interval:
+                return self._registry
+            self._checked = time.monotonic()
+            try:
+                signature = self._current_signature()
+                if signature != self._signature:
+                    self._registry = load_policy_registry(self.path)
+                    self._signature = signature
+                    POLICY_RELOADS.labels(result="success").inc()
+            except (PolicyError, OSError):
+                POLICY_RELOADS.labels(result="error").inc()
+                if self._registry is None:
+                    raise
+            return self._registry
+
+    def _current_signature(self) -> tuple:
+        signature = []
+        for file in policy_files(self.path):
+            stat = file.stat()
+            signature.append((file.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+
+_store = PolicyStore(POLICY_PATH, POLICY_RELOAD_INTERVAL)
+
+
+def current_policy_registry() -> PolicyRegistry:
+    return _store.registry()
+
+
+def get_policy_set(version: str | None = None) -> PolicySet | None:
+    return _store.registry().get(version)
+
+
+def current_policy_version() -> str:
+    return _store.registry().version
 
 
 def evaluate_migration_policies(env: str, config: dict[str, Any]) -> List[Reason]:
-    reasons: List[Reason] = []
-    if env == "prod":
-        tls = config.get("tls", {})
-        if tls.get("enabled") is not True:
-            reasons.append(
-                Reason(
-                    code="TLS_DISABLED_PROD",
-                    message="TLS must be enabled for production migrations",
-                )
-            )
-        if _public_ports_exposed(config.get("ports", [])):
-            reasons.append(
-                Reason(
-                    code="PUBLIC_PORT_EXPOSED",
-                    message="Public ports (0.0.0.0) are not allowed in prod",
-                )
-            )
-    secrets_ref = config.get("secrets_ref")
-    if not isinstance(secrets_ref, str) or not secrets_ref.strip():
-        reasons.append(
-            Reason(
-                code="SECRETS_REF_MISSING",
-                message="secrets_ref must be a non-empty string",
-            )
-        )
-    if _contains_inline_secrets(config):
-        reasons.append(
-            Reason(
-                code="SECRETS_INLINE",
-                message="Inline secrets are not allowed; use secrets_ref",
-            )
-        )
-    return reasons
-
-
-def _public_ports_exposed(ports: Any) -> bool:
-    if not isinstance(ports, list):
-        return False
-    for entry in ports:
-        if isinstance(entry, dict):
-            bind = entry.get("bind") or entry.get("host") or entry.get("address")
-            if isinstance(bind, str) and bind.strip() == "0.0.0.0":
-                return True
-        if isinstance(entry, str) and "0.0.0.0" in entry:
-            return True
-    return False
-
-
-def _contains_inline_secrets(payload: Any) -> bool:
-    secret_keys = {
-        "secret",
-        "secrets",
-        "password",
-        "token",
-        "api_key",
-        "apikey",
-        "access_key",
-        "private_key",
-    }
-    if isinstance(payload, dict):
-        for key, value in payload.items():
-            if isinstance(key, str) and key.lower() in secret_keys:
-                if isinstance(value, str) and value.strip():
-                    return True
-            if _contains_inline_secrets(value):
-                return True
-    elif isinstance(payload, list):
-        for item in payload:
-            if _contains_inline_secrets(item):
-                return True
-    return False
+    return _store.registry().get().evaluate("migration", env, config)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.config import DECISION_CACHE_ENABLED, DECISION_CACHE_MAX_ENTRIES
+from app.core.metrics import DECISION_CACHE_ENTRIES, DECISION_CACHE_EVICTIONS, DECISION_CACHE_LOOKUPS
+from app.core.models import ValidationOutcome
+
+
+@dataclass(frozen=True)
+class DecisionKey:
+    manifest_sha256: str
+    config_sha256: str
+    policy_version: str
+
+
+@dataclass(frozen=True)
+class CachedDecision:
+    outcome: ValidationOutcome
+    log_type: str | None
+
+
+class DecisionCache:
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[DecisionKey, CachedDecision] = OrderedDict()
+        self._policy_version: str | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: DecisionKey) -> CachedDecision | None:
+        with self._lock:
+            self._check_policy_version(key.policy_version)
+            cached = self._entries.get(key)
+            if cached is None:
+                DECISION_CACHE_LOOKUPS.labels(result="miss").inc()
+                return None
+            self._entries.move_to_end(key)
+            DECISION_CACHE_LOOKUPS.labels(result="hit").inc()
+        return CachedDecision(outcome=copy.deepcopy(cached.outcome), log_type=cached.log_type)
+
+    def put(self, key: DecisionKey, decision: CachedDecision) -> None:
+        stored = CachedDecision(outcome=copy.deepcopy(decision.outcome), log_type=decision.log_type)
+        with self._lock:
+            self._check_policy_version(key.policy_version)
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                DECISION_CACHE_EVICTIONS.inc()
+            DECISION_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            DECISION_CACHE_ENTRIES.set(0)
+
+    def _check_policy_version(self, policy_version: str) -> None:
+        if policy_version == self._policy_version:
+            return
+        if self._entries:
+            DECISION_CACHE_EVICTIONS.inc(len(self._entries))
+            self._entries.clear()
+            DECISION_CACHE_ENTRIES.set(0)
+        self._policy_version = policy_version
+
+
+_lock = threading.Lock()
+_cache: DecisionCache | None = None
+
+
+def get_decision_cache() -> DecisionCache | None:
+    global _cache
+    if not DECISION_CACHE_ENABLED or DECISION_CACHE_MAX_ENTRIES <= 0:
+        return None
+    if _cache is not None:
+        return _cache
+    with _lock:
+        if _cache is None:
+            _cache = DecisionCache(DECISION_CACHE_MAX_ENTRIES)
+        return _cache
+
+
+def clear_decision_cache() -> None:
+    cache = _cache
+    if cache is not None:
+        cache.clear()
@@ -3,78 +3,97 @@ from __future__ import annotations
 import json
 from typing import Any
 
-import yaml
 from pydantic import ValidationError
 
 from app.core.exceptions import MalformedInputError
 from app.core.logging import log_event
 from app.core.models import Artifacts, MigrationManifest, Reason, ValidationOutcome
+from app.core.stages import stage
+from app.core.yaml_loader import YAMLError, load_yaml
 from app.integrity.hashing import hash_bytes, hashes_match
-from app.policies.policy_engine import evaluate_migration_policies
+from app.policies.compiler import PolicySet
+from app.policies.policy_engine import current_policy_registry
+from app.validators.decision_cache import CachedDecision, DecisionKey, get_decision_cache
 
 
 def validate_migration(manifest_bytes: bytes, config_bytes: bytes) -> ValidationOutcome:
-    manifest = _parse_manifest(manifest_bytes)
-    config = _parse_config(config_bytes)
+    registry = current_policy_registry()
+    cache = get_decision_cache()
+    with stage("hash"):
+        config_sha256 = hash_bytes(config_bytes, kind="config")
+        key = None
+        if cache is not None:
+            key = DecisionKey(
+                manifest_sha256=hash_bytes(manifest_bytes),
+                config_sha256=config_sha256,
+                policy_version=registry.version,
+            )
+    decision = None if key is None else cache.get(key)
+    if decision is None:
+        decision = _evaluate(manifest_bytes, config_bytes, config_sha256, registry.get())
+        if key is not None:
+            cache.put(key, decision)
+    if decision.log_type is not None:
+        log_event(
+            decision=decision.outcome.decision,
+            reason_codes=[reason.code for reason in decision.outcome.reasons],
+            artifact_refs=None,
+            log_type=decision.log_type,
+            level="WARN",
+        )
+    return decision.outcome
+
+
+def _evaluate(
+    manifest_bytes: bytes,
+    config_bytes: bytes,
+    computed_hash: str,
+    policy_set: PolicySet,
+) -> CachedDecision:
+    with stage("parse"):
+        manifest = _parse_manifest(manifest_bytes)
+        config = _parse_config(config_bytes)
 
-    computed_hash = hash_bytes(config_bytes)
     artifacts = Artifacts()
     artifacts.computed_hashes.config = computed_hash
 
     if not hashes_match(manifest.config_sha256, computed_hash):
-        log_event(
-            decision="BLOCK",
-            reason_codes=["CONFIG_HASH_MISMATCH"],
-            artifact_refs=None,
-            log_type="integrity",
-            level="WARN",
-        )
-        return ValidationOutcome(
-            decision="BLOCK",
-            reasons=[
+        return _block(
+            [
                 Reason(
                     code="CONFIG_HASH_MISMATCH",
                     message="Computed config hash does not match manifest",
                 )
             ],
-            artifacts=artifacts,
+            artifacts,
+            log_type="integrity",
         )
 
     if manifest.env not in {"prod", "staging"}:
-        log_event(
-            decision="BLOCK",
-            reason_codes=["UNKNOWN_ENV"],
-            artifact_refs=None,
-            log_type="policy",
-            level="WARN",
-        )
-        return ValidationOutcome(
-            decision="BLOCK",
-            reasons=[
+        return _block(
+            [
                 Reason(
                     code="UNKNOWN_ENV",
                     message="Environment must be prod or staging",
                 )
             ],
-            artifacts=artifacts,
+            artifacts,
+            log_type="policy",
         )
 
-    policy_reasons = evaluate_migration_policies(manifest.env, config)
+    with stage("policy"):
+        policy_reasons = policy_set.evaluate("migration", manifest.env, config)
     if policy_reasons:
-        log_event(
-            decision="BLOCK",
-            reason_codes=[reason.code for reason in policy_reasons],
-            artifact_refs=None,
-            log_type="policy",
-            level="WARN",
-        )
-        return ValidationOutcome(
-            decision="BLOCK",
-            reasons=policy_reasons,
-            artifacts=artifacts,
-        )
+        return _block(policy_reasons, artifacts, log_type="policy")
+
+    return CachedDecision(outcome=ValidationOutcome(decision="ALLOW", reasons=[], artifacts=artifacts), log_type=None)
+
 
-    return ValidationOutcome(decision="ALLOW", reasons=[], artifacts=artifacts)
+def _block(reasons: list[Reason], artifacts: Artifacts, *, log_type: str) -> CachedDecision:
+    return CachedDecision(
+        outcome=ValidationOutcome(decision="BLOCK", reasons=reasons, artifacts=artifacts),
+        log_type=log_type,
+    )
 
 
 def _parse_manifest(raw: bytes) -> MigrationManifest:
@@ -90,8 +109,8 @@ def _parse_manifest(raw: bytes) -> MigrationManifest:
 
 def _parse_config(raw: bytes) -> dict[str, Any]:
     try:
-        parsed = yaml.safe_load(raw.decode("utf-8"))
-    except (UnicodeDecodeError, yaml.YAMLError) as exc:
+        parsed = load_yaml(raw.decode("utf-8"))
+    except (UnicodeDecodeError, YAMLError) as exc:
         raise MalformedInputError("Failed to parse app_config YAML", "PARSE_ERROR") from exc
     if not isinstance(parsed, dict):
         raise MalformedInputError("app_config must be a YAML object", "SCHEMA_INVALID")
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-import yaml
+from typing import BinaryIO, Mapping
+
 from pydantic import ValidationError
 
 from app.core.exceptions import MalformedInputError
 from app.core.logging import log_event
 from app.core.models import Artifacts, Reason, ReplicationManifest, ValidationOutcome
-from app.integrity.hashing import hash_bytes, hashes_match
+from app.core.stages import stage
+from app.core.yaml_loader import YAMLError, load_yaml
+from app.integrity.hashing import hash_bytes, hash_file, hashes_match
+from app.integrity.segments import verify_segments
 
 
-def validate_replication(manifest_bytes: bytes, snapshot_bytes: bytes) -> ValidationOutcome:
-    manifest = _parse_manifest(manifest_bytes)
+def validate_replication(
+    manifest_bytes: bytes,
+    snapshot: bytes | BinaryIO,
+    wal_segments: Mapping[str, BinaryIO] | None = None,
+) -> ValidationOutcome:
+    with stage("parse"):
+        manifest = _parse_manifest(manifest_bytes)
 
-    computed_hash = hash_bytes(snapshot_bytes)
+    with stage("hash"):
+        if isinstance(snapshot, bytes):
+            computed_hash = hash_bytes(snapshot, kind="snapshot")
+        else:
+            computed_hash = hash_file(snapshot, kind="snapshot").sha256
     artifacts = Artifacts()
     artifacts.computed_hashes.snapshot = computed_hash
 
@@ -35,6 +48,45 @@ def validate_replication(manifest_bytes: bytes, snapshot_bytes: bytes) -> Valida
             artifacts=artifacts,
         )
 
+    if manifest.wal_segments or wal_segments:
+        with stage("hash"):
+            report = verify_segments(
+                wal_segments or {},
+                {segment.name: segment.sha256 for segment in manifest.wal_segments},
+            )
+        artifacts.computed_hashes.wal_segments = dict(sorted(report.computed.items()))
+        if not report.ok:
+            reasons = []
+            if report.missing:
+                reasons.append(
+                    Reason(
+                        code="WAL_SEGMENT_MISSING",
+                        message="WAL segments listed in manifest were not uploaded: " + ", ".join(report.missing),
+                    )
+                )
+            if report.unexpected:
+                reasons.append(
+                    Reason(
+                        code="WAL_SEGMENT_UNEXPECTED",
+                        message="WAL segments not listed in manifest: " + ", ".join(report.unexpected),
+                    )
+                )
+            if report.mismatched:
+                reasons.append(
+                    Reason(
+                        code="WAL_HASH_MISMATCH",
+                        message="WAL integrity verification failed: " + ", ".join(report.mismatched),
+                    )
+                )
+            log_event(
+                decision="BLOCK",
+                reason_codes=[reason.code for reason in reasons],
+                artifact_refs=None,
+                log_type="integrity",
+                level="WARN",
+            )
+            return ValidationOutcome(decision="BLOCK", reasons=reasons, artifacts=artifacts)
+
     if manifest.sync_mode not in {"sync", "async"}:
         log_event(
             decision="BLOCK",
@@ -59,8 +111,8 @@ def validate_replication(manifest_bytes: bytes, snapshot_bytes: bytes) -> Valida
 
 def _parse_manifest(raw: bytes) -> ReplicationManifest:
     try:
-        parsed = yaml.safe_load(raw.decode("utf-8"))
-    except (UnicodeDecodeError, yaml.YAMLError) as exc:
+        parsed = load_yaml(raw.decode("utf-8"))
+    except (UnicodeDecodeError, YAMLError) as exc:
         raise MalformedInputError("Failed to parse replication_manifest YAML", "PARSE_ERROR") from exc
     if not isinstance(parsed, dict):
         raise MalformedInputError("replication_manifest must be a YAML object", "SCHEMA_INVALID")
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-import yaml
+import threading
+from concurrent.futures import Future, wait
+from typing import Callable
+
 from pydantic import ValidationError
 
 from app.core.exceptions import MalformedInputError
+from app.core.executor import submit_artifact_task
 from app.core.logging import log_event
 from app.core.models import Artifacts, Reason, ReplicationReferenceManifest, ValidationOutcome
-from app.integrity.artifacts import fetch_s3_object, parse_s3_uri
-from app.integrity.hashing import hash_bytes, hashes_match
+from app.core.stages import stage
+from app.core.yaml_loader import YAMLError, load_yaml
+from app.integrity.artifacts import hash_s3_object, parse_s3_uri
+from app.integrity.hashing import StreamDigest, hashes_match
+from app.policies.policy_engine import get_policy_set
 
 
-def validate_replication_reference(manifest_bytes: bytes) -> ValidationOutcome:
-    manifest = _parse_manifest(manifest_bytes)
+def validate_replication_reference(
+    manifest: ReplicationReferenceManifest | bytes,
+    hash_artifact: Callable[..., StreamDigest] = hash_s3_object,
+) -> ValidationOutcome:
+    if isinstance(manifest, bytes):
+        manifest = parse_reference_manifest(manifest)
     artifacts = Artifacts()
 
     if manifest.env not in {"prod", "staging"}:
@@ -58,61 +69,52 @@ def validate_replication_reference(manifest_bytes: bytes) -> ValidationOutcome:
             artifacts=artifacts,
         )
 
-    try:
-        snapshot_bytes = fetch_s3_object(manifest.snapshot.uri)
-    except Exception:
+    policy_set = get_policy_set(manifest.policy_version)
+    if policy_set is None:
         log_event(
             decision="BLOCK",
-            reason_codes=["ARTIFACT_FETCH_FAILED"],
+            reason_codes=["POLICY_VERSION_UNKNOWN"],
             artifact_refs=None,
-            log_type="integrity",
+            log_type="policy",
             level="WARN",
         )
         return ValidationOutcome(
             decision="BLOCK",
-            reasons=[Reason(code="ARTIFACT_FETCH_FAILED", message="Failed to fetch snapshot")],
+            reasons=[
+                Reason(
+                    code="POLICY_VERSION_UNKNOWN",
+                    message=f"No policy set for policy_version {manifest.policy_version}",
+                )
+            ],
             artifacts=artifacts,
         )
 
-    snapshot_hash = hash_bytes(snapshot_bytes)
-    artifacts.computed_hashes.snapshot = snapshot_hash
-    if not hashes_match(manifest.snapshot.sha256, snapshot_hash):
+    with stage("policy"):
+        policy_reasons = policy_set.evaluate("replication", manifest.env, _as_document(manifest))
+    if policy_reasons:
         log_event(
             decision="BLOCK",
-            reason_codes=["SNAPSHOT_HASH_MISMATCH"],
+            reason_codes=[reason.code for reason in policy_reasons],
             artifact_refs=None,
-            log_type="integrity",
+            log_type="policy",
             level="WARN",
         )
-        return ValidationOutcome(
-            decision="BLOCK",
-            reasons=[
-                Reason(
-                    code="SNAPSHOT_HASH_MISMATCH",
-                    message="Snapshot integrity verification failed",
-                )
-            ],
-            artifacts=artifacts,
-        )
+        return ValidationOutcome(decision="BLOCK", reasons=policy_reasons, artifacts=artifacts)
 
+    wal_uri_error: str | None = None
     if manifest.wal is not None:
         try:
             parse_s3_uri(manifest.wal.uri)
         except ValueError as exc:
-            log_event(
-                decision="BLOCK",
-                reason_codes=["INVALID_MANIFEST"],
-                artifact_refs=None,
-                log_type="policy",
-                level="WARN",
-            )
-            return ValidationOutcome(
-                decision="BLOCK",
-                reasons=[Reason(code="INVALID_MANIFEST", message=str(exc))],
-                artifacts=artifacts,
-            )
+            wal_uri_error = str(exc)
+
+    wal_cancel = threading.Event()
+    wal_future: Future[StreamDigest] | None = None
+    if manifest.wal is not None and wal_uri_error is None:
+        wal_future = submit_artifact_task(hash_artifact, manifest.wal.uri, cancel=wal_cancel, kind="wal")
+    try:
         try:
-            wal_bytes = fetch_s3_object(manifest.wal.uri)
+            snapshot_digest = hash_artifact(manifest.snapshot.uri, kind="snapshot")
         except Exception:
             log_event(
                 decision="BLOCK",
@@ -123,36 +125,115 @@ def validate_replication_reference(manifest_bytes: bytes) -> ValidationOutcome:
             )
             return ValidationOutcome(
                 decision="BLOCK",
-                reasons=[Reason(code="ARTIFACT_FETCH_FAILED", message="Failed to fetch WAL")],
+                reasons=[Reason(code="ARTIFACT_FETCH_FAILED", message="Failed to fetch snapshot")],
                 artifacts=artifacts,
             )
-        wal_hash = hash_bytes(wal_bytes)
-        if not hashes_match(manifest.wal.sha256, wal_hash):
+
+        snapshot_hash = snapshot_digest.sha256
+        artifacts.computed_hashes.snapshot = snapshot_hash
+        if not hashes_match(manifest.snapshot.sha256, snapshot_hash):
             log_event(
                 decision="BLOCK",
-                reason_codes=["WAL_HASH_MISMATCH"],
+                reason_codes=["SNAPSHOT_HASH_MISMATCH"],
                 artifact_refs=None,
                 log_type="integrity",
                 level="WARN",
             )
             return ValidationOutcome(
                 decision="BLOCK",
-                reasons=[Reason(code="WAL_HASH_MISMATCH", message="WAL integrity verification failed")],
+                reasons=[
+                    Reason(
+                        code="SNAPSHOT_HASH_MISMATCH",
+                        message="Snapshot integrity verification failed",
+                    )
+                ],
                 artifacts=artifacts,
             )
 
+        if manifest.wal is not None:
+            if wal_uri_error is not None:
+                log_event(
+                    decision="BLOCK",
+                    reason_codes=["INVALID_MANIFEST"],
+                    artifact_refs=None,
+                    log_type="policy",
+                    level="WARN",
+                )
+                return ValidationOutcome(
+                    decision="BLOCK",
+                    reasons=[Reason(code="INVALID_MANIFEST", message=wal_uri_error)],
+                    artifacts=artifacts,
+                )
+            try:
+                wal_digest = wal_future.result()
+            except Exception:
+                log_event(
+                    decision="BLOCK",
+                    reason_codes=["ARTIFACT_FETCH_FAILED"],
+                    artifact_refs=None,
+                    log_type="integrity",
+                    level="WARN",
+                )
+                return ValidationOutcome(
+                    decision="BLOCK",
+                    reasons=[Reason(code="ARTIFACT_FETCH_FAILED", message="Failed to fetch WAL")],
+                    artifacts=artifacts,
+                )
+            wal_hash = wal_digest.sha256
+            if not hashes_match(manifest.wal.sha256, wal_hash):
+                log_event(
+                    decision="BLOCK",
+                    reason_codes=["WAL_HASH_MISMATCH"],
+                    artifact_refs=None,
+                    log_type="integrity",
+                    level="WARN",
+                )
+                return ValidationOutcome(
+                    decision="BLOCK",
+                    reasons=[Reason(code="WAL_HASH_MISMATCH", message="WAL integrity verification failed")],
+                    artifacts=artifacts,
+                )
+    finally:
+        _settle(wal_future, wal_cancel)
+
     return ValidationOutcome(decision="ALLOW", reasons=[], artifacts=artifacts)
 
 
-def _parse_manifest(raw: bytes) -> ReplicationReferenceManifest:
+def _settle(future: Future[StreamDigest] | None, cancel: threading.Event) -> None:
+    if future is None or future.done():
+        return
+    cancel.set()
+    if not future.cancel():
+        wait([future])
+
+
+def _as_document(manifest: ReplicationReferenceManifest) -> dict:
+    if hasattr(manifest, "model_dump"):
+        return manifest.model_dump()
+    return manifest.dict()
+
+
+def reference_artifact_refs(manifest: ReplicationReferenceManifest) -> list[str]:
+    refs = [manifest.snapshot.uri]
+    if manifest.wal is not None:
+        refs.append(manifest.wal.uri)
+    return refs
+
+
+def parse_reference_manifest(raw: bytes) -> ReplicationReferenceManifest:
+    with stage("parse"):
+        return _parse_reference_manifest(raw)
+
+
+def _parse_reference_manifest(raw: bytes) -> ReplicationReferenceManifest:
     try:
-        parsed = yaml.safe_load(raw.decode("utf-8"))
-    except (UnicodeDecodeError, yaml.YAMLError) as exc:
+        parsed = load_yaml(raw.decode("utf-8"))
+    except (UnicodeDecodeError, YAMLError) as exc:
         raise MalformedInputError("Failed to parse replication manifest", "INVALID_MANIFEST") from exc
     if isinstance(parsed, str) and ":" in parsed:
         try:
-            parsed = yaml.safe_load(parsed)
-        except yaml.YAMLError:
+            parsed = load_yaml(parsed)
+        except YAMLError:
             pass
     if not isinstance(parsed, dict):
         raise MalformedInputError("replication manifest must be an object", "INVALID_MANIFEST")
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+
+@dataclass(frozen=True)
+class Response:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+@dataclass(frozen=True)
+class Request:
+    method: str
+    path: str
+    body: bytes = b""
+    headers: tuple[tuple[str, str], ...] = ()
+    query: str = ""
+
+
+class AsgiClient:
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+
+    async def send(self, request: Request) -> Response:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": "http",
+            "path": request.path,
+            "raw_path": request.path.encode(),
+            "query_string": request.query.encode(),
+            "headers": [(name.lower().encode(), value.encode()) for name, value in request.headers],
+            "client": ("127.0.0.1", 50000),
+            "server": ("benchmark", 80),
+            "root_path": "",
+        }
+        delivered = False
+        status = 0
+        headers: dict[str, str] = {}
+        body = bytearray()
+
+        async def receive() -> dict[str, Any]:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": request.body, "more_body": False}
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers.update((name.decode(), value.decode()) for name, value in message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return Response(status=status, headers=headers, body=bytes(body))
+
+    async def run(self, requests: Iterable[Request], concurrency: int) -> tuple[list[float], float]:
+        pending = list(requests)
+        latencies: list[float] = []
+        position = 0
+
+        async def worker() -> None:
+            nonlocal position
+            while position < len(pending):
+                request = pending[position]
+                position += 1
+                start = time.perf_counter()
+                response = await self.send(request)
+                latencies.append(time.perf_counter() - start)
+                if response.status >= 400:
+                    raise RuntimeError(f"{request.path} returned {response.status}: {response.body[:200]!r}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, time.perf_counter() - start
+
+
+def multipart(files: Iterable[tuple[str, str, bytes]]) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for field, filename, data in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n".encode()
+            + data
+            + b"\r\n"
+        )
+    return b"".join(parts) + f"--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    group: str
+    samples: int
+    median: float
+    p99: float
+    minimum: float
+    total: float
+    work: float
+    work_unit: str
+
+    @property
+    def rate(self) -> float:
+        return self.work / self.total if self.total > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "rate": self.rate}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(
+    name: str,
+    group: str,
+    timings: list[float],
+    *,
+    work: float,
+    work_unit: str,
+    total: float | None = None,
+) -> Result:
+    return Result(
+        name=name,
+        group=group,
+        samples=len(timings),
+        median=statistics.median(timings),
+        p99=percentile(timings, 0.99),
+        minimum=min(timings),
+        total=sum(timings) if total is None else total,
+        work=work,
+        work_unit=work_unit,
+    )
+
+
+def measure(
+    name: str,
+    group: str,
+    func: Callable[[], Any],
+    *,
+    repeat: int,
+    work: float = 1,
+    work_unit: str = "ops",
+    warmup: int = 1,
+    setup: Callable[[], Any] | None = None,
+) -> Result:
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func()
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(name, group, timings, work=work * repeat, work_unit=work_unit)
+
+
+@contextlib.contextmanager
+def quiet_stdout() -> Iterator[None]:
+    with open(os.devnull, "w", encoding="utf-8") as sink, contextlib.redirect_stdout(sink):
+        yield
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: str, results: list[Result], meta: dict[str, Any]) -> None:
+    payload = {"meta": meta, "results": [result.as_dict() for result in results]}
+    Path(path).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: str) -> dict[str, dict[str, Any]]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {entry["name"]: entry for entry in payload["results"]}
+
+
+def compare(results: list[Result], baseline: dict[str, dict[str, Any]], max_regression: float) -> list[str]:
+    regressions = []
+    print(f"\n{'benchmark':<56} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None or previous["median"] <= 0:
+            continue
+        change = result.median / previous["median"] - 1
+        flag = " !" if change > max_regression else ""
+        print(
+            f"{result.name:<56} {format_seconds(previous['median']):>12} "
+            f"{format_seconds(result.median):>12} {change:>+7.1%}{flag}"
+        )
+        if flag:
+            regressions.append(result.name)
+    return regressions
+
+
+def print_results(results: list[Result]) -> None:
+    print(f"{'benchmark':<56} {'median':>12} {'p99':>12} {'rate':>18}")
+    for result in results:
+        print(
+            f"{result.name:<56} {format_seconds(result.median):>12} {format_seconds(result.p99):>12} "
+            f"{format_rate(result.rate, result.work_unit):>18}"
+        )
+
+
+def format_seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.2f}s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f}ms"
+    return f"{value * 1e6:.1f}us"
+
+
+def format_rate(rate: float, unit: str) -> str:
+    if unit == "bytes":
+        return f"{rate / (1024 * 1024):.1f} MiB/s"
+    return f"{rate:,.0f} {unit}/s"
+
+
+def format_size(size: int) -> str:
+    for unit, scale in (("GiB", 1024**3), ("MiB", 1024**2), ("KiB", 1024)):
+        if size >= scale:
+            return f"{size / scale:.4g}{unit}"
+    return f"{size}B"
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import environment, format_seconds, format_size, percentile  # noqa: E402
+from benchmarks.objects import SyntheticObject, reference_manifest  # noqa: E402
+from benchmarks.s3_server import S3StandIn, parse_size, synthetic_key  # noqa: E402
+
+BUCKET = "mig-artifacts"
+API_TOKEN = os.getenv("API_TOKEN", "dev-token")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gate(port: int, s3_endpoint: str, workdir: Path, verify_cache: bool) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "API_TOKEN": API_TOKEN,
+        "MINIO_ENDPOINT": s3_endpoint,
+        "MINIO_BUCKET": BUCKET,
+        "AUDIT_LOG_PATH": str(workdir / "audit.log"),
+        "VERIFY_CACHE_ENABLED": "true" if verify_cache else "false",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+
+def wait_ready(gate: subprocess.Popen, url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if gate.poll() is not None:
+            raise RuntimeError(f"gate exited during startup:\n{gate.stderr.read().decode(errors='replace')}")
+        try:
+            if requests.get(f"{url}/readyz", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("gate did not become ready")
+
+
+def stop_gate(gate: subprocess.Popen) -> int:
+    gate.terminate()
+    try:
+        gate.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        gate.kill()
+        gate.wait()
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def drive(url: str, manifests: list[bytes], total: int, concurrency: int) -> tuple[list[float], list[str], float]:
+    local = threading.local()
+    latencies: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker() -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        headers = {"Authorization": f"Bearer {API_TOKEN}", "Content-Type": "application/yaml"}
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            try:
+                response = session.post(
+                    f"{url}/api/v1/validate/replication/ref",
+                    data=manifests[index % len(manifests)],
+                    headers=headers,
+                    timeout=300,
+                )
+                failure = None if response.status_code == 200 and response.json()["decision"] == "ALLOW" else (
+                    f"{response.status_code}: {response.text[:200]}"
+                )
+            except requests.RequestException as exc:
+                failure = str(exc)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if failure is not None:
+                    errors.append(failure)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return latencies, errors, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test reference-mode validation against a local S3 stand-in")
+    parser.add_argument("--object-size", default="64MiB")
+    parser.add_argument("--objects", type=int, default=1, help="distinct snapshots to rotate through")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-mibps", type=float, default=0.0, help="per-response MiB/s, 0 for unlimited")
+    parser.add_argument("--verify-cache", action="store_true", help="leave the gate's verification cache on")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    size = parse_size(args.object_size)
+    s3 = S3StandIn(latency=args.latency_ms / 1000, bandwidth=args.bandwidth_mibps * 1024 * 1024).start()
+    manifests = []
+    for seed in range(args.objects):
+        key = synthetic_key(size, seed)
+        obj = SyntheticObject(size, seed=seed)
+        s3.catalog.put(BUCKET, key, obj)
+        manifests.append(reference_manifest(f"s3://{BUCKET}/{key}", obj.sha256))
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory(prefix="security-gate-load-") as workdir:
+        gate = start_gate(port, s3.endpoint, Path(workdir), args.verify_cache)
+        try:
+            wait_ready(gate, url)
+            if args.warmup:
+                drive(url, manifests, args.warmup, min(args.warmup, args.concurrency))
+            latencies, errors, wall = drive(url, manifests, args.requests, args.concurrency)
+        finally:
+            peak_rss = stop_gate(gate)
+            s3.stop()
+
+    report = {
+        "meta": environment(),
+        "object_size": size,
+        "objects": args.objects,
+        "concurrency": args.concurrency,
+        "s3": {"latency_ms": args.latency_ms, "bandwidth_mibps": args.bandwidth_mibps},
+        "verify_cache": args.verify_cache,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "latency": {
+            "p50": percentile(latencies, 0.50),
+            "p99": percentile(latencies, 0.99),
+            "mean": statistics.fmean(latencies),
+            "max": max(latencies),
+        },
+        "throughput": {
+            "requests_per_s": len(latencies) / wall,
+            "mib_per_s": len(latencies) * size / wall / (1024 * 1024),
+        },
+        "gate_peak_rss_bytes": peak_rss,
+    }
+    print(
+        f"{report['requests']} requests, {format_size(size)} objects, concurrency {args.concurrency}\n"
+        f"  latency     p50 {format_seconds(report['latency']['p50'])}  p99 {format_seconds(report['latency']['p99'])}"
+        f"  max {format_seconds(report['latency']['max'])}\n"
+        f"  throughput  {report['throughput']['requests_per_s']:.1f} req/s  "
+        f"{report['throughput']['mib_per_s']:.1f} MiB/s\n"
+        f"  gate RSS    peak {format_size(peak_rss)}\n"
+        f"  errors      {len(errors)}"
+    )
+    if errors:
+        print(f"  first error {errors[0]}", file=sys.stderr)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Iterator
+
+BLOCK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SyntheticObject:
+    size: int
+    seed: int = 0
+    _block: bytes = field(init=False, repr=False)
+    _sha256: str | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._block = random.Random(self.seed).randbytes(min(self.size, BLOCK_SIZE))
+
+    @property
+    def etag(self) -> str:
+        return hashlib.md5(f"{self.seed}:{self.size}".encode()).hexdigest()
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            hasher = hashlib.sha256()
+            for chunk in self.chunks(BLOCK_SIZE):
+                hasher.update(chunk)
+            self._sha256 = hasher.hexdigest()
+        return self._sha256
+
+    def chunks(self, chunk_size: int, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        end = self.size if end is None else min(end, self.size)
+        position = start
+        view = memoryview(self._block)
+        while position < end:
+            offset = position % len(self._block)
+            length = min(chunk_size, end - position, len(self._block) - offset)
+            yield view[offset : offset + length].tobytes()
+            position += length
+
+    def read(self) -> bytes:
+        return b"".join(self.chunks(BLOCK_SIZE))
+
+
+class _Response:
+    def __init__(self, obj: SyntheticObject, latency: float) -> None:
+        self._obj = obj
+        self._latency = latency
+
+    def stream(self, amt: int) -> Iterator[bytes]:
+        if self._latency:
+            time.sleep(self._latency)
+        return self._obj.chunks(amt)
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+class MemoryObjectStore:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.objects: dict[tuple[str, str], SyntheticObject] = {}
+
+    def put(self, bucket: str, key: str, obj: SyntheticObject) -> str:
+        self.objects[(bucket, key)] = obj
+        return f"s3://{bucket}/{key}"
+
+    def stat_object(self, bucket: str, key: str) -> SimpleNamespace:
+        obj = self.objects[(bucket, key)]
+        return SimpleNamespace(etag=obj.etag, version_id=None, size=obj.size)
+
+    def get_object(
+        self,
+        bucket: str,
+        key: str,
+        request_headers: dict[str, str] | None = None,
+        version_id: str | None = None,
+    ) -> _Response:
+        return _Response(self.objects[(bucket, key)], self.latency)
+
+
+def reference_manifest(uri: str, sha256: str) -> bytes:
+    return (
+        'app_id: "billing"\n'
+        'env: "prod"\n'
+        f'snapshot:\n  uri: "{uri}"\n  sha256: "{sha256}"\n'
+        'sync_mode: "sync"\n'
+        'policy_version: "2026.01"\n'
+    ).encode()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.objects import SyntheticObject  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+SYNTHETIC_KEY = re.compile(r"^synthetic/(?P<size>[\d.]+[a-z]*)(?:-(?P<seed>\d+))?(?:\.[\w.]+)?$", re.I)
+LOCATION = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<LocationConstraint xmlns="http://s3.amazonaws.com/doc/2006-03-01/"></LocationConstraint>'
+)
+
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([kmg]?)(?:i?b)?", text.strip().lower())
+    if match is None:
+        raise ValueError(f"invalid size: {text}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def synthetic_key(size: int, seed: int | None = None) -> str:
+    return f"synthetic/{size}" if seed is None else f"synthetic/{size}-{seed}"
+
+
+class ObjectCatalog:
+    def __init__(self) -> None:
+        self._objects: dict[tuple[str, str], SyntheticObject] = {}
+        self._lock = threading.Lock()
+
+    def put(self, bucket: str, key: str, obj: SyntheticObject) -> None:
+        with self._lock:
+            self._objects[(bucket, key)] = obj
+
+    def get(self, bucket: str, key: str) -> SyntheticObject | None:
+        with self._lock:
+            obj = self._objects.get((bucket, key))
+            if obj is not None:
+                return obj
+            match = SYNTHETIC_KEY.match(key)
+            if match is None:
+                return None
+            try:
+                size = parse_size(match.group("size"))
+            except ValueError:
+                return None
+            seed = int(match.group("seed")) if match.group("seed") else size
+            obj = self._objects[(bucket, key)] = SyntheticObject(size, seed=seed)
+            return obj
+
+
+class S3Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "S3StandIn"
+
+    def do_HEAD(self) -> None:
+        self._serve(body=False)
+
+    def do_GET(self) -> None:
+        self._serve(body=True)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _serve(self, *, body: bool) -> None:
+        url = urlsplit(self.path)
+        bucket, _, key = unquote(url.path).lstrip("/").partition("/")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if not key and "location" in url.query:
+            self._reply(200, LOCATION.encode(), "application/xml", body=body)
+            return
+        obj = self.server.catalog.get(bucket, key)
+        if obj is None:
+            self._error(404, "NoSuchKey", key, body=body)
+            return
+        expected = self.headers.get("If-Match")
+        if expected and expected.strip('"') != obj.etag:
+            self._error(412, "PreconditionFailed", key, body=body)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(obj.size))
+        self.send_header("ETag", f'"{obj.etag}"')
+        self.send_header("Last-Modified", formatdate(0, usegmt=True))
+        self.end_headers()
+        if body:
+            self._stream(obj)
+
+    def _stream(self, obj: SyntheticObject) -> None:
+        bandwidth = self.server.bandwidth
+        start = time.perf_counter()
+        sent = 0
+        for chunk in obj.chunks(CHUNK_SIZE):
+            self.wfile.write(chunk)
+            sent += len(chunk)
+            if bandwidth:
+                delay = sent / bandwidth - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+    def _error(self, status: int, code: str, key: str, *, body: bool) -> None:
+        payload = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f"<Error><Code>{code}</Code><Message>{code}</Message><Key>{key}</Key>"
+            f"<Resource>{self.path}</Resource><RequestId>standin</RequestId><HostId>standin</HostId></Error>"
+        ).encode()
+        self._reply(status, payload, "application/xml", body=body)
+
+    def _reply(self, status: int, payload: bytes, content_type: str, *, body: bool) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if body:
+            self.wfile.write(payload)
+
+
+class S3StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        *,
+        latency: float = 0.0,
+        bandwidth: float = 0.0,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, S3Handler)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.verbose = verbose
+        self.catalog = ObjectCatalog()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "S3StandIn":
+        self._thread = threading.Thread(target=self.serve_forever, name="s3-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve synthetic objects over the S3 GET/HEAD API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay before each response")
+    parser.add_argument("--bandwidth-mibps", type=float, default=0.0, help="per-response MiB/s, 0 for unlimited")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = S3StandIn(
+        (args.host, args.port),
+        latency=args.latency_ms / 1000,
+        bandwidth=args.bandwidth_mibps * 1024 * 1024,
+        verbose=args.verbose,
+    )
+    print(f"serving s3://<bucket>/synthetic/<size>[-<seed>] on {server.endpoint}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.asgi import AsgiClient, Request, multipart  # noqa: E402
+from benchmarks.harness import (  # noqa: E402
+    Result,
+    compare,
+    environment,
+    format_size,
+    load_results,
+    measure,
+    print_results,
+    quiet_stdout,
+    summarize,
+    write_results,
+)
+from benchmarks.objects import MemoryObjectStore, SyntheticObject, reference_manifest  # noqa: E402
+
+if TYPE_CHECKING:
+    from app.core.models import AuditRecord
+
+KIB = 1024
+MIB = 1024 * KIB
+GIB = 1024 * MIB
+IN_MEMORY_LIMIT = 256 * MIB
+SYNC_APPEND_LIMIT = 10_000
+BUCKET = "mig-artifacts"
+
+PROFILES = {
+    "quick": {
+        "repeat": 50,
+        "hash_sizes": [KIB, 64 * KIB, MIB, 16 * MIB, 128 * MIB],
+        "object_sizes": [MIB, 64 * MIB],
+        "audit_counts": [10_000],
+        "requests": 200,
+    },
+    "full": {
+        "repeat": 200,
+        "hash_sizes": [KIB, 64 * KIB, MIB, 16 * MIB, 128 * MIB, GIB, 4 * GIB],
+        "object_sizes": [MIB, 64 * MIB, GIB],
+        "audit_counts": [10_000, 1_000_000, 10_000_000],
+        "requests": 2000,
+    },
+}
+GROUPS = ("validators", "hashing", "audit", "http")
+ENVIRONMENT_DEFAULTS = {
+    "AUDIT_INDEX_ENABLED": "false",
+    "AUDIT_RECENT_SIZE": "0",
+    "VERIFY_CACHE_ENABLED": "false",
+}
+
+
+def example(path: str) -> bytes:
+    return (ROOT / "examples" / path).read_bytes()
+
+
+def replication_manifest(sha256: str) -> bytes:
+    return (
+        'source_db: "postgres://source-db"\n'
+        'target_db: "postgres://target-db"\n'
+        f'expected_snapshot_hash: "{sha256}"\n'
+        'sync_mode: "sync"\n'
+    ).encode()
+
+
+@contextlib.contextmanager
+def bench_environment() -> Iterator[None]:
+    workdir = Path(tempfile.mkdtemp(prefix="security-gate-bench-"))
+    defaults = {"AUDIT_LOG_PATH": str(workdir / "audit.log"), **ENVIRONMENT_DEFAULTS}
+    added = [name for name in defaults if name not in os.environ]
+    cwd = os.getcwd()
+    os.environ.update({name: defaults[name] for name in added})
+    os.chdir(ROOT)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+        for name in added:
+            os.environ.pop(name, None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def patched(target: Any, name: str, value: Any) -> Iterator[None]:
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+@contextlib.contextmanager
+def object_store(sizes: list[int]) -> Iterator[dict[int, tuple[str, str]]]:
+    from app.integrity import artifacts
+
+    store = MemoryObjectStore()
+    uris = {}
+    for size in sizes:
+        obj = SyntheticObject(size, seed=size)
+        uris[size] = (store.put(BUCKET, f"bench/snapshot-{size}.bin", obj), obj.sha256)
+    with patched(artifacts, "_minio_client", lambda: store):
+        yield uris
+
+
+@contextlib.contextmanager
+def fresh_audit_log() -> Iterator[None]:
+    from app.audit import logger
+
+    workdir = Path(tempfile.mkdtemp(prefix="security-gate-audit-"))
+    try:
+        with patched(logger, "AUDIT_LOG_PATH", str(workdir / "audit.log")):
+            yield
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_validators(profile: dict) -> list[Result]:
+    from app.validators.decision_cache import clear_decision_cache
+    from app.validators.migration import validate_migration
+    from app.validators.replication import validate_replication
+    from app.validators.replication_ref import validate_replication_reference
+
+    repeat = profile["repeat"]
+    results = []
+    for name in ("t1_good", "t1_bad"):
+        manifest = example(f"{name}/migration_manifest.json")
+        config = example(f"{name}/app-config.yaml")
+        results.append(
+            measure(
+                f"validate_migration[{name}]",
+                "validators",
+                lambda: validate_migration(manifest, config),
+                repeat=repeat,
+                setup=clear_decision_cache,
+            )
+        )
+        results.append(
+            measure(
+                f"validate_migration[{name},cached]",
+                "validators",
+                lambda: validate_migration(manifest, config),
+                repeat=repeat,
+            )
+        )
+    for name in ("t2_good", "t2_bad"):
+        manifest = example(f"{name}/replication_manifest.yaml")
+        snapshot = example(f"{name}/snapshot.tar.gz")
+        results.append(
+            measure(
+                f"validate_replication[{name}]",
+                "validators",
+                lambda: validate_replication(manifest, snapshot),
+                repeat=repeat,
+            )
+        )
+    for size in profile["object_sizes"]:
+        if size > IN_MEMORY_LIMIT:
+            continue
+        obj = SyntheticObject(size, seed=size)
+        snapshot = obj.read()
+        manifest = replication_manifest(obj.sha256)
+        results.append(
+            measure(
+                f"validate_replication[{format_size(size)}]",
+                "validators",
+                lambda: validate_replication(manifest, snapshot),
+                repeat=max(3, repeat * MIB // size),
+                work=size,
+                work_unit="bytes",
+            )
+        )
+    with object_store(profile["object_sizes"]) as uris:
+        for size, (uri, sha256) in uris.items():
+            manifest = reference_manifest(uri, sha256)
+            results.append(
+                measure(
+                    f"validate_replication_reference[{format_size(size)}]",
+                    "validators",
+                    lambda: validate_replication_reference(manifest),
+                    repeat=max(3, repeat * MIB // size),
+                    work=size,
+                    work_unit="bytes",
+                )
+            )
+    return results
+
+
+def bench_hashing(profile: dict) -> list[Result]:
+    from app.integrity.hashing import hash_bytes, hash_stream
+
+    results = []
+    for size in profile["hash_sizes"]:
+        obj = SyntheticObject(size, seed=size)
+        repeat = max(3, min(profile["repeat"] * 10, 64 * profile["repeat"] * MIB // max(size, 1)))
+        if size <= IN_MEMORY_LIMIT:
+            data = obj.read()
+            results.append(
+                measure(
+                    f"hash_bytes[{format_size(size)}]",
+                    "hashing",
+                    lambda: hash_bytes(data),
+                    repeat=repeat,
+                    work=size,
+                    work_unit="bytes",
+                )
+            )
+            del data
+        else:
+            results.append(
+                measure(
+                    f"hash_stream[{format_size(size)}]",
+                    "hashing",
+                    lambda: hash_stream(obj.chunks(MIB)),
+                    repeat=3,
+                    warmup=0,
+                    work=size,
+                    work_unit="bytes",
+                )
+            )
+    return results
+
+
+def _audit_records() -> list[AuditRecord]:
+    from app.core.models import AuditRecord
+
+    return [
+        AuditRecord(
+            request_id=f"bench-{index:04d}",
+            scenario="T1" if index % 2 else "T2",
+            decision="BLOCK" if index == 0 else "ALLOW",
+            reasons=["TLS_DISABLED_PROD"] if index == 0 else [],
+            timestamp="2026-01-01T00:00:00+00:00",
+            endpoint="/api/v1/validate/migration",
+            policy_version="2026.01",
+        )
+        for index in range(100)
+    ]
+
+
+def _append_threads(records: list[AuditRecord], count: int, writers: int) -> tuple[list[float], float]:
+    from app.audit import logger
+
+    latencies: list[float] = []
+
+    def shard(offset: int) -> None:
+        for index in range(offset, count, writers):
+            start = time.perf_counter()
+            logger.append_audit_record(records[index % len(records)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(writers) as pool:
+        for future in [pool.submit(shard, offset) for offset in range(writers)]:
+            future.result()
+    return latencies, time.perf_counter() - start
+
+
+async def _append_tasks(records: list[AuditRecord], count: int, concurrency: int) -> float:
+    from app.audit import logger
+
+    position = 0
+
+    async def worker() -> None:
+        nonlocal position
+        while position < count:
+            record = records[position % len(records)]
+            position += 1
+            await logger.append_audit_record_async(record)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def bench_audit(profile: dict, writers: int, concurrency: int) -> list[Result]:
+    from app.audit import logger
+    from app.audit.index import AuditQuery
+
+    records = _audit_records()
+    results = []
+
+    sync_count = min(SYNC_APPEND_LIMIT, *profile["audit_counts"])
+    with fresh_audit_log():
+        logger.start_audit_writer()
+        try:
+            latencies, wall = _append_threads(records, sync_count, writers)
+        finally:
+            logger.stop_audit_writer()
+    results.append(
+        summarize(
+            f"append_audit_record[{sync_count},threads={writers}]",
+            "audit",
+            latencies,
+            work=sync_count,
+            work_unit="records",
+            total=wall,
+        )
+    )
+
+    for count in profile["audit_counts"]:
+        with fresh_audit_log():
+            logger.start_audit_writer()
+            try:
+                wall = asyncio.run(_append_tasks(records, count, concurrency))
+            finally:
+                logger.stop_audit_writer()
+            results.append(
+                summarize(
+                    f"append_audit_record_async[{count},c={concurrency}]",
+                    "audit",
+                    [wall],
+                    work=count,
+                    work_unit="records",
+                )
+            )
+            results.append(
+                measure(
+                    f"read_audit_logs[{count},BLOCK]",
+                    "audit",
+                    lambda: logger.read_audit_logs(decision="BLOCK"),
+                    repeat=max(1, min(5, 100_000 // count)),
+                    warmup=0,
+                    work=count,
+                    work_unit="records",
+                )
+            )
+            results.append(
+                measure(
+                    f"tail_audit_logs[{count},100]",
+                    "audit",
+                    lambda: logger.tail_audit_logs(AuditQuery(), limit=100),
+                    repeat=profile["repeat"],
+                )
+            )
+    return results
+
+
+def http_cases(uri: str, sha256: str) -> dict[str, Request]:
+    from app.core.config import API_TOKEN
+
+    auth = ("Authorization", f"Bearer {API_TOKEN}")
+    migration, migration_type = multipart(
+        [
+            ("migration_manifest", "migration_manifest.json", example("t1_good/migration_manifest.json")),
+            ("app_config", "app-config.yaml", example("t1_good/app-config.yaml")),
+        ]
+    )
+    replication, replication_type = multipart(
+        [
+            ("replication_manifest", "replication_manifest.yaml", example("t2_good/replication_manifest.yaml")),
+            ("snapshot", "snapshot.tar.gz", example("t2_good/snapshot.tar.gz")),
+        ]
+    )
+    return {
+        "healthz": Request("GET", "/healthz"),
+        "migration": Request(
+            "POST",
+            "/api/v1/validate/migration",
+            migration,
+            (auth, ("Content-Type", migration_type)),
+        ),
+        "replication": Request(
+            "POST",
+            "/api/v1/validate/replication",
+            replication,
+            (auth, ("Content-Type", replication_type)),
+        ),
+        "replication_ref[1MiB]": Request(
+            "POST",
+            "/api/v1/validate/replication/ref",
+            reference_manifest(uri, sha256),
+            (auth, ("Content-Type", "application/yaml")),
+        ),
+    }
+
+
+async def _drive_http(profile: dict, concurrency: int) -> list[Result]:
+    from app.api.main import app, lifespan
+
+    client = AsgiClient(app)
+    results = []
+    with object_store([MIB]) as uris:
+        async with lifespan(app):
+            for name, request in http_cases(*uris[MIB]).items():
+                await client.run([request] * concurrency, concurrency)
+                latencies, wall = await client.run([request] * profile["requests"], concurrency)
+                results.append(
+                    summarize(
+                        f"http.{name}[c={concurrency}]",
+                        "http",
+                        latencies,
+                        work=len(latencies),
+                        work_unit="requests",
+                        total=wall,
+                    )
+                )
+    return results
+
+
+def bench_http(profile: dict, concurrency: int) -> list[Result]:
+    return asyncio.run(_drive_http(profile, concurrency))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the security gate benchmark suite")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--only", choices=GROUPS, action="append")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--audit-writers", type=int, default=8)
+    parser.add_argument("--audit-concurrency", type=int, default=256)
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    groups = args.only or list(GROUPS)
+    runners = {
+        "validators": lambda: bench_validators(profile),
+        "hashing": lambda: bench_hashing(profile),
+        "audit": lambda: bench_audit(profile, args.audit_writers, args.audit_concurrency),
+        "http": lambda: bench_http(profile, args.concurrency),
+    }
+    results: list[Result] = []
+    with bench_environment():
+        from app.core.yaml_loader import BACKEND
+
+        for group in groups:
+            print(f"running {group}...", file=sys.stderr)
+            with quiet_stdout():
+                results.extend(runners[group]())
+
+    print_results(results)
+    meta = {**environment(), "profile": args.profile, "groups": groups, "yaml_backend": BACKEND}
+    if args.output:
+        write_results(args.output, results, meta)
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.max_regression)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.max_regression:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.core.yaml_loader import LOADERS, load_yaml  # noqa: E402
+
+
+def synthetic_app_config(target_bytes: int) -> str:
+    lines = [
+        "tls:",
+        "  enabled: true",
+        "  min_version: \"1.2\"",
+        "ports:",
+        "  - 443",
+        "  - 8443",
+        "secrets_ref: \"vault://prod/app\"",
+        "services:",
+    ]
+    size = sum(len(line) + 1 for line in lines)
+    index = 0
+    while size < target_bytes:
+        block = [
+            f"  - name: service-{index}",
+            f"    image: registry.local/team/service-{index}:1.{index % 50}.{index % 7}",
+            "    replicas: 3",
+            "    env:",
+            f"      LOG_LEVEL: {'debug' if index % 9 == 0 else 'info'}",
+            f"      FEATURE_FLAGS: \"alpha,beta,gamma-{index}\"",
+            "    resources: {cpu: 500m, memory: 512Mi}",
+            f"    ports: [{8000 + index % 1000}, {9000 + index % 1000}]",
+        ]
+        lines.extend(block)
+        size += sum(len(line) + 1 for line in block)
+        index += 1
+    return "\n".join(lines) + "\n"
+
+
+def documents(synthetic_size: int) -> dict[str, str]:
+    docs = {
+        str(path.relative_to(ROOT)): path.read_text(encoding="utf-8")
+        for path in sorted((ROOT / "examples").glob("*/*.yaml"))
+    }
+    docs[f"synthetic app-config.yaml ({synthetic_size // (1024 * 1024)} MB)"] = synthetic_app_config(synthetic_size)
+    return docs
+
+
+def measure(text: str, backend: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_yaml(text, backend=backend)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare YAML loader backends")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--large-repeat", type=int, default=1)
+    parser.add_argument("--synthetic-mb", type=float, default=5)
+    args = parser.parse_args()
+
+    backends = sorted(LOADERS)
+    docs = documents(int(args.synthetic_mb * 1024 * 1024))
+    print(f"{'document':<52} " + " ".join(f"{name:>12}" for name in backends) + f" {'speedup':>8}")
+    for name, text in docs.items():
+        results = {backend: load_yaml(text, backend=backend) for backend in backends}
+        if len({repr(value) for value in results.values()}) != 1:
+            print(f"{name}: backends disagree", file=sys.stderr)
+            return 1
+        repeat = args.large_repeat if len(text) > 1024 * 1024 else args.repeat
+        timings = {backend: measure(text, backend, repeat) for backend in backends}
+        speedup = timings["python"] / timings["libyaml"] if "libyaml" in timings else 1.0
+        print(
+            f"{name:<52} "
+            + " ".join(f"{timings[backend] * 1000:>10.3f}ms" for backend in backends)
+            + f" {speedup:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.integrity import artifacts
+from app.integrity.cache import close_verification_cache
+from app.validators.decision_cache import clear_decision_cache
+
+
+class FakeResponse:
+    def __init__(self, payload: bytes, delay: float = 0.0) -> None:
+        self.payload = payload
+        self.delay = delay
+        self.chunk_sizes: list[int] = []
+        self.chunks_sent = 0
+        self.closed = False
+        self.released = False
+
+    def stream(self, amt: int):
+        self.chunk_sizes.append(amt)
+        for offset in range(0, len(self.payload), amt):
+            if self.delay:
+                time.sleep(self.delay)
+            self.chunks_sent += 1
+            yield self.payload[offset : offset + amt]
+
+    def close(self) -> None:
+        self.closed = True
+
+    def release_conn(self) -> None:
+        self.released = True
+
+
+class FakeMinio:
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.delays: dict[tuple[str, str], float] = {}
+        self.responses: dict[tuple[str, str], FakeResponse] = {}
+        self.get_calls: list[tuple[str, str]] = []
+        self.stat_calls: list[tuple[str, str]] = []
+
+    def put(self, uri: str, payload: bytes, delay: float = 0.0) -> None:
+        location = artifacts.parse_s3_uri(uri)
+        self.objects[(location.bucket, location.key)] = payload
+        self.delays[(location.bucket, location.key)] = delay
+
+    def stat_object(self, bucket: str, key: str) -> SimpleNamespace:
+        self.stat_calls.append((bucket, key))
+        if (bucket, key) not in self.objects:
+            raise KeyError(key)
+        payload = self.objects[(bucket, key)]
+        return SimpleNamespace(etag=hashlib.md5(payload).hexdigest(), version_id=None, size=len(payload))
+
+    def get_object(
+        self,
+        bucket: str,
+        key: str,
+        request_headers: dict[str, str] | None = None,
+        version_id: str | None = None,
+    ) -> FakeResponse:
+        self.get_calls.append((bucket, key))
+        if (bucket, key) not in self.objects:
+            raise KeyError(key)
+        expected_etag = (request_headers or {}).get("If-Match")
+        if expected_etag and expected_etag.strip('"') != hashlib.md5(self.objects[(bucket, key)]).hexdigest():
+            raise KeyError(key)
+        response = FakeResponse(self.objects[(bucket, key)], self.delays.get((bucket, key), 0.0))
+        self.responses[(bucket, key)] = response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def _reset_verification_cache():
+    close_verification_cache()
+    clear_decision_cache()
+    yield
+    close_verification_cache()
+    clear_decision_cache()
+
+
+@pytest.fixture
+def fake_minio(monkeypatch: pytest.MonkeyPatch) -> FakeMinio:
+    client = FakeMinio()
+    monkeypatch.setattr(artifacts, "_minio_client", lambda: client)
+    return client
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+from hashlib import sha256
+
+import pytest
+
+from app.api import main
+from app.api.main import app
+from app.audit import logger
+from app.core.config import API_TOKEN
+from app.core.models import AuditRecord
+from app.integrity import cache
+from benchmarks.asgi import AsgiClient, Request, Response
+
+AUTH = ("Authorization", f"Bearer {API_TOKEN}")
+
+
+def _send(request: Request) -> Response:
+    return asyncio.run(AsgiClient(app).send(request))
+
+
+def _post_batch(items: list[dict]) -> Response:
+    body = json.dumps({"items": items}).encode("utf-8")
+    return _send(Request("POST", "/api/v1/validate/batch", body, (AUTH, ("Content-Type", "application/json"))))
+
+
+def _reference(snapshot: bytes, app_id: str) -> dict:
+    manifest = (
+        f"app_id: {app_id}\n"
+        "env: prod\n"
+        "snapshot:\n"
+        "  uri: s3://bucket/snap.tar.gz\n"
+        f"  sha256: {sha256(snapshot).hexdigest()}\n"
+        "sync_mode: sync\n"
+    )
+    return {"scenario": "T2-ref", "reference_manifest": manifest}
+
+
+def _record(index: int, decision: str = "ALLOW") -> AuditRecord:
+    return AuditRecord(
+        request_id=f"req-{index}",
+        scenario="T1",
+        decision=decision,
+        reasons=[],
+        timestamp=f"2026-01-01T00:00:{index:02d}+00:00",
+        endpoint="/api/v1/validate/migration",
+    )
+
+
+@pytest.fixture
+def audit_log(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "audit.log"
+    monkeypatch.setattr(logger, "AUDIT_LOG_PATH", str(path))
+    return path
+
+
+def test_audit_logs_paginate_newest_first(audit_log) -> None:
+    for index in range(5):
+        logger.append_audit_record(_record(index))
+
+    first = _send(Request("GET", "/api/v1/audit/logs", query="limit=2&order=desc"))
+    second = _send(
+        Request("GET", "/api/v1/audit/logs", query=f"limit=2&order=desc&cursor={first.headers['x-next-cursor']}")
+    )
+
+    assert first.status == second.status == 200
+    assert [item["request_id"] for item in json.loads(first.body)] == ["req-4", "req-3"]
+    assert [item["request_id"] for item in json.loads(second.body)] == ["req-2", "req-1"]
+
+
+@pytest.mark.parametrize("query", ["order=newest", "order=DESC", "limit=0"])
+def test_audit_logs_reject_invalid_parameters(audit_log, query: str) -> None:
+    assert _send(Request("GET", "/api/v1/audit/logs", query=query)).status == 422
+
+
+def test_recent_seed_failure_is_logged(capsys: pytest.CaptureFixture[str]) -> None:
+    def failing_seed() -> None:
+        raise OSError("disk gone")
+
+    async def seed() -> None:
+        future = asyncio.get_running_loop().run_in_executor(None, failing_seed)
+        future.add_done_callback(main._log_seed_failure)
+        with pytest.raises(OSError):
+            await future
+        await asyncio.sleep(0)
+
+    asyncio.run(seed())
+
+    payload = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert payload["event"] == "recent_seed_failed"
+    assert "disk gone" in payload["error"]
+
+
+def test_batch_dedups_artifacts_and_isolates_item_errors(
+    audit_log, fake_minio, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cache, "VERIFY_CACHE_ENABLED", False)
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot", delay=0.02)
+
+    response = _post_batch(
+        [
+            _reference(b"snapshot", "billing"),
+            _reference(b"snapshot", "ledger"),
+            {"scenario": "T1", "migration_manifest": "{}"},
+            {"scenario": "T3"},
+        ]
+    )
+
+    assert response.status == 200
+    payload = json.loads(response.body)
+    assert payload["decision"] == "BLOCK"
+    assert [item["decision"] for item in payload["results"]] == ["ALLOW", "ALLOW", "BLOCK", "BLOCK"]
+    assert [item["scenario"] for item in payload["results"]] == ["T2", "T2", "T1", "BATCH"]
+    assert payload["results"][2]["reasons"][0]["code"] == "SCHEMA_INVALID"
+    assert fake_minio.get_calls == [("bucket", "snap.tar.gz")]
+    assert len(audit_log.read_text(encoding="utf-8").splitlines()) == 4
+
+
+@pytest.mark.parametrize(
+    ("items", "code"),
+    [([], "SCHEMA_INVALID"), ([{"scenario": "T1"}] * 3, "BATCH_TOO_LARGE")],
+)
+def test_batch_rejects_empty_and_oversized_requests(
+    audit_log, monkeypatch: pytest.MonkeyPatch, items: list[dict], code: str
+) -> None:
+    monkeypatch.setattr(main, "BATCH_MAX_ITEMS", 2)
+
+    response = _post_batch(items)
+
+    assert response.status == 400
+    assert code in response.body.decode("utf-8")
+
+
+def test_batch_requires_token(audit_log) -> None:
+    body = json.dumps({"items": [{"scenario": "T1"}]}).encode("utf-8")
+
+    response = _send(Request("POST", "/api/v1/validate/batch", body, (("Content-Type", "application/json"),)))
+
+    assert response.status == 401
+
+
+def test_export_streams_filtered_ndjson_and_csv(audit_log) -> None:
+    for index in range(4):
+        logger.append_audit_record(_record(index, "BLOCK" if index % 2 else "ALLOW"))
+
+    ndjson = _send(Request("GET", "/api/v1/audit/export", query="decision=BLOCK"))
+    exported = _send(Request("GET", "/api/v1/audit/export", query="format=csv&decision=BLOCK"))
+
+    assert ndjson.status == exported.status == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["request_id"] for line in ndjson.body.splitlines()] == ["req-1", "req-3"]
+    assert exported.headers["content-disposition"] == 'attachment; filename="audit-export.csv"'
+    rows = list(csv.DictReader(io.StringIO(exported.body.decode("utf-8"))))
+    assert [row["request_id"] for row in rows] == ["req-1", "req-3"]
+
+
+def test_export_rejects_unknown_format(audit_log) -> None:
+    assert _send(Request("GET", "/api/v1/audit/export", query="format=xml")).status == 422
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import contextvars
+import io
+from hashlib import sha256
+
+from prometheus_client import REGISTRY
+
+from app.core.logging import update_request_context
+from app.integrity.hashing import hash_bytes
+from app.validators.replication import validate_replication
+from app.validators.replication_ref import validate_replication_reference
+
+
+def _sample(name: str, kind: str, scenario: str, **labels: str) -> float:
+    value = REGISTRY.get_sample_value(name, {"kind": kind, "scenario": scenario, **labels})
+    return value or 0.0
+
+
+def _run(scenario: str, func):
+    def scoped():
+        update_request_context(scenario=scenario)
+        return func()
+
+    return contextvars.copy_context().run(scoped)
+
+
+def test_reference_validation_records_fetch_and_hash_metrics(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"s" * 4096)
+    fake_minio.put("s3://bucket/wal.bin", b"w" * 1024)
+    manifest = (
+        "app_id: billing\nenv: prod\nsnapshot:\n"
+        f"  uri: s3://bucket/snap.tar.gz\n  sha256: {sha256(b's' * 4096).hexdigest()}\nsync_mode: sync\n"
+        f"wal:\n  uri: s3://bucket/wal.bin\n  sha256: {sha256(b'w' * 1024).hexdigest()}\n"
+    ).encode("utf-8")
+    names = (
+        "security_gate_artifact_fetched_bytes_total",
+        "security_gate_artifact_hashed_bytes_total",
+        "security_gate_artifact_size_bytes_count",
+        "security_gate_artifact_fetch_ttfb_seconds_count",
+    )
+    before = {(name, kind): _sample(name, kind, "T-metrics") for name in names for kind in ("snapshot", "wal")}
+
+    outcome = _run("T-metrics", lambda: validate_replication_reference(manifest))
+
+    assert outcome.decision == "ALLOW"
+    delta = {key: _sample(key[0], key[1], "T-metrics") - value for key, value in before.items()}
+    assert delta[("security_gate_artifact_fetched_bytes_total", "snapshot")] == 4096
+    assert delta[("security_gate_artifact_hashed_bytes_total", "snapshot")] == 4096
+    assert delta[("security_gate_artifact_fetched_bytes_total", "wal")] == 1024
+    assert delta[("security_gate_artifact_hashed_bytes_total", "wal")] == 1024
+    assert delta[("security_gate_artifact_size_bytes_count", "snapshot")] == 1
+    assert delta[("security_gate_artifact_fetch_ttfb_seconds_count", "wal")] == 1
+
+
+def test_uploads_record_hashed_bytes_by_kind() -> None:
+    snapshot = b"snapshot-bytes"
+    manifest = (
+        f"source_db: a\ntarget_db: b\nsync_mode: sync\nexpected_snapshot_hash: {sha256(snapshot).hexdigest()}\n"
+    ).encode("utf-8")
+    before_snapshot = _sample("security_gate_artifact_hashed_bytes_total", "snapshot", "T-upload")
+    before_config = _sample("security_gate_artifact_hashed_bytes_total", "config", "T-upload")
+
+    _run("T-upload", lambda: validate_replication(manifest, io.BytesIO(snapshot)))
+    _run("T-upload", lambda: hash_bytes(b"tls: true\n", kind="config"))
+    hash_bytes(b"untracked")
+
+    after_snapshot = _sample("security_gate_artifact_hashed_bytes_total", "snapshot", "T-upload")
+    assert after_snapshot == before_snapshot + len(snapshot)
+    assert _sample("security_gate_artifact_hashed_bytes_total", "config", "T-upload") == before_config + 10
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import threading
+from hashlib import sha256
+
+import pytest
+
+from app.integrity import artifacts
+
+
+def test_hash_s3_object_streams_in_chunks(fake_minio) -> None:
+    payload = b"x" * 10_000 + b"tail"
+    fake_minio.put("s3://bucket/snap.tar.gz", payload)
+
+    digest = artifacts.hash_s3_object("s3://bucket/snap.tar.gz", chunk_size=4096)
+
+    response = fake_minio.responses[("bucket", "snap.tar.gz")]
+    assert digest.sha256 == sha256(payload).hexdigest()
+    assert digest.size == len(payload)
+    assert response.chunk_sizes == [4096]
+    assert response.closed and response.released
+
+
+def test_hash_s3_object_wraps_fetch_errors(fake_minio) -> None:
+    with pytest.raises(RuntimeError):
+        artifacts.hash_s3_object("s3://bucket/missing.tar.gz")
+
+
+def test_hash_s3_object_stops_when_cancelled(fake_minio) -> None:
+    fake_minio.put("s3://bucket/wal.bin", b"w" * 8192)
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(artifacts.TransferCancelledError):
+        artifacts.hash_s3_object("s3://bucket/wal.bin", chunk_size=1024, cancel=cancel)
+    assert fake_minio.responses[("bucket", "wal.bin")].released
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+import pytest
+
+from app.audit import export, logger
+from app.audit.index import AuditQuery
+from app.audit.segments import SegmentStore
+from app.audit.writer import AuditWriter
+from app.core.models import AuditRecord
+
+
+def _record(index: int) -> AuditRecord:
+    return AuditRecord(
+        request_id=f"req-{index}",
+        scenario="T1" if index % 2 else "T2",
+        decision="BLOCK" if index % 3 == 0 else "ALLOW",
+        reasons=["SECRETS_INLINE", "TLS_DISABLED"] if index % 3 == 0 else [],
+        timestamp=f"2026-01-01T00:{index // 60:02d}:{index % 60:02d}+00:00",
+        artifact_refs=["manifest.yaml"],
+    )
+
+
+@pytest.fixture
+def audit_log(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "audit.log"
+    monkeypatch.setattr(logger, "AUDIT_LOG_PATH", str(path))
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 256)
+    writer = AuditWriter(
+        str(path),
+        batch_size=1,
+        flush_interval=0,
+        store=SegmentStore(str(path), max_bytes=2048, max_age=0),
+    )
+    writer.start()
+    for index in range(90):
+        writer.submit(logger._serialize_record(_record(index))).result(timeout=5)
+    writer.close()
+    return path
+
+
+def test_ndjson_export_streams_filtered_records_across_segments(audit_log) -> None:
+    rows = logger.export_audit_records(AuditQuery(decision="BLOCK", since=_record(30).timestamp))
+    chunks = list(export.iter_ndjson(rows))
+
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert len(chunks) > 1
+    assert all(len(chunk) < 2 * export.EXPORT_CHUNK_SIZE for chunk in chunks)
+    assert [json.loads(line)["request_id"] for line in lines] == [f"req-{index}" for index in range(30, 90, 3)]
+
+
+def test_csv_export_writes_header_and_flattens_lists(audit_log) -> None:
+    rows = logger.export_audit_records(AuditQuery(scenario="T2", until=_record(4).timestamp))
+    table = list(csv.reader(io.StringIO(b"".join(export.iter_csv(rows)).decode("utf-8"))))
+
+    assert table[0] == export.CSV_COLUMNS
+    assert [row[0] for row in table[1:]] == ["req-0", "req-2"]
+    assert table[1][4] == "SECRETS_INLINE;TLS_DISABLED"
+
+
+def test_csv_export_of_empty_log_is_header_only(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logger, "AUDIT_LOG_PATH", str(tmp_path / "missing.log"))
+
+    body = b"".join(export.iter_csv(logger.export_audit_records(AuditQuery())))
+
+    assert body.decode("utf-8").splitlines() == [",".join(export.CSV_COLUMNS)]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+
+from app.audit import logger
+from app.audit.index import AuditIndex, AuditQuery
+from app.core.models import AuditRecord
+
+
+def _record(index: int) -> AuditRecord:
+    blocked = index % 3 == 0
+    return AuditRecord(
+        request_id=f"req-{index}",
+        scenario="T1" if index % 2 else "T2",
+        decision="BLOCK" if blocked else "ALLOW",
+        reasons=["SECRETS_INLINE"] if blocked else [],
+        timestamp=f"2026-01-01T00:00:{index:02d}+00:00",
+        endpoint="/api/v1/validate/migration",
+        policy_version="2026.01" if index < 10 else "2026.02",
+    )
+
+
+@pytest.fixture
+def audit_log(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "audit.log"
+    monkeypatch.setattr(logger, "AUDIT_LOG_PATH", str(path))
+    monkeypatch.setattr(logger, "AUDIT_INDEX_PATH", str(tmp_path / "audit.log.index.sqlite"))
+    monkeypatch.setattr(logger, "_writer", None)
+    monkeypatch.setattr(logger, "_index", None)
+    for index in range(20):
+        logger.append_audit_record(_record(index))
+    yield path
+    logger.close_audit_index()
+
+
+def test_index_pages_newest_first_with_keyset_cursor(audit_log) -> None:
+    query = AuditQuery(decision="BLOCK")
+
+    first = logger.query_audit_logs(query, limit=3, newest_first=True)
+    second = logger.query_audit_logs(query, limit=3, cursor=first.next_cursor, newest_first=True)
+
+    assert [record.request_id for record in first.records] == ["req-18", "req-15", "req-12"]
+    assert [record.request_id for record in second.records] == ["req-9", "req-6", "req-3"]
+    assert second.next_cursor is not None
+
+
+def test_index_filters_match_full_scan(audit_log) -> None:
+    query = AuditQuery(
+        reason_code="SECRETS_INLINE",
+        policy_version="2026.01",
+        since="2026-01-01T00:00:03+00:00",
+        until="2026-01-01T00:00:09+00:00",
+    )
+
+    indexed = logger.query_audit_logs(query)
+    scanned = logger._scan_audit_logs(query, limit=None, after=None)
+
+    assert [record.request_id for record in indexed.records] == ["req-3", "req-6"]
+    assert indexed.records == scanned.records
+
+
+def test_index_catches_up_with_appended_records(audit_log, tmp_path) -> None:
+    index = AuditIndex(str(tmp_path / "other.sqlite"), str(audit_log))
+    assert index.sync() == 20
+    logger.append_audit_record(_record(20))
+
+    page = index.query(AuditQuery(), limit=1, newest_first=True)
+
+    assert [record.request_id for record in page.records] == ["req-20"]
+    index.close()
+
+
+def test_read_audit_logs_keeps_oldest_first_default(audit_log) -> None:
+    records = logger.read_audit_logs(limit=2, scenario="T2")
+
+    assert [record.request_id for record in records] == ["req-0", "req-2"]
+
+
+def test_query_reads_unsynced_tail_without_writing_the_index(audit_log, tmp_path) -> None:
+    index = AuditIndex(str(tmp_path / "other.sqlite"), str(audit_log))
+    index.sync()
+    logger.append_audit_record(_record(20))
+    logger.append_audit_record(_record(21))
+
+    newest = index.query(AuditQuery(), limit=3, newest_first=True)
+    oldest = index.query(AuditQuery(), limit=2, cursor=newest.next_cursor)
+
+    assert [record.request_id for record in newest.records] == ["req-21", "req-20", "req-19"]
+    assert [record.request_id for record in oldest.records] == ["req-20", "req-21"]
+    assert index.sync() == 2
+    index.close()
+
+
+def test_index_zero_limit_returns_empty_page(audit_log) -> None:
+    page = logger.query_audit_logs(AuditQuery(), limit=0, newest_first=True)
+
+    assert page.records == []
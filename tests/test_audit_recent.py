@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+
+from app.audit import logger
+from app.audit.index import AuditQuery
+from app.audit.recent import RecentRecords
+from app.audit.segments import SegmentStore
+from app.core.models import AuditRecord
+
+
+def _record(index: int) -> AuditRecord:
+    return AuditRecord(
+        request_id=f"req-{index}",
+        scenario="T1",
+        decision="BLOCK" if index % 5 == 0 else "ALLOW",
+        reasons=[],
+        timestamp=f"2026-01-01T00:00:{index:02d}+00:00",
+    )
+
+
+@pytest.fixture
+def audit_log(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "audit.log"
+    monkeypatch.setattr(logger, "AUDIT_LOG_PATH", str(path))
+    monkeypatch.setattr(logger, "AUDIT_INDEX_ENABLED", False)
+    monkeypatch.setattr(logger, "_writer", None)
+    monkeypatch.setattr(logger, "_recent", None)
+    monkeypatch.setattr(logger, "AUDIT_RECENT_SIZE", 20)
+    for index in range(30):
+        logger.append_audit_record(_record(index))
+    logger.start_recent_audit_records()
+    logger.seed_recent_audit_records()
+    return path
+
+
+def _no_disk_reads(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("read from disk")
+
+    monkeypatch.setattr(SegmentStore, "iter_backward", fail)
+    monkeypatch.setattr(SegmentStore, "iter_forward", fail)
+
+
+def test_ring_buffer_evicts_from_decision_index() -> None:
+    recent = RecentRecords(capacity=4)
+    recent.reset([], end=0, complete=True)
+    for index in range(10):
+        assert recent.append(index * 10, 10, _record(index))
+
+    page = recent.page(AuditQuery(decision="BLOCK"), limit=5)
+
+    assert page is None
+    assert [record.request_id for record in recent.page(AuditQuery(), limit=4).records] == [
+        "req-9",
+        "req-8",
+        "req-7",
+        "req-6",
+    ]
+    assert not recent.append(500, 10, _record(50))
+
+
+def test_dashboard_pages_are_served_from_memory(audit_log, monkeypatch: pytest.MonkeyPatch) -> None:
+    logger.append_audit_record(_record(30))
+    _no_disk_reads(monkeypatch)
+
+    page = logger.tail_audit_logs(AuditQuery(decision="BLOCK"), limit=2)
+
+    assert [record.request_id for record in page.records] == ["req-30", "req-25"]
+    assert page.next_cursor is not None
+
+
+def test_memory_cursor_continues_on_disk(audit_log) -> None:
+    query = AuditQuery(decision="BLOCK")
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = logger.query_audit_logs(query, limit=2, cursor=cursor, newest_first=True)
+        seen.extend(record.request_id for record in page.records)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == ["req-25", "req-20", "req-15", "req-10", "req-5", "req-0"]
+
+
+def test_records_written_by_other_processes_are_picked_up(audit_log) -> None:
+    with audit_log.open("a", encoding="utf-8") as handle:
+        handle.write(logger._serialize_record(_record(40)) + "\n")
+    logger.append_audit_record(_record(45))
+
+    page = logger.tail_audit_logs(AuditQuery(decision="BLOCK"), limit=3)
+
+    assert [record.request_id for record in page.records] == ["req-45", "req-40", "req-25"]
+
+
+def test_catch_up_beyond_capacity_reseeds_from_the_tail(audit_log) -> None:
+    with audit_log.open("a", encoding="utf-8") as handle:
+        for index in range(100, 160):
+            handle.write(logger._serialize_record(_record(index)) + "\n")
+
+    page = logger.tail_audit_logs(AuditQuery(), limit=3)
+
+    assert [record.request_id for record in page.records] == ["req-159", "req-158", "req-157"]
+    assert len(logger._recent.page(AuditQuery(), limit=20).records) == 20
+
+
+def test_zero_limit_returns_empty_page_without_index(audit_log, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logger, "_recent", None)
+
+    assert logger.read_audit_logs(limit=0) == []
+    assert logger.tail_audit_logs(AuditQuery(), limit=0).records == []
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import pytest
+
+from app.audit import logger
+from app.audit.index import AuditIndex, AuditQuery
+from app.audit.segments import SegmentStore
+from app.audit.writer import AuditWriter
+from app.core.models import AuditRecord
+
+
+def _record(index: int) -> AuditRecord:
+    return AuditRecord(
+        request_id=f"req-{index}",
+        scenario="T1",
+        decision="BLOCK" if index % 4 == 0 else "ALLOW",
+        reasons=[],
+        timestamp=f"2026-01-01T00:{index // 60:02d}:{index % 60:02d}+00:00",
+    )
+
+
+def _write(path, count: int, **store_options) -> SegmentStore:
+    store = SegmentStore(str(path), max_bytes=1024, max_age=0, **store_options)
+    writer = AuditWriter(str(path), batch_size=1, flush_interval=0, store=store)
+    writer.start()
+    for index in range(count):
+        writer.submit(logger._serialize_record(_record(index))).result(timeout=5)
+    writer.close()
+    return store
+
+
+@pytest.fixture
+def segmented_log(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "audit.log"
+    monkeypatch.setattr(logger, "AUDIT_LOG_PATH", str(path))
+    monkeypatch.setattr(logger, "AUDIT_INDEX_ENABLED", False)
+    monkeypatch.setattr(logger, "_writer", None)
+    return path
+
+
+def test_writer_rolls_over_and_compresses_closed_segments(segmented_log) -> None:
+    store = _write(segmented_log, 60)
+    segments = store.load().segments
+
+    assert len(segments) > 2
+    assert all(segment.compressed for segment in segments)
+    assert all(store.segment_path(segment).suffix == ".gz" for segment in segments)
+    assert sum(segment.records for segment in segments) < 60
+    assert segments[0].first_ts == _record(0).timestamp
+    for previous, current in zip(segments, segments[1:]):
+        assert current.base_offset == previous.base_offset + previous.size
+
+
+def test_scan_and_tail_span_all_segments(segmented_log) -> None:
+    _write(segmented_log, 60)
+
+    oldest = logger.query_audit_logs(AuditQuery()).records
+    newest = logger.tail_audit_logs(AuditQuery(), limit=60).records
+
+    assert [record.request_id for record in oldest] == [f"req-{index}" for index in range(60)]
+    assert [record.request_id for record in newest] == [f"req-{index}" for index in range(59, -1, -1)]
+
+
+def test_tail_cursor_crosses_segment_boundaries(segmented_log) -> None:
+    _write(segmented_log, 60)
+    query = AuditQuery(decision="BLOCK")
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = logger.tail_audit_logs(query, limit=4, before=cursor)
+        seen.extend(record.request_id for record in page.records)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == [f"req-{index}" for index in range(56, -1, -4)]
+
+
+def test_time_range_skips_segments_outside_the_window(segmented_log, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = _write(segmented_log, 60)
+    first = store.load().segments[0]
+    opened: list[str] = []
+    original = SegmentStore._iter_segment
+
+    def tracking(self, segment, start):
+        opened.append(segment.name)
+        return original(self, segment, start)
+
+    monkeypatch.setattr(SegmentStore, "_iter_segment", tracking)
+    since = _record(50).timestamp
+    records = logger.query_audit_logs(AuditQuery(since=since)).records
+
+    assert [record.request_id for record in records] == [f"req-{index}" for index in range(50, 60)]
+    assert first.name not in opened
+
+
+def test_retention_drops_oldest_segments_and_prunes_index(segmented_log, tmp_path) -> None:
+    store = _write(segmented_log, 60, retention_segments=1)
+    segments = store.load().segments
+
+    assert len(segments) == 1
+    assert not list(tmp_path.glob("audit.log.000001*"))
+    index = AuditIndex(str(tmp_path / "index.sqlite"), str(segmented_log))
+    records = index.query(AuditQuery()).records
+    index.close()
+    assert records[0].request_id != "req-0"
+    assert records[-1].request_id == "req-59"
+
+
+def test_index_follows_rotation(segmented_log, tmp_path) -> None:
+    index = AuditIndex(str(tmp_path / "index.sqlite"), str(segmented_log))
+    _write(segmented_log, 20)
+    index.sync()
+    _write(segmented_log, 60)
+    page = index.query(AuditQuery(), limit=5, newest_first=True)
+    index.close()
+
+    assert [record.request_id for record in page.records] == [f"req-{index}" for index in range(59, 54, -1)]
+
+
+def test_backward_reads_sealed_segments_block_by_block(segmented_log, monkeypatch: pytest.MonkeyPatch) -> None:
+    import gzip
+
+    from app.audit import segments as segments_module
+
+    monkeypatch.setattr(segments_module, "SEAL_BLOCK_BYTES", 256)
+    store = SegmentStore(str(segmented_log), max_bytes=4096, max_age=0)
+    writer = AuditWriter(str(segmented_log), batch_size=1, flush_interval=0, store=store)
+    writer.start()
+    for index in range(60):
+        writer.submit(logger._serialize_record(_record(index))).result(timeout=5)
+    writer.close()
+    sealed = store.load().segments[0]
+    assert sealed.blocks is not None and len(sealed.blocks) > 1
+    forward = list(store.iter_forward())
+
+    decompressed: list[int] = []
+    original = gzip.decompress
+    monkeypatch.setattr(gzip, "decompress", lambda data: decompressed.append(len(data)) or original(data))
+    middle = forward[len(forward) // 2][0]
+    backward = list(store.iter_backward(middle))
+
+    assert backward == [entry for entry in reversed(forward) if entry[0] < middle]
+    assert max(decompressed) < sealed.size
+
+
+def test_backward_reads_segments_sealed_without_blocks(segmented_log) -> None:
+    from dataclasses import replace
+
+    store = _write(segmented_log, 60)
+    manifest = store.load()
+    store._save(replace(manifest, segments=[replace(segment, blocks=None) for segment in manifest.segments]))
+
+    assert list(store.iter_backward()) == list(reversed(list(store.iter_forward())))
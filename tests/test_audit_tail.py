@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+
+from app.audit import logger, reader
+from app.audit.index import AuditQuery
+from app.core.models import AuditRecord
+
+
+@pytest.fixture
+def audit_log(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "audit.log"
+    monkeypatch.setattr(logger, "AUDIT_LOG_PATH", str(path))
+    monkeypatch.setattr(logger, "AUDIT_INDEX_ENABLED", False)
+    monkeypatch.setattr(logger, "_writer", None)
+    monkeypatch.setattr(reader, "BLOCK_SIZE", 128)
+    for index in range(50):
+        logger.append_audit_record(
+            AuditRecord(
+                request_id=f"req-{index}",
+                scenario="T1",
+                decision="BLOCK" if index % 5 == 0 else "ALLOW",
+                reasons=[],
+                timestamp=f"2026-01-01T00:00:{index:02d}+00:00",
+            )
+        )
+    return path
+
+
+def test_tail_returns_newest_records_first(audit_log) -> None:
+    page = logger.tail_audit_logs(AuditQuery(), limit=3)
+
+    assert [record.request_id for record in page.records] == ["req-49", "req-48", "req-47"]
+    assert page.next_cursor is not None
+
+
+def test_tail_pages_backwards_with_before_cursor(audit_log) -> None:
+    query = AuditQuery(decision="BLOCK")
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = logger.tail_audit_logs(query, limit=4, before=cursor)
+        seen.extend(record.request_id for record in page.records)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == [f"req-{index}" for index in range(45, -1, -5)]
+
+
+def test_tail_ignores_partially_written_last_line(audit_log) -> None:
+    with audit_log.open("a", encoding="utf-8") as handle:
+        handle.write('{"request_id": "req-partial"')
+
+    page = logger.tail_audit_logs(AuditQuery(), limit=1)
+
+    assert [record.request_id for record in page.records] == ["req-49"]
+
+
+def test_scan_and_tail_cursors_are_interchangeable(audit_log) -> None:
+    oldest = logger.query_audit_logs(AuditQuery(), limit=10)
+    newer = logger.query_audit_logs(AuditQuery(), limit=2, cursor=oldest.next_cursor)
+    older = logger.query_audit_logs(AuditQuery(), limit=2, cursor=oldest.next_cursor, newest_first=True)
+
+    assert [record.request_id for record in newer.records] == ["req-10", "req-11"]
+    assert [record.request_id for record in older.records] == ["req-8", "req-7"]
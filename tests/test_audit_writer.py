@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from app.audit import logger
+from app.audit.writer import AuditWriter
+from app.core.exceptions import AuditUnavailableError
+from app.core.models import AuditRecord
+
+RECORD = AuditRecord(
+    request_id="req-1",
+    scenario="T1",
+    decision="ALLOW",
+    reasons=[],
+    timestamp="2026-01-01T00:00:00+00:00",
+)
+
+
+def test_writer_group_commits_queued_records(tmp_path) -> None:
+    path = tmp_path / "audit.log"
+    writer = AuditWriter(str(path), flush_interval=0.05, batch_size=100, fsync_policy="batch")
+    commits: list[int] = []
+    original_commit = writer._commit
+
+    def counting_commit(batch):
+        commits.append(len(batch))
+        original_commit(batch)
+
+    writer._commit = counting_commit
+    writer.start()
+    futures = [writer.submit(json.dumps({"n": index})) for index in range(20)]
+    for future in futures:
+        future.result(timeout=5)
+    writer.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["n"] for line in lines] == list(range(20))
+    assert sum(commits) == 20
+    assert len(commits) < 20
+
+
+def test_writer_fails_closed_when_queue_is_full(tmp_path) -> None:
+    writer = AuditWriter(str(tmp_path / "audit.log"), queue_size=1)
+    writer._thread = threading.Thread(target=lambda: None)
+    writer.submit("{}")
+
+    assert writer.try_submit("{}") is None
+    with pytest.raises(AuditUnavailableError):
+        writer.submit("{}", timeout=0.01)
+
+
+def test_writer_reports_unavailable_log(tmp_path) -> None:
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    writer = AuditWriter(str(blocker / "audit.log"))
+    writer.start()
+
+    assert not writer.ready()
+    with pytest.raises(AuditUnavailableError):
+        writer.submit("{}").result(timeout=5)
+    writer.close()
+
+
+def test_ready_does_not_wait_for_commit_lock(tmp_path) -> None:
+    writer = AuditWriter(str(tmp_path / "audit.log"))
+    writer.start()
+    with writer._lock:
+        assert writer.ready()
+    writer.close()
+
+    assert not writer.ready()
+
+
+def test_writer_recovers_when_log_becomes_available(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.audit.writer.REOPEN_INTERVAL", 0.01)
+    blocker = tmp_path / "logs"
+    blocker.write_text("", encoding="utf-8")
+    writer = AuditWriter(str(blocker / "audit.log"))
+    writer.start()
+    assert not writer.ready()
+
+    blocker.unlink()
+    blocker.mkdir()
+    deadline = time.monotonic() + 5
+    while not writer.ready() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert writer.ready()
+    assert writer.submit("{}").result(timeout=5) == 0
+    writer.close()
+
+
+def test_async_append_waits_for_queue_space(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    writer = AuditWriter(str(tmp_path / "audit.log"), queue_size=1)
+    writer.submit("{}")
+    monkeypatch.setattr(logger, "_enqueue_timeout", lambda: 5.0)
+
+    def drain() -> None:
+        time.sleep(0.05)
+        for offset in (0, 3):
+            _, future = writer._queue.get()
+            future.set_result(offset)
+
+    threading.Thread(target=drain, daemon=True).start()
+
+    assert asyncio.run(logger._append_audit_record_async(writer, RECORD)) == 3
+
+
+def test_async_append_fails_when_queue_stays_full(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    writer = AuditWriter(str(tmp_path / "audit.log"), queue_size=1)
+    writer.submit("{}")
+    monkeypatch.setattr(logger, "_enqueue_timeout", lambda: 0.05)
+
+    with pytest.raises(AuditUnavailableError):
+        asyncio.run(logger._append_audit_record_async(writer, RECORD))
+
+
+def test_writer_commits_lone_record_without_linger(tmp_path) -> None:
+    writer = AuditWriter(str(tmp_path / "audit.log"), fsync_policy="never")
+    writer.start()
+    start = time.monotonic()
+    writer.submit("{}").result(timeout=5)
+    elapsed = time.monotonic() - start
+    writer.close()
+
+    assert elapsed < 0.5
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from hashlib import sha256
+
+import pytest
+
+from app.core.models import Artifacts, ValidationOutcome
+from app.policies.compiler import PolicySet
+from app.policies.policy_engine import current_policy_registry
+from app.validators import migration
+from app.validators.decision_cache import CachedDecision, DecisionCache, DecisionKey
+
+CONFIG = b"tls:\n  enabled: false\nports:\n  - 443\nsecrets_ref: \"vault://path\"\n"
+
+
+def _manifest(config: bytes) -> bytes:
+    return json.dumps(
+        {"app_id": "svc", "env": "prod", "version": "1", "config_sha256": sha256(config).hexdigest()}
+    ).encode("utf-8")
+
+
+@pytest.fixture
+def evaluations(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    original = PolicySet.evaluate
+
+    def counting(self, section, env, document, **kwargs):
+        calls.append(env)
+        return original(self, section, env, document, **kwargs)
+
+    monkeypatch.setattr(PolicySet, "evaluate", counting)
+    return calls
+
+
+def test_identical_submission_is_served_from_cache(evaluations, monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[dict] = []
+    monkeypatch.setattr(migration, "log_event", lambda **kwargs: events.append(kwargs))
+
+    first = migration.validate_migration(_manifest(CONFIG), CONFIG)
+    second = migration.validate_migration(_manifest(CONFIG), CONFIG)
+
+    assert evaluations == ["prod"]
+    assert second.decision == first.decision == "BLOCK"
+    assert [reason.code for reason in second.reasons] == ["TLS_DISABLED_PROD"]
+    assert second.artifacts is not first.artifacts
+    assert [event["log_type"] for event in events] == ["policy", "policy"]
+
+
+def test_policy_version_change_invalidates_cache(evaluations, monkeypatch: pytest.MonkeyPatch) -> None:
+    migration.validate_migration(_manifest(CONFIG), CONFIG)
+    registry = replace(current_policy_registry(), fingerprint="next")
+    monkeypatch.setattr(migration, "current_policy_registry", lambda: registry)
+    migration.validate_migration(_manifest(CONFIG), CONFIG)
+    migration.validate_migration(_manifest(CONFIG), CONFIG)
+
+    assert evaluations == ["prod", "prod"]
+
+
+def test_miss_hashes_config_once_and_keys_by_evaluated_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = CONFIG + b"# once\n"
+    manifest = _manifest(config)
+    hashed: list[bytes] = []
+    original = migration.hash_bytes
+
+    def counting(data, **kwargs):
+        hashed.append(data)
+        return original(data, **kwargs)
+
+    monkeypatch.setattr(migration, "hash_bytes", counting)
+    registry = current_policy_registry()
+    registries = iter([registry, replace(registry, fingerprint="reloaded")])
+    monkeypatch.setattr(migration, "current_policy_registry", lambda: next(registries))
+    cache = DecisionCache(max_entries=4)
+    monkeypatch.setattr(migration, "get_decision_cache", lambda: cache)
+
+    migration.validate_migration(manifest, config)
+
+    assert hashed.count(config) == 1
+    key = DecisionKey(sha256(manifest).hexdigest(), sha256(config).hexdigest(), registry.version)
+    assert cache.get(key) is not None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = DecisionCache(max_entries=2)
+    decision = CachedDecision(ValidationOutcome(decision="ALLOW", reasons=[], artifacts=Artifacts()), None)
+    keys = [DecisionKey(f"m{index}", "c", "v1") for index in range(3)]
+    cache.put(keys[0], decision)
+    cache.put(keys[1], decision)
+    cache.get(keys[0])
+    cache.put(keys[2], decision)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
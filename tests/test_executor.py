@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.core.executor import run_in_validation_pool, shutdown_validation_pool, start_validation_pool
+from app.core.logging import _request_id_var, set_request_context
+from app.core.metrics import VALIDATION_POOL_ACTIVE, VALIDATION_POOL_QUEUED
+
+
+def test_validation_runs_off_loop_with_request_context() -> None:
+    async def scenario() -> tuple[str | None, bool, list[str]]:
+        set_request_context(request_id="req-1")
+        release = threading.Event()
+        ticks: list[str] = []
+
+        def blocking() -> str | None:
+            release.wait(timeout=5)
+            return _request_id_var.get()
+
+        task = asyncio.ensure_future(run_in_validation_pool(blocking))
+        await asyncio.sleep(0.01)
+        ticks.append("loop-alive")
+        running = VALIDATION_POOL_ACTIVE._value.get() == 1
+        release.set()
+        return await task, running, ticks
+
+    start_validation_pool(workers=2)
+    try:
+        request_id, running, ticks = asyncio.run(scenario())
+    finally:
+        shutdown_validation_pool()
+    assert request_id == "req-1"
+    assert running
+    assert ticks == ["loop-alive"]
+
+
+def test_saturated_pool_reports_queued_tasks() -> None:
+    async def scenario() -> float:
+        release = threading.Event()
+        tasks = [asyncio.ensure_future(run_in_validation_pool(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        queued = VALIDATION_POOL_QUEUED._value.get()
+        release.set()
+        await asyncio.gather(*tasks)
+        return queued
+
+    start_validation_pool(workers=1)
+    try:
+        queued = asyncio.run(scenario())
+    finally:
+        shutdown_validation_pool()
+    assert queued == 2
+    assert VALIDATION_POOL_QUEUED._value.get() == 0
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+
+from prometheus_client import REGISTRY
+
+from app.core import logging as app_logging
+from app.core.log_writer import LogWriter, dumps
+
+
+def _dropped(reason: str) -> float:
+    return REGISTRY.get_sample_value("security_gate_log_dropped_total", {"reason": reason}) or 0.0
+
+
+class _SlowStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.release.wait(5)
+        self.writes += 1
+        return super().write(text)
+
+
+def test_writer_batches_lines_in_order() -> None:
+    stream = _SlowStream()
+    writer = LogWriter(queue_size=100, batch_size=50, stream=stream)
+    writer.start()
+    for index in range(20):
+        assert writer.submit({"index": index, "note": "zażółć"})
+    stream.release.set()
+    writer.close()
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["index"] for line in lines] == list(range(20))
+    assert stream.writes < 20
+
+
+def test_drop_policy_never_blocks_when_queue_is_full() -> None:
+    stream = _SlowStream()
+    writer = LogWriter(queue_size=2, policy="drop", stream=stream)
+    writer.start()
+    before = _dropped("queue_full")
+
+    accepted = sum(writer.submit({"index": index}) for index in range(10))
+    stream.release.set()
+    writer.close()
+
+    assert accepted < 10
+    assert _dropped("queue_full") == before + 10 - accepted
+    assert len(stream.getvalue().splitlines()) == accepted
+
+
+def test_log_event_keeps_context_enrichment_through_writer() -> None:
+    stream = io.StringIO()
+    writer = LogWriter(stream=stream)
+    writer.start()
+    app_logging._writer = writer
+    try:
+        app_logging.set_request_context(request_id="req-ctx", scenario="T2", endpoint="/validate/replication")
+        app_logging.log_event(
+            decision="BLOCK",
+            reason_codes=["SNAPSHOT_HASH_MISMATCH"],
+            artifact_refs=None,
+            log_type="integrity",
+            level="WARN",
+        )
+    finally:
+        app_logging._writer = None
+        writer.close()
+
+    payload = json.loads(stream.getvalue())
+    assert payload["request_id"] == "req-ctx"
+    assert payload["scenario"] == "T2"
+    assert payload["endpoint"] == "/validate/replication"
+
+
+def test_allow_summaries_are_sampled_but_blocks_are_kept(capsys) -> None:
+    before = _dropped("sampled")
+    for decision in ("ALLOW", "BLOCK"):
+        app_logging.log_request_summary(
+            request_id="req-sample",
+            scenario="T1",
+            endpoint="/validate/migration",
+            client=None,
+            decision=decision,
+            reason_codes=[],
+            artifact_refs=[],
+            duration_ms=1,
+            sample_rate=0.0,
+        )
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["decision"] for line in lines] == ["BLOCK"]
+    assert _dropped("sampled") == before + 1
+
+
+def test_dumps_matches_stdlib_ascii_output() -> None:
+    payload = {"note": "zażółć", "duration_ms": 1e-05, "codes": ["A"]}
+
+    assert dumps(payload) == json.dumps(payload, ensure_ascii=True)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+WORKER = textwrap.dedent(
+    """
+    from app.core.metrics import AUDIT_REJECTED, VALIDATION_POOL_WORKERS
+    AUDIT_REJECTED.inc(3)
+    VALIDATION_POOL_WORKERS.set(4)
+    """
+)
+PREPARED_WORKER = textwrap.dedent(
+    """
+    import sys
+    from app.serve import prepare_metrics_dir
+    assert "app.core.metrics" not in sys.modules
+    prepare_metrics_dir()
+    from app.core.metrics import AUDIT_REJECTED
+    AUDIT_REJECTED.inc()
+    """
+)
+SCRAPE = textwrap.dedent(
+    """
+    from app.core.metrics import VALIDATION_POOL_WORKERS, render_metrics
+    VALIDATION_POOL_WORKERS.set(8)
+    print(render_metrics().decode())
+    """
+)
+
+
+def _run(code: str, metrics_dir: Path) -> str:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(metrics_dir)}
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def _sample(output: str, name: str) -> float:
+    for line in output.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[1])
+    raise AssertionError(f"{name} not in output")
+
+
+def test_metrics_aggregate_across_workers_and_drop_dead_gauges(tmp_path) -> None:
+    _run(WORKER, tmp_path)
+    _run(WORKER, tmp_path)
+
+    output = _run(SCRAPE, tmp_path)
+
+    assert _sample(output, "security_gate_audit_rejected_total") == 6
+    assert _sample(output, "security_gate_validation_pool_workers") == 8
+    assert len(list(tmp_path.glob("gauge_livesum_*.db"))) == 1
+
+
+def test_entrypoint_prepares_metrics_dir_before_import(tmp_path) -> None:
+    metrics_dir = tmp_path / "missing" / "metrics"
+    _run(PREPARED_WORKER, metrics_dir)
+    stale = sorted(path.name for path in metrics_dir.glob("*.db"))
+
+    _run(PREPARED_WORKER, metrics_dir)
+    output = _run(SCRAPE, metrics_dir)
+
+    assert stale
+    assert _sample(output, "security_gate_audit_rejected_total") == 1
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.integrity import client as minio_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = b"payload"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        return
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_is_shared_and_pool_usage_is_tracked(http_server) -> None:
+    minio_client.close_minio_client()
+    try:
+        first = minio_client.init_minio_client()
+        assert minio_client.get_minio_client() is first
+
+        http = minio_client._http
+        response = http.request("GET", f"{http_server}/obj", preload_content=False)
+        assert minio_client.minio_pool_stats().in_use == 1
+        response.read()
+        response.release_conn()
+
+        stats = minio_client.minio_pool_stats()
+        assert stats.in_use == 0
+        assert stats.idle == 1
+        assert stats.waiting == 0
+    finally:
+        minio_client.close_minio_client()
+    assert minio_client.minio_pool_stats().idle == 0
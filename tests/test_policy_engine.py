@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.policies import policy_engine
+from app.policies.compiler import PolicyError, Scanner, compile_policy_set
+from app.policies.policy_engine import PolicyStore, evaluate_migration_policies
+from app.validators.replication_ref import validate_replication_reference
+
+POLICY = """\
+version: "{version}"
+default: true
+rules:
+  tls_required:
+    code: TLS_DISABLED_PROD
+    message: TLS must be enabled
+    check: equals
+    path: tls.enabled
+    value: true
+  sync_only:
+    code: ASYNC_REPLICATION_PROD
+    message: prod replication must be synchronous
+    check: one_of
+    path: sync_mode
+    values: [sync]
+migration:
+  prod: [tls_required]
+replication:
+  prod: [{replication_rules}]
+"""
+
+
+def _write(path: Path, version: str, replication_rules: str = "") -> None:
+    path.write_text(POLICY.format(version=version, replication_rules=replication_rules), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _reference(sync_mode: str, policy_version: str | None = None) -> bytes:
+    lines = [
+        "app_id: billing",
+        "env: prod",
+        "snapshot:",
+        "  uri: s3://bucket/snap.tar.gz",
+        "  sha256: deadbeef",
+        f"sync_mode: {sync_mode}",
+    ]
+    if policy_version is not None:
+        lines.append(f'policy_version: "{policy_version}"')
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def test_builtin_policy_set_matches_previous_rules() -> None:
+    config = {
+        "tls": {"enabled": "true"},
+        "ports": [443, {"host": "10.0.0.1"}, {"bind": "0.0.0.0 "}],
+        "secrets_ref": " ",
+        "db": [{"nested": {"Password": "hunter2"}}],
+    }
+
+    assert [reason.code for reason in evaluate_migration_policies("prod", config)] == [
+        "TLS_DISABLED_PROD",
+        "PUBLIC_PORT_EXPOSED",
+        "SECRETS_REF_MISSING",
+        "SECRETS_INLINE",
+    ]
+    assert [reason.code for reason in evaluate_migration_policies("staging", config)] == [
+        "SECRETS_REF_MISSING",
+        "SECRETS_INLINE",
+    ]
+
+
+def test_compiler_rejects_unknown_rules_and_checks() -> None:
+    with pytest.raises(PolicyError, match="unknown rules: missing"):
+        compile_policy_set({"version": "x", "rules": {}, "migration": {"prod": ["missing"]}})
+    with pytest.raises(PolicyError, match="unknown check"):
+        compile_policy_set({"version": "x", "rules": {"r": {"code": "C", "message": "m", "check": "regex"}}})
+
+
+def test_store_hot_reloads_and_keeps_last_good_set(tmp_path) -> None:
+    policy_file = tmp_path / "policy.yaml"
+    _write(policy_file, "v1")
+    store = PolicyStore(str(tmp_path), reload_interval=0)
+    first = store.registry()
+
+    _write(policy_file, "v2")
+    second = store.registry()
+    policy_file.write_text("version: [", encoding="utf-8")
+    broken = store.registry()
+
+    assert first.default_version == "v1"
+    assert second.default_version == "v2"
+    assert second.version != first.version
+    assert broken is second
+
+
+def test_reference_policy_version_selects_policy_set(tmp_path, fake_minio, monkeypatch: pytest.MonkeyPatch) -> None:
+    _write(tmp_path / "policy.yaml", "v1", replication_rules="sync_only")
+    monkeypatch.setattr(policy_engine, "_store", PolicyStore(str(tmp_path), reload_interval=0))
+
+    unknown = validate_replication_reference(_reference("sync", policy_version="v9"))
+    blocked = validate_replication_reference(_reference("async", policy_version="v1"))
+
+    assert [reason.code for reason in unknown.reasons] == ["POLICY_VERSION_UNKNOWN"]
+    assert [reason.code for reason in blocked.reasons] == ["ASYNC_REPLICATION_PROD"]
+    assert fake_minio.get_calls == []
+
+
+def test_scan_reports_every_violation_with_its_path() -> None:
+    config = {
+        "tls": {"enabled": False},
+        "ports": [{"bind": "0.0.0.0"}, 443, "0.0.0.0:8080"],
+        "secrets_ref": "vault://prod/app",
+        "db": {"credentials": {"password": "hunter2"}},
+        "workers": [{"token": "abc"}, {"token": ""}, {"api_key": "xyz"}],
+    }
+
+    reasons = {reason.code: reason.paths for reason in evaluate_migration_policies("prod", config)}
+
+    assert reasons == {
+        "TLS_DISABLED_PROD": ["tls.enabled"],
+        "PUBLIC_PORT_EXPOSED": ["ports[0]", "ports[2]"],
+        "SECRETS_INLINE": ["db.credentials.password", "workers[0].token", "workers[2].api_key"],
+    }
+
+
+def test_scan_is_iterative_and_enforces_limits() -> None:
+    policy_set = policy_engine.get_policy_set()
+    deep: dict = {"password": "leak"}
+    for _ in range(5000):
+        deep = {"child": deep}
+    config = {"tls": {"enabled": True}, "secrets_ref": "vault://x", "nested": deep}
+
+    unlimited = policy_set.evaluate("migration", "prod", config, max_depth=10_000, max_nodes=10_000)
+    too_deep = policy_set.evaluate("migration", "prod", config, max_depth=64, max_nodes=10_000)
+    too_wide = policy_set.evaluate("migration", "prod", {"items": list(range(100))}, max_depth=64, max_nodes=50)
+
+    assert [reason.code for reason in unlimited] == ["SECRETS_INLINE"]
+    assert unlimited[0].paths[0].endswith("child.password")
+    assert [reason.code for reason in too_deep] == ["CONFIG_LIMIT_EXCEEDED"]
+    assert [reason.code for reason in too_wide] == ["TLS_DISABLED_PROD", "SECRETS_REF_MISSING", "CONFIG_LIMIT_EXCEEDED"]
+
+
+def test_scan_limits_apply_without_key_rules() -> None:
+    rules = policy_engine.get_policy_set().sections["migration"]["prod"].rules
+    scanner = Scanner.build(tuple(rule for rule in rules if not rule.keys))
+    config = {"tls": {"enabled": False}, "secrets_ref": "vault://x", "items": list(range(100))}
+
+    reasons = scanner.scan(config, max_depth=64, max_nodes=50)
+
+    assert [reason.code for reason in reasons] == ["TLS_DISABLED_PROD", "CONFIG_LIMIT_EXCEEDED"]
+
+
+def test_scan_skips_walk_when_env_has_no_rules(monkeypatch: pytest.MonkeyPatch) -> None:
+    policy_set = policy_engine.get_policy_set()
+    walked: list[object] = []
+    monkeypatch.setattr(Scanner, "_walk", lambda self, *args: walked.append(args) or ({}, True))
+
+    reasons = policy_set.evaluate("replication", "prod", {"items": list(range(100))}, max_depth=64, max_nodes=50)
+
+    assert reasons == []
+    assert walked == []
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+
+from app.integrity.artifacts import SharedArtifactDigests
+from app.validators.replication_ref import validate_replication_reference
+
+
+def _manifest(snapshot_hash: str, wal_hash: str | None = None, wal_uri: str = "s3://bucket/wal.bin") -> bytes:
+    lines = [
+        "app_id: billing",
+        "env: prod",
+        "snapshot:",
+        "  uri: s3://bucket/snap.tar.gz",
+        f"  sha256: {snapshot_hash}",
+        "sync_mode: sync",
+    ]
+    if wal_hash is not None:
+        lines += ["wal:", f"  uri: {wal_uri}", f"  sha256: {wal_hash}"]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def test_reference_allows_matching_snapshot_and_wal(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+    fake_minio.put("s3://bucket/wal.bin", b"wal")
+
+    outcome = validate_replication_reference(
+        _manifest(sha256(b"snapshot").hexdigest(), sha256(b"wal").hexdigest())
+    )
+
+    assert outcome.decision == "ALLOW"
+    assert outcome.artifacts.computed_hashes.snapshot == sha256(b"snapshot").hexdigest()
+
+
+def test_snapshot_mismatch_takes_precedence_over_wal(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot", delay=0.05)
+    fake_minio.put("s3://bucket/wal.bin", b"wal")
+
+    outcome = validate_replication_reference(_manifest("deadbeef", "deadbeef"))
+
+    assert [reason.code for reason in outcome.reasons] == ["SNAPSHOT_HASH_MISMATCH"]
+
+
+def test_wal_mismatch_blocks(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+    fake_minio.put("s3://bucket/wal.bin", b"wal")
+
+    outcome = validate_replication_reference(_manifest(sha256(b"snapshot").hexdigest(), "deadbeef"))
+
+    assert [reason.code for reason in outcome.reasons] == ["WAL_HASH_MISMATCH"]
+
+
+def test_invalid_wal_uri_reported_after_snapshot(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+
+    outcome = validate_replication_reference(
+        _manifest(sha256(b"snapshot").hexdigest(), "deadbeef", wal_uri="http://bucket/wal.bin")
+    )
+
+    assert [reason.code for reason in outcome.reasons] == ["INVALID_MANIFEST"]
+    assert fake_minio.get_calls == [("bucket", "snap.tar.gz")]
+
+
+def test_snapshot_failure_cancels_wal_transfer(fake_minio) -> None:
+    fake_minio.put("s3://bucket/wal.bin", b"w" * (64 * 1024 * 1024), delay=0.01)
+
+    outcome = validate_replication_reference(_manifest("deadbeef", "deadbeef"))
+
+    assert [reason.code for reason in outcome.reasons] == ["ARTIFACT_FETCH_FAILED"]
+    wal_response = fake_minio.responses.get(("bucket", "wal.bin"))
+    if wal_response is not None:
+        assert wal_response.released
+        assert wal_response.chunks_sent < 64
+
+
+def test_shared_digests_fetch_each_artifact_once(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot", delay=0.02)
+    digests = SharedArtifactDigests()
+    manifests = [_manifest(sha256(b"snapshot").hexdigest()), _manifest("deadbeef")] * 4
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        outcomes = list(
+            pool.map(lambda manifest: validate_replication_reference(manifest, hash_artifact=digests.hash), manifests)
+        )
+
+    assert [outcome.decision for outcome in outcomes] == ["ALLOW", "BLOCK"] * 4
+    assert fake_minio.get_calls == [("bucket", "snap.tar.gz")]
+    assert len(digests) == 1
+
+
+def test_parsed_manifest_is_reused_by_validator(fake_minio, monkeypatch) -> None:
+    from app.validators import replication_ref
+
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+    fake_minio.put("s3://bucket/wal.bin", b"wal")
+    manifest = replication_ref.parse_reference_manifest(
+        _manifest(sha256(b"snapshot").hexdigest(), sha256(b"wal").hexdigest())
+        + b"policy_version: \"2026.01\"\n"
+    )
+
+    def reparse(raw: bytes):
+        raise AssertionError("manifest parsed twice")
+
+    monkeypatch.setattr(replication_ref, "parse_reference_manifest", reparse)
+    outcome = validate_replication_reference(manifest)
+
+    assert outcome.decision == "ALLOW"
+    assert replication_ref.reference_artifact_refs(manifest) == ["s3://bucket/snap.tar.gz", "s3://bucket/wal.bin"]
+    assert manifest.policy_version == "2026.01"
+
+
+def test_snapshot_hashed_on_caller_and_wal_on_shared_pool(fake_minio) -> None:
+    import threading
+
+    from app.integrity.artifacts import hash_s3_object
+
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+    fake_minio.put("s3://bucket/wal.bin", b"wal")
+    threads: dict[str, str] = {}
+
+    def hash_artifact(uri: str, **kwargs):
+        threads[kwargs["kind"]] = threading.current_thread().name
+        return hash_s3_object(uri, **kwargs)
+
+    for _ in range(3):
+        outcome = validate_replication_reference(
+            _manifest(sha256(b"snapshot").hexdigest(), sha256(b"wal").hexdigest()), hash_artifact=hash_artifact
+        )
+        assert outcome.decision == "ALLOW"
+
+    assert threads["snapshot"] == threading.current_thread().name
+    assert threads["wal"].startswith("artifact")
+
+
+def test_shared_transfer_continues_until_every_waiter_cancels(fake_minio) -> None:
+    import threading
+
+    from app.integrity.artifacts import TransferCancelledError
+
+    fake_minio.put("s3://bucket/wal.bin", b"w" * (64 * 1024 * 1024), delay=0.01)
+    digests = SharedArtifactDigests()
+    first, second = threading.Event(), threading.Event()
+    errors: list[BaseException] = []
+
+    def waiter(cancel: threading.Event) -> None:
+        try:
+            digests.hash("s3://bucket/wal.bin", cancel=cancel)
+        except TransferCancelledError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=waiter, args=(event,)) for event in (first, second)]
+    for thread in threads:
+        thread.start()
+    while fake_minio.responses.get(("bucket", "wal.bin")) is None:
+        threading.Event().wait(0.01)
+    first.set()
+    threading.Event().wait(0.1)
+    response = fake_minio.responses[("bucket", "wal.bin")]
+    sent = response.chunks_sent
+    assert not response.released
+    second.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert response.released
+    assert sent < response.chunks_sent < 64
+    assert len(errors) == 2
+
+
+def test_batch_item_with_unknown_scenario_is_not_labelled_t2() -> None:
+    from app.api.main import _validate_batch_item
+    from app.core.models import BatchItem
+
+    result, _, _ = _validate_batch_item(BatchItem(scenario="bogus"), SharedArtifactDigests())
+
+    assert result.scenario == "BATCH"
+    assert [reason.code for reason in result.reasons] == ["SCHEMA_INVALID"]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+from hashlib import sha256
+
+import pytest
+
+from app.integrity import segments as segments_module
+from app.integrity.segments import verify_segments
+from app.validators.replication import validate_replication
+
+
+def _segments(count: int) -> dict[str, io.BytesIO]:
+    return {f"0000000100000000000000{index:02d}": io.BytesIO(f"wal-{index}".encode()) for index in range(count)}
+
+
+def test_verify_segments_reports_every_mismatch() -> None:
+    segments = _segments(6)
+    expected = {name: sha256(handle.getvalue()).hexdigest() for name, handle in segments.items()}
+    names = sorted(expected)
+    expected[names[1]] = "deadbeef"
+    expected[names[4]] = "deadbeef"
+
+    report = verify_segments(segments, expected, workers=3, fail_fast=False)
+
+    assert report.mismatched == [names[1], names[4]]
+    assert len(report.computed) == 6
+    assert not report.missing and not report.unexpected
+
+
+def test_verify_segments_fail_fast_stops_after_first_mismatch() -> None:
+    segments = _segments(50)
+    expected = {name: "deadbeef" for name in segments}
+
+    report = verify_segments(segments, expected, workers=1, fail_fast=True)
+
+    assert len(report.mismatched) == 1
+    assert len(report.computed) < 50
+
+
+def test_verify_segments_uses_shared_pool_with_bounded_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    threads: set[str] = set()
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    original = segments_module._hash_segment
+
+    def tracking(handle, cancel):
+        nonlocal active, peak
+        with lock:
+            threads.add(threading.current_thread().name)
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        try:
+            return original(handle, cancel)
+        finally:
+            with lock:
+                active -= 1
+
+    monkeypatch.setattr(segments_module, "_hash_segment", tracking)
+    segments = _segments(8)
+    expected = {name: sha256(handle.getvalue()).hexdigest() for name, handle in segments.items()}
+
+    report = verify_segments(segments, expected, workers=2, fail_fast=False)
+
+    assert report.ok and len(report.computed) == 8
+    assert peak <= 2
+    assert all(name.startswith("artifact") for name in threads)
+
+
+def test_verify_segments_flags_missing_and_unexpected() -> None:
+    segments = _segments(2)
+    names = sorted(segments)
+    expected = {names[0]: sha256(b"wal-0").hexdigest(), "missing-segment": "deadbeef"}
+
+    report = verify_segments(segments, expected, fail_fast=False)
+
+    assert report.missing == ["missing-segment"]
+    assert report.unexpected == [names[1]]
+    assert report.mismatched == []
+
+
+def test_replication_blocks_on_wal_segment_mismatch() -> None:
+    snapshot = b"snapshot-ok"
+    manifest = (
+        "source_db: src\n"
+        "target_db: tgt\n"
+        f"expected_snapshot_hash: {sha256(snapshot).hexdigest()}\n"
+        "sync_mode: sync\n"
+        "wal_segments:\n"
+        f"  - name: seg-1\n    sha256: {sha256(b'one').hexdigest()}\n"
+        "  - name: seg-2\n    sha256: deadbeef\n"
+    ).encode("utf-8")
+    wal = {"seg-1": io.BytesIO(b"one"), "seg-2": io.BytesIO(b"two")}
+
+    outcome = validate_replication(manifest, snapshot, wal)
+
+    assert outcome.decision == "BLOCK"
+    assert [reason.code for reason in outcome.reasons] == ["WAL_HASH_MISMATCH"]
+    assert outcome.reasons[0].message.endswith("seg-2")
+    assert outcome.artifacts.computed_hashes.wal_segments == {
+        "seg-1": sha256(b"one").hexdigest(),
+        "seg-2": sha256(b"two").hexdigest(),
+    }
+
+
+def test_replication_blocks_on_wal_segments_missing_from_manifest() -> None:
+    snapshot = b"snapshot-ok"
+    manifest = (
+        "source_db: src\n"
+        "target_db: tgt\n"
+        f"expected_snapshot_hash: {sha256(snapshot).hexdigest()}\n"
+        "sync_mode: sync\n"
+    ).encode("utf-8")
+
+    outcome = validate_replication(manifest, snapshot, {"seg-9": io.BytesIO(b"nine")})
+
+    assert outcome.decision == "BLOCK"
+    assert [reason.code for reason in outcome.reasons] == ["WAL_SEGMENT_UNEXPECTED"]
+    assert outcome.reasons[0].message.endswith("seg-9")
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import contextvars
+import json
+from hashlib import sha256
+
+from prometheus_client import REGISTRY
+
+from app.core.logging import log_request_summary
+from app.core.stages import begin_stages, record_ingest
+from app.validators.replication_ref import validate_replication_reference
+
+ENDPOINT = "/test/stages"
+
+
+def _stage_count(stage: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "security_gate_stage_duration_seconds_count",
+        {"stage": stage, "endpoint": ENDPOINT},
+    )
+    return value or 0.0
+
+
+def _manifest(snapshot_hash: str) -> bytes:
+    return (
+        "app_id: billing\nenv: prod\nsnapshot:\n"
+        f"  uri: s3://bucket/snap.tar.gz\n  sha256: {snapshot_hash}\nsync_mode: sync\n"
+        "wal:\n  uri: s3://bucket/wal.bin\n"
+        f"  sha256: {sha256(b'wal').hexdigest()}\n"
+    ).encode("utf-8")
+
+
+def test_reference_validation_records_every_stage(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+    fake_minio.put("s3://bucket/wal.bin", b"wal")
+    before = {stage: _stage_count(stage) for stage in ("ingest", "parse", "policy", "fetch", "hash")}
+
+    def request():
+        timings = begin_stages(ENDPOINT)
+        record_ingest()
+        outcome = validate_replication_reference(_manifest(sha256(b"snapshot").hexdigest()))
+        return outcome, timings.as_ms()
+
+    outcome, stage_ms = contextvars.copy_context().run(request)
+
+    assert outcome.decision == "ALLOW"
+    assert set(stage_ms) == {"ingest", "parse", "policy", "fetch", "hash"}
+    assert _stage_count("parse") == before["parse"] + 1
+    assert _stage_count("fetch") >= before["fetch"] + 2
+    assert _stage_count("hash") == before["hash"] + 2
+
+
+def test_request_summary_includes_stage_timings(capsys) -> None:
+    log_request_summary(
+        request_id="req-1",
+        scenario="T1",
+        endpoint=ENDPOINT,
+        client=None,
+        decision="ALLOW",
+        reason_codes=[],
+        artifact_refs=[],
+        duration_ms=12,
+        stage_ms={"parse": 1.5, "audit": 0.25},
+    )
+
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["stage_ms"] == {"parse": 1.5, "audit": 0.25}
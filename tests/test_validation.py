@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 import json
 from hashlib import sha256
 
@@ -76,3 +77,15 @@ def test_invalid_format_blocks() -> None:
     ).encode("utf-8")
     outcome = validate_replication(manifest, config)
     assert outcome.decision == "BLOCK"
+
+
+def test_replication_hashes_snapshot_stream_in_chunks() -> None:
+    snapshot = io.BytesIO(b"s" * (3 * 1024 * 1024 + 7))
+    manifest = (
+        "source_db: src\n"
+        "target_db: tgt\n"
+        f"expected_snapshot_hash: {sha256(snapshot.getvalue()).hexdigest()}\n"
+        "sync_mode: sync\n"
+    ).encode("utf-8")
+    outcome = validate_replication(manifest, snapshot)
+    assert outcome.decision == "ALLOW"
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from hashlib import sha256
+
+from app.integrity import artifacts
+from app.integrity.cache import CacheKey, VerificationCache, entry_bytes
+
+
+def test_second_verification_skips_download(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+
+    first = artifacts.hash_s3_object("s3://bucket/snap.tar.gz")
+    second = artifacts.hash_s3_object("s3://bucket/snap.tar.gz")
+
+    assert first == second
+    assert first.sha256 == sha256(b"snapshot").hexdigest()
+    assert fake_minio.get_calls == [("bucket", "snap.tar.gz")]
+    assert len(fake_minio.stat_calls) == 2
+
+
+def test_changed_object_is_downloaded_again(fake_minio) -> None:
+    fake_minio.put("s3://bucket/snap.tar.gz", b"snapshot")
+    artifacts.hash_s3_object("s3://bucket/snap.tar.gz")
+    fake_minio.put("s3://bucket/snap.tar.gz", b"tampered")
+
+    digest = artifacts.hash_s3_object("s3://bucket/snap.tar.gz")
+
+    assert digest.sha256 == sha256(b"tampered").hexdigest()
+    assert len(fake_minio.get_calls) == 2
+
+
+def test_disk_tier_survives_restart_and_evicts_oldest(tmp_path) -> None:
+    db_path = str(tmp_path / "verify-cache.sqlite")
+    keys = [CacheKey(bucket="b", key=f"k{index}", etag="e", version_id="", size=1) for index in range(3)]
+    size = entry_bytes(keys[0], "hash0")
+
+    cache = VerificationCache(max_bytes=size, db_path=db_path, db_max_bytes=2 * size)
+    for index, key in enumerate(keys):
+        cache.put(key, f"hash{index}")
+    cache.close()
+
+    reopened = VerificationCache(max_bytes=size, db_path=db_path, db_max_bytes=2 * size)
+    assert reopened.get(keys[0]) is None
+    assert reopened.get(keys[1]) == "hash1"
+    assert reopened.get(keys[2]) == "hash2"
+    reopened.close()
+
+
+def test_memory_tier_is_bounded_by_bytes() -> None:
+    small = CacheKey(bucket="b", key="small", etag="e", version_id="", size=1)
+    large = CacheKey(bucket="b", key="k" * 500, etag="e", version_id="", size=1)
+    cache = VerificationCache(max_bytes=entry_bytes(large, "h") + entry_bytes(small, "h") - 1)
+
+    cache.put(small, "h")
+    cache.put(large, "h")
+
+    assert cache.get(small) is None
+    assert cache.get(large) == "h"
+
+
+def test_disk_tier_serves_concurrent_threads(tmp_path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = VerificationCache(max_bytes=0, db_path=str(tmp_path / "verify-cache.sqlite"), db_max_bytes=1 << 20)
+    keys = [CacheKey(bucket="b", key=f"k{index}", etag="e", version_id="", size=1) for index in range(40)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda key: cache.put(key, key.key), keys))
+        found = list(pool.map(cache.get, keys))
+
+    assert found == [key.key for key in keys]
+    cache.close()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.core import yaml_loader
+from app.validators.replication_ref import parse_reference_manifest
+
+EXAMPLES = sorted(Path(__file__).resolve().parents[1].glob("examples/*/*.yaml"))
+
+
+def test_backend_falls_back_to_python_loader(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(yaml_loader, "LOADERS", {"python": yaml_loader.LOADERS["python"]})
+
+    assert yaml_loader.select_backend("auto") == "python"
+    assert yaml_loader.select_backend("libyaml") == "python"
+
+
+@pytest.mark.skipif("libyaml" not in yaml_loader.LOADERS, reason="PyYAML built without libyaml")
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: f"{path.parent.name}/{path.name}")
+def test_backends_agree_on_examples(path: Path) -> None:
+    text = path.read_text(encoding="utf-8")
+
+    assert yaml_loader.load_yaml(text, backend="libyaml") == yaml_loader.load_yaml(text, backend="python")
+
+
+@pytest.mark.parametrize("backend", sorted(yaml_loader.LOADERS))
+def test_double_encoded_reference_manifest_on_every_backend(backend: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(yaml_loader, "_LOADER", yaml_loader.LOADERS[backend])
+    inner = "app_id: billing\nenv: prod\nsnapshot:\n  uri: s3://b/snap\n  sha256: abc\nsync_mode: sync\n"
+    raw = ('"' + inner.replace("\n", "\\n") + '"').encode("utf-8")
+
+    manifest = parse_reference_manifest(raw)
+
+    assert manifest.app_id == "billing"
+    assert manifest.snapshot.uri == "s3://b/snap"